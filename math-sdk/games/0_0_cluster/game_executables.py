@@ -28,9 +28,14 @@ class GameExecutables(GameCalculations):
                         )
             update_grid_mult_event(self)
 
-    def get_clusters_update_wins(self):
-        """Find clusters on board and update win manager."""
-        clusters = Cluster.get_clusters(self.board, "wild")
+    def get_clusters_update_wins(self, tumbled: bool = False):
+        """Find clusters on board and update win manager.
+        After a tumble, only clusters touching the refilled positions are re-evaluated."""
+        if tumbled:
+            clusters = Cluster.get_clusters_after_tumble(self.board, self.clusters, self.tumble_dirty_rows, "wild")
+        else:
+            clusters = Cluster.get_clusters(self.board, "wild")
+        self.clusters = clusters
         return_data = {
             "totalWin": 0,
             "wins": [],
@@ -18,7 +18,7 @@ class GameState(GameStateOverride):
 
             while self.win_data["totalWin"] > 0 and not (self.wincap_triggered):
                 self.tumble_game_board()
-                self.get_clusters_update_wins()
+                self.get_clusters_update_wins(tumbled=True)
                 self.emit_tumble_win_events()
 
             self.set_end_tumble_event()
@@ -45,7 +45,7 @@ class GameState(GameStateOverride):
             self.update_grid_mults()
             while self.win_data["totalWin"] > 0 and not (self.wincap_triggered):
                 self.tumble_game_board()
-                self.get_clusters_update_wins()
+                self.get_clusters_update_wins(tumbled=True)
                 self.emit_tumble_win_events()
                 self.update_grid_mults()
 
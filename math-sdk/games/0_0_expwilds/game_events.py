@@ -2,7 +2,7 @@
 
 from copy import deepcopy
 from src.events.event_constants import EventConstants
-from src.events.events import json_ready_sym
+from src.events.events import json_ready_sym, skip_in_stats_only
 
 NEW_EXP_WILDS = "newExpandingWilds"
 UPDATE_EXP_WILDS = "updateExpandingWilds"
@@ -11,9 +11,10 @@ WIN_DATA = "winInfo"
 PRIZE_WIN_DATA = "prizeWinInfo"
 
 
+@skip_in_stats_only
 def new_expanding_wild_event(gamestate) -> None:
     """Passed after reveal event"""
-    new_exp_wilds = gamestate.new_exp_wilds
+    new_exp_wilds = [dict(ew) for ew in gamestate.new_exp_wilds]
     if gamestate.config.include_padding:
         for ew in new_exp_wilds:
             ew["row"] += 1
@@ -22,6 +23,7 @@ def new_expanding_wild_event(gamestate) -> None:
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def update_expanding_wild_event(gamestate) -> None:
     """On each reveal - the multiplier value on the expanding wild is updated (sent before reveal)"""
     existing_wild_details = deepcopy(gamestate.expanding_wilds)
@@ -36,8 +38,10 @@ def update_expanding_wild_event(gamestate) -> None:
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def new_sticky_event(gamestate, new_sticky_syms: list):
     """Pass details on new prize symbols"""
+    new_sticky_syms = [dict(sym) for sym in new_sticky_syms]
     if gamestate.config.include_padding:
         for sym in new_sticky_syms:
             sym["row"] += 1
@@ -47,6 +51,7 @@ def new_sticky_event(gamestate, new_sticky_syms: list):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def win_info_prize_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
@@ -69,21 +74,17 @@ def win_info_prize_event(gamestate, include_padding_index=True):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def reveal_prize_event(gamestate):
     """Display the initial board drawn from reelstrips."""
     board_client = []
-    special_attributes = list(gamestate.config.special_symbols.keys())
     for reel, _ in enumerate(gamestate.board):
-        board_client.append([])
-        for row in range(len(gamestate.board[reel])):
-            board_client[reel].append(json_ready_sym(gamestate.board[reel][row], special_attributes))
+        board_client.append([json_ready_sym(sym) for sym in gamestate.board[reel]])
 
     if gamestate.config.include_padding:
         for reel, _ in enumerate(board_client):
-            board_client[reel] = [json_ready_sym(gamestate.top_symbols[reel], special_attributes)] + board_client[
-                reel
-            ]
-            board_client[reel].append(json_ready_sym(gamestate.bottom_symbols[reel], special_attributes))
+            board_client[reel] = [json_ready_sym(gamestate.top_symbols[reel])] + board_client[reel]
+            board_client[reel].append(json_ready_sym(gamestate.bottom_symbols[reel]))
 
     for idx, _ in enumerate(board_client):
         for idy, _ in enumerate(board_client[idx]):
@@ -94,8 +95,8 @@ def reveal_prize_event(gamestate):
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": "superspin",
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
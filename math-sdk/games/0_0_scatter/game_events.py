@@ -1,6 +1,9 @@
+from src.events.events import skip_in_stats_only
+
 BOARD_MULT_INFO = "boardMultiplierInfo"
 
 
+@skip_in_stats_only
 def send_mult_info_event(gamestate, board_mult: int, mult_info: dict, base_win: float, updatedWin: float):
     multiplier_info, winInfo = {}, {}
     multiplier_info["positions"] = []
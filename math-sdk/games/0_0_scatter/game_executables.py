@@ -51,8 +51,8 @@ class GameExecutables(GameCalculations):
 
     def get_scatterpays_update_wins(self):
         """Return the board since we are assigning the 'explode' attribute."""
-        self.win_data = Scatter.get_scatterpay_wins(
-            self.config, self.board, global_multiplier=self.global_multiplier
+        self.win_data = self.cached_win_evaluation(
+            Scatter.get_scatterpay_wins, explode_wins=True, global_multiplier=self.global_multiplier
         )  # Evaluate wins, self.board is modified in-place
         Scatter.record_scatter_wins(self)
         self.win_manager.tumble_win = self.win_data["totalWin"]
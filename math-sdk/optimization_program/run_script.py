@@ -2,6 +2,7 @@ import json
 import subprocess
 import os
 from src.config.paths import PATH_TO_GAMES, SETUP_PATH, OPTIMIZATION_PATH, PROJECT_PATH
+from src.write_data.lookup_binary import rebuild_lookup_binary
 
 
 class OptimizationExecution:
@@ -47,6 +48,17 @@ class OptimizationExecution:
         setup_file.close()
         print(f"Running optimization for mode: {mode}")
         OptimizationExecution.run_rust_script()
+        OptimizationExecution.rebuild_optimized_binary(game_config, mode)
+
+    @staticmethod
+    def rebuild_optimized_binary(game_config, mode):
+        """The optimizer only rewrites lookUpTable_<mode>_0.csv, rewrite its binary table to match."""
+        library_path = os.path.join(PATH_TO_GAMES, game_config.game_id, "library")
+        rebuild_lookup_binary(
+            os.path.join(library_path, "publish_files", f"lookUpTable_{mode}_0.csv"),
+            os.path.join(library_path, "lookup_tables", f"lookUpTable_{mode}.csv"),
+            os.path.join(library_path, "lookup_tables"),
+        )
 
     @staticmethod
     def run_all_modes(game_config, modes_to_run, rust_threads):
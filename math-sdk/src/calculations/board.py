@@ -4,21 +4,27 @@ import random
 from typing import List
 from src.state.state import GeneralGameState
 from src.calculations.statistics import get_random_outcome
+from src.config.compiled_config import draw_from_sampler
 from src.events.events import reveal_event
 
 
 class Board(GeneralGameState):
     """Handles generation of a game board and symbols"""
 
+    def draw_reelstrip_id(self) -> str:
+        """Select a reelstrip from the current reel_weights, using the compiled sampler table when available."""
+        sampler = self.config.get_reel_sampler(self.betmode, self.criteria, self.gametype)
+        if sampler is None:
+            return get_random_outcome(self.get_current_distribution_conditions()["reel_weights"][self.gametype])
+        return draw_from_sampler(sampler)
+
     def create_board_reelstrips(self) -> None:
         """Randomly selects stopping positions from a reelstrip."""
         if self.config.include_padding:
             top_symbols = []
             bottom_symbols = []
         self.refresh_special_syms()
-        self.reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
-        )
+        self.reelstrip_id = self.draw_reelstrip_id()
         self.reelstrip = self.config.reels[self.reelstrip_id]
         anticipation = [0] * self.config.num_reels
         board = [[]] * self.config.num_reels
@@ -69,6 +75,7 @@ class Board(GeneralGameState):
         self.board = board
         self.get_special_symbols_on_board()
         self.reel_positions = reel_positions
+        self.board_stops = (self.reelstrip_id, tuple(reel_positions))
         self.padding_position = padding_positions
         self.anticipation = anticipation
         if self.config.include_padding:
@@ -135,6 +142,10 @@ class Board(GeneralGameState):
 
         self.board = board
         self.reel_positions = reel_positions
+        self.board_stops = (
+            self.reelstrip_id,
+            tuple(pos % len(self.reelstrip[reel]) for reel, pos in enumerate(reel_positions)),
+        )
         self.padding_position = padding_positions
         self.anticipation = anticipation
         if self.config.include_padding:
@@ -168,6 +179,62 @@ class Board(GeneralGameState):
                         if self.board[reel][row].check_attribute(specialType):
                             self.special_syms_on_board[specialType].append({"reel": reel, "row": row})
 
+    def update_special_symbols_on_reels(self, reels: List[int]) -> None:
+        """Re-scan active special symbols on the given reels only, positions on all other reels are kept."""
+        if len(reels) == 0:
+            return
+        reels = set(reels)
+        reel_positions = {specialType: [] for specialType in self.special_syms_on_board}
+        for reel in sorted(reels):
+            for row, sym in enumerate(self.board[reel]):
+                if sym.special:
+                    for specialType in reel_positions:
+                        if sym.check_attribute(specialType):
+                            reel_positions[specialType].append({"reel": reel, "row": row})
+
+        for specialType, positions in reel_positions.items():
+            self.special_syms_on_board[specialType] = sorted(
+                [pos for pos in self.special_syms_on_board[specialType] if pos["reel"] not in reels] + positions,
+                key=lambda pos: pos["reel"],
+            )
+
+    def get_board_signature(self, multiplier_key: str = "multiplier") -> tuple:
+        """
+        Identify the current board by reelstrip, stop positions and symbol multiplier values.
+        Returns None if the board no longer matches its reelstrip stops (i.e after a tumble).
+        """
+        if self.board_stops is None:
+            return None
+        multiplier_state = tuple(
+            sym.get_attribute(multiplier_key) for reel in self.board for sym in reel if sym.check_attribute(multiplier_key)
+        )
+        return (self.board_stops, multiplier_state)
+
+    def cached_win_evaluation(self, evaluation: callable, explode_wins: bool = False, **kwargs) -> dict:
+        """
+        Return evaluation(config=self.config, board=self.board, **kwargs), re-using stored win data if the same board
+        and arguments were previously evaluated. Used with Lines.get_lines, Ways.get_ways_data and
+        Scatter.get_scatterpay_wins, the cache size is set by config.win_cache_size.
+
+        explode_wins: re-apply the 'explode' attribute to winning positions on a cache hit (scatter/tumble games)
+        Boards modified after the reveal (other than by tumbling) must not be evaluated through the cache.
+        """
+        signature = self.get_board_signature() if self.win_cache.enabled() else None
+        if signature is None:
+            return evaluation(config=self.config, board=self.board, **kwargs)
+
+        key = (evaluation.__qualname__, signature, tuple(sorted(kwargs.items())))
+        win_data = self.win_cache.get(key)
+        if win_data is None:
+            win_data = evaluation(config=self.config, board=self.board, **kwargs)
+            self.win_cache.put(key, win_data)
+        elif explode_wins:
+            for win in win_data["wins"]:
+                for pos in win["positions"]:
+                    self.board[pos["reel"]][pos["row"]].assign_attribute({"explode": True})
+
+        return win_data
+
     def transpose_board_string(self, board_string: List[List[str]]) -> List[List[str]]:
         """Transpose symbol names in the format displayed to the player during the game."""
         return [list(row) for row in zip(*board_string)]
@@ -246,9 +313,7 @@ class Board(GeneralGameState):
         """
         Helper function for forcing special (or name specific) symbols
         """
-        reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
-        )
+        reelstrip_id = self.draw_reelstrip_id()
         reelstops = self.get_syms_on_reel(reelstrip_id, force_criteria)
 
         sym_prob = []
@@ -6,6 +6,8 @@ from src.calculations.symbol import Symbol
 from src.config.config import Config
 from src.wins.multiplier_strategy import apply_mult
 
+CLUSTER_RECORD_KEYS = ("kind", "symbol", "mult", "gametype")
+
 
 class Cluster:
     """Collection of cluster-evaluation functions."""
@@ -106,6 +108,71 @@ class Cluster:
 
         return clusters
 
+    @staticmethod
+    def get_clusters_after_tumble(
+        board: list[list[Symbol]],
+        previous_clusters: dict,
+        dirty_rows: list,
+        wild_key: str = "wild",
+    ) -> dict:
+        """
+        Return all symbol clusters of size >= 1 for a tumbled board, re-using clusters from the previous board.
+
+        previous_clusters: output of get_clusters() (or this function) for the board before the tumble
+        dirty_rows: number of rows from the top of each reel whose symbols changed, (Tumble.tumble_dirty_rows)
+
+        Clusters which neither contain nor border a changed position are kept as-is, only the remaining
+        region is re-evaluated. The output is identical to get_clusters(board, wild_key), including ordering.
+        """
+        dirty_positions = set()
+        for reel, num_rows in enumerate(dirty_rows):
+            for row in range(num_rows):
+                dirty_positions.add((reel, row))
+
+        if len(dirty_positions) == 0:
+            return previous_clusters
+
+        touched_positions = set(dirty_positions)
+        for reel, row in dirty_positions:
+            touched_positions.update(((reel - 1, row), (reel + 1, row), (reel, row - 1), (reel, row + 1)))
+
+        kept_clusters = []
+        reevaluate_positions = set(dirty_positions)
+        for symbol, symbol_clusters in previous_clusters.items():
+            for cluster in symbol_clusters:
+                if touched_positions.isdisjoint(cluster):
+                    kept_clusters.append((symbol, cluster))
+                else:
+                    reevaluate_positions.update(cluster)
+
+        # Non-wild symbols of a new cluster all lie within the re-evaluated region, so the first position found
+        # in scan order is the same starting position get_clusters() would use.
+        already_checked = set()
+        new_clusters = []
+        for reel, row in sorted(reevaluate_positions):
+            if (reel, row) not in already_checked and not (board[reel][row].check_attribute(wild_key)):
+                potential_cluster = [(reel, row)]
+                local_checked = [(reel, row)]
+                symbol = board[reel][row].name
+                Cluster.check_all_neighbours(
+                    board,
+                    [],
+                    local_checked,
+                    potential_cluster,
+                    reel,
+                    row,
+                    symbol,
+                    wild_key,
+                )
+                already_checked.update(potential_cluster)
+                new_clusters.append((symbol, potential_cluster))
+
+        clusters = defaultdict(list)
+        for symbol, cluster in sorted(kept_clusters + new_clusters, key=lambda x: x[1][0]):
+            clusters[symbol].append(cluster)
+
+        return clusters
+
     @staticmethod
     def evaluate_clusters(
         config: Config,
@@ -190,11 +257,12 @@ class Cluster:
     def record_cluster_wins(gamestate) -> None:
         """force_record win description keys."""
         for win in gamestate.win_data["wins"]:
-            gamestate.record(
-                {
-                    "kind": win["clusterSize"],
-                    "symbol": win["symbol"],
-                    "mult": int(win["meta"]["globalMult"] + win["meta"]["clusterMult"]),
-                    "gametype": gamestate.gametype,
-                }
+            gamestate.record_values(
+                CLUSTER_RECORD_KEYS,
+                (
+                    win["clusterSize"],
+                    win["symbol"],
+                    int(win["meta"]["globalMult"] + win["meta"]["clusterMult"]),
+                    gamestate.gametype,
+                ),
             )
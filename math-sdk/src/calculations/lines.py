@@ -9,6 +9,8 @@ from src.events.events import (
     set_total_event,
 )
 
+LINE_RECORD_KEYS = ("kind", "symbol", "mult", "gametype")
+
 
 class Lines:
     """Collection of functions to handle line-win games."""
@@ -130,9 +132,7 @@ class Lines:
     def record_lines_wins(gamestate) -> None:
         """Data for force-file."""
 
-        def record_line(kind: int, symbol: str, mult: int, gametype: str) -> None:
-            """Force file description for line-win."""
-            gamestate.record({"kind": kind, "symbol": symbol, "mult": mult, "gametype": gametype})
-
         for win in gamestate.win_data["wins"]:
-            record_line(len(win["positions"]), win["symbol"], win["meta"]["multiplier"], gamestate.gametype)
+            gamestate.record_values(
+                LINE_RECORD_KEYS, (len(win["positions"]), win["symbol"], win["meta"]["multiplier"], gamestate.gametype)
+            )
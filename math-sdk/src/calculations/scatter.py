@@ -5,6 +5,8 @@ from collections import defaultdict
 from src.calculations.symbol import Symbol
 from src.config.config import Config
 
+SCATTER_RECORD_KEYS = ("kind", "symbol", "totalMult", "gametype")
+
 
 class Scatter:
     """Collection of Scatter-pays functions."""
@@ -98,11 +100,12 @@ class Scatter:
     def record_scatter_wins(gamestate) -> None:
         """Force-file description key generator."""
         for win in gamestate.win_data["wins"]:
-            gamestate.record(
-                {
-                    "kind": len(win["positions"]),
-                    "symbol": win["symbol"],
-                    "totalMult": int(win["meta"]["globalMult"] + win["meta"]["clusterMult"]),
-                    "gametype": gamestate.gametype,
-                }
+            gamestate.record_values(
+                SCATTER_RECORD_KEYS,
+                (
+                    len(win["positions"]),
+                    win["symbol"],
+                    int(win["meta"]["globalMult"] + win["meta"]["clusterMult"]),
+                    gamestate.gametype,
+                ),
             )
@@ -13,8 +13,8 @@ class SymbolStorage:
             self.symbols[symbol] = Symbol(self.config, symbol)
 
     def create_symbol_state(self, symbol_name: str) -> object:
-        """Create new symbol class instance."""
-        return Symbol(self.config, symbol_name)
+        """Create new symbol class instance, copied from the stored symbol template."""
+        return self.get_symbol(symbol_name).copy()
 
     def get_symbol(self, name: str) -> object:
         """Retrieve symbol class from name."""
@@ -31,15 +31,38 @@ class Symbol:
         self.special_functions = []
         self.special = False
         is_special = False
+        special_properties = []
         for special_property in config.special_symbols.keys():
             if name in config.special_symbols[special_property]:
                 setattr(self, special_property, True)
+                special_properties.append(special_property)
                 is_special = True
 
         if is_special:
             setattr(self, "special", True)
 
         self.assign_paying_bool(config)
+        self.assign_json_layout(config, special_properties)
+
+    def copy(self) -> object:
+        """Return a new symbol instance with the same attributes, without re-reading the config."""
+        sym = Symbol.__new__(Symbol)
+        sym.__dict__.update(self.__dict__)
+        sym.special_functions = list(self.special_functions)
+        return sym
+
+    def assign_json_layout(self, config, special_properties: list) -> None:
+        """
+        Store the attribute layout used by events.json_ready_sym(), shared by all copies of this symbol:
+        (number of attributes on creation, special properties set on creation, all special attribute names,
+        special attribute names which are commonly added after creation)
+        """
+        special_attributes = tuple(config.special_symbols.keys())
+        added_attributes = tuple(
+            attr for attr in ("multiplier", "prize") if attr in special_attributes and attr not in special_properties
+        )
+        # Count includes the json_layout attribute itself
+        self.json_layout = (len(vars(self)) + 1, tuple(special_properties), special_attributes, added_attributes)
 
     def register_special_function(self, special_function: callable) -> None:
         """Assign special symbol function."""
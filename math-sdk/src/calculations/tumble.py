@@ -1,4 +1,3 @@
-from copy import copy
 from src.events.events import set_win_event, set_total_event
 from src.calculations.board import Board
 
@@ -7,45 +6,58 @@ class Tumble(Board):
     """General class for cascading/tumble game actions."""
 
     def tumble_board(self) -> None:
-        """Remove winning symbols from the active gameboard."""
-        self.board_before_tumble = copy(self.board)
-        static_board = copy(self.board)
-        self.new_symbols_from_tumble = [[] for _ in range(len(static_board))]
+        """Remove winning symbols from the active gameboard.
+        Vacated positions are refilled directly from the reelstrip, moving backwards from the current reel position.
+        Reels without exploding symbols are left untouched."""
+        self.board_before_tumble = self.board
+        board = list(self.board)
+        self.new_symbols_from_tumble = [[] for _ in range(len(board))]
+        # Number of rows (counted from the top of each reel) whose contents change after the tumble
+        self.tumble_dirty_rows = [0] * len(board)
+        tumbled_reels = []
 
-        for reel, _ in enumerate(static_board):
-            exploding_symbols = 0
-            copy_reel = static_board[reel]
-            exploding_symbols = sum(1 for x in static_board[reel] if x.check_attribute("explode"))
+        for reel, column in enumerate(self.board):
+            remaining_symbols = []
+            for row, sym in enumerate(column):
+                if sym.check_attribute("explode"):
+                    self.tumble_dirty_rows[reel] = row + 1
+                else:
+                    remaining_symbols.append(sym)
+
+            exploding_symbols = len(column) - len(remaining_symbols)
+            if exploding_symbols == 0:
+                continue
 
+            reelstrip = self.reelstrip[reel]
+            reel_pos = self.reel_positions[reel]
+            # Symbols are drawn upwards from the current reel position, the first lands directly above remaining symbols
+            refill_symbols = [None] * exploding_symbols
             for i in range(exploding_symbols):
-                reel_pos = (self.reel_positions[reel] - 1) % len(self.reelstrip[reel])
-                self.reel_positions[reel] = reel_pos
+                reel_pos = (reel_pos - 1) % len(reelstrip)
                 # Take top symbol if it exists (don't add this to new_symbols_from_tumble)
                 if i == 0 and self.config.include_padding:
-                    insert_sym = self.top_symbols[reel]
+                    refill_symbols[-1] = self.top_symbols[reel]
                 else:
-                    nme = self.reelstrip[reel][(reel_pos) % len(self.reelstrip[reel])]
-                    insert_sym = self.create_symbol(nme)
-                    self.new_symbols_from_tumble[reel].insert(0, insert_sym)
-                copy_reel.insert(0, insert_sym)
+                    refill_symbols[exploding_symbols - 1 - i] = self.create_symbol(reelstrip[reel_pos])
+            self.reel_positions[reel] = reel_pos
 
-            copy_reel = [sym for sym in copy_reel if not (sym.check_attribute("explode"))]
+            if self.config.include_padding:
+                self.top_symbols[reel] = self.create_symbol(reelstrip[(reel_pos - 1) % len(reelstrip)])
+                self.new_symbols_from_tumble[reel] = [self.top_symbols[reel]] + refill_symbols[:-1]
+            else:
+                self.new_symbols_from_tumble[reel] = refill_symbols[:]
 
-            if len(copy_reel) != self.config.num_rows[reel]:
+            board[reel] = refill_symbols + remaining_symbols
+            if len(board[reel]) != self.config.num_rows[reel]:
                 raise RuntimeError(
-                    f"new reel length must match expected board size:\n expected: {self.config.num_rows[reel]} \n actual: {len(copy_reel)}"
-                )
-            static_board[reel] = copy_reel
-
-            if self.config.include_padding and exploding_symbols > 0:
-                padding_name = str(
-                    self.reelstrip[reel][(self.reel_positions[reel] - 1) % len(self.reelstrip[reel])]
+                    f"new reel length must match expected board size:\n expected: {self.config.num_rows[reel]} \n actual: {len(board[reel])}"
                 )
-                self.top_symbols[reel] = self.create_symbol(padding_name)
-                self.new_symbols_from_tumble[reel].insert(0, self.top_symbols[reel])
+            tumbled_reels.append(reel)
 
-        self.board = static_board
-        self.get_special_symbols_on_board()
+        self.board = board
+        if len(tumbled_reels) > 0:
+            self.board_stops = None
+        self.update_special_symbols_on_reels(tumbled_reels)
 
     def set_end_tumble_event(self) -> None:
         """Emit wins related to latest cumulative tumble sequence."""
@@ -10,6 +10,8 @@ from src.events.events import (
     set_total_event,
 )
 
+WAYS_RECORD_KEYS = ("kind", "symbol", "ways", "gametype")
+
 
 class Ways:
     """Collection of Ways-wins functions"""
@@ -154,11 +156,6 @@ class Ways:
     def record_ways_wins(gamestate) -> None:
         """Record Ways type wins"""
         for win in gamestate.win_data["wins"]:
-            gamestate.record(
-                {
-                    "kind": len(win["positions"]),
-                    "symbol": win["symbol"],
-                    "ways": win["meta"]["ways"],
-                    "gametype": gamestate.gametype,
-                }
+            gamestate.record_values(
+                WAYS_RECORD_KEYS, (len(win["positions"]), win["symbol"], win["meta"]["ways"], gamestate.gametype)
             )
@@ -0,0 +1,165 @@
+"""
+Compiled game configs: integer reelstrips, symbol table and reel-weight sampler tables.
+Written to library/compiled_config/ and keyed by a hash of the game directory, so later runs and tools skip csv parsing.
+"""
+
+import os
+import bisect
+import random
+import hashlib
+import numpy as np
+
+COMPILED_CONFIG_FOLDER = "compiled_config"
+IGNORED_FOLDERS = {"library", "__pycache__"}
+SAMPLER_SEPARATOR = "/"
+
+
+def get_game_hash(game_path: str) -> str:
+    """SHA-256 of the relative path and contents of every file within a game directory, excluding outputs."""
+    sha256 = hashlib.sha256()
+    for root, folders, files in os.walk(game_path):
+        folders[:] = sorted(folder for folder in folders if folder not in IGNORED_FOLDERS)
+        for name in sorted(files):
+            if name.endswith(".pyc"):
+                continue
+            filename = os.path.join(root, name)
+            with open(filename, "rb") as f:
+                data = f.read()
+            relative_name = os.path.relpath(filename, game_path).replace(os.sep, "/").encode("UTF-8")
+            sha256.update(f"{len(relative_name)}:{len(data)}:".encode("UTF-8"))
+            sha256.update(relative_name)
+            sha256.update(data)
+    return sha256.hexdigest()
+
+
+def get_compiled_config_name(game_path: str, game_hash: str) -> str:
+    """Compiled config file for a given game directory hash."""
+    return os.path.join(game_path, "library", COMPILED_CONFIG_FOLDER, f"config_{game_hash[:16]}.npz")
+
+
+def parse_reels_csv(file_path: str) -> list:
+    """Read a reelstrip csv into one list of symbol names per reel, keeping only alphanumeric characters."""
+    reelstrips = []
+    with open(os.path.abspath(file_path), "r", encoding="UTF-8") as file:
+        for line in file:
+            split_line = line.strip().split(",")
+            if not reelstrips:
+                reelstrips = [[] for _ in split_line]
+            for reel_index, cell in enumerate(split_line):
+                symbol = "".join(filter(str.isalnum, cell))
+                assert len(symbol) > 0, "Symbol is empty."
+                reelstrips[reel_index].append(symbol)
+    return reelstrips
+
+
+def get_sampler_key(betmode: str, criteria: str, gametype: str) -> str:
+    """Key of the reel-weight sampler table used by a bet mode criteria and gametype."""
+    return SAMPLER_SEPARATOR.join([betmode, criteria, gametype])
+
+
+def make_sampler(distribution: dict) -> tuple:
+    """(values, cumulative weights, total weight) of a {value: weight} distribution, summed as get_random_outcome()."""
+    values, cumulative_weights = [], []
+    cumulative = 0.0
+    for value, weight in distribution.items():
+        cumulative += weight
+        values.append(value)
+        cumulative_weights.append(cumulative)
+    return values, cumulative_weights, sum(distribution.values())
+
+
+def draw_from_sampler(sampler: tuple):
+    """Equivalent to get_random_outcome() on the sampled distribution, using a binary search of the weights."""
+    values, cumulative_weights, total_weight = sampler
+    index = bisect.bisect_left(cumulative_weights, random.uniform(0, total_weight))
+    if index == len(values):
+        raise Exception("error drawing item from distribution")
+    return values[index]
+
+
+def compile_arrays(config: object) -> dict:
+    """Build the arrays stored in a compiled config from a constructed game config."""
+    symbols = set()
+    for reelstrips in config.reel_files.values():
+        for reel in reelstrips:
+            symbols.update(reel)
+    symbols = sorted(symbols)
+    symbol_index = {symbol: index for index, symbol in enumerate(symbols)}
+
+    arrays = {"symbols": np.array(symbols, dtype=str), "reel_files": np.array(list(config.reel_files), dtype=str)}
+    for file_index, reelstrips in enumerate(config.reel_files.values()):
+        arrays[f"reels_{file_index}"] = np.array(
+            [symbol_index[symbol] for reel in reelstrips for symbol in reel], dtype=np.int16
+        )
+        arrays[f"reel_offsets_{file_index}"] = np.cumsum([0] + [len(reel) for reel in reelstrips], dtype=np.int64)
+
+    sampler_keys = []
+    for betmode in config.bet_modes:
+        for distribution in betmode.get_distributions():
+            for gametype, reel_weights in distribution._conditions.get("reel_weights", {}).items():
+                values, cumulative_weights, total_weight = make_sampler(reel_weights)
+                arrays[f"sampler_values_{len(sampler_keys)}"] = np.array(values, dtype=str)
+                arrays[f"sampler_weights_{len(sampler_keys)}"] = np.array(cumulative_weights + [total_weight])
+                sampler_keys.append(get_sampler_key(betmode.get_name(), distribution._criteria, gametype))
+    arrays["sampler_keys"] = np.array(sampler_keys, dtype=str)
+    return arrays
+
+
+class CompiledConfig:
+    """Read access to the arrays of a compiled config, returning the same python objects as the game config."""
+
+    def __init__(self, arrays: dict, game_hash: str):
+        self.game_hash = game_hash
+        self.symbols = arrays["symbols"]
+        symbol_names = self.symbols.tolist()
+        self.reel_files = {}
+        for file_index, reel_file in enumerate(arrays["reel_files"].tolist()):
+            codes = arrays[f"reels_{file_index}"].tolist()
+            offsets = arrays[f"reel_offsets_{file_index}"].tolist()
+            self.reel_files[reel_file] = [
+                [symbol_names[code] for code in codes[start:end]] for start, end in zip(offsets[:-1], offsets[1:])
+            ]
+        self.samplers = {}
+        for sampler_index, key in enumerate(arrays["sampler_keys"].tolist()):
+            weights = arrays[f"sampler_weights_{sampler_index}"].tolist()
+            self.samplers[key] = (arrays[f"sampler_values_{sampler_index}"].tolist(), weights[:-1], weights[-1])
+
+    def get_reelstrips(self, reel_file: str) -> list:
+        """New reelstrip lists of a reel file (relative to the game directory), None if it was not compiled."""
+        reelstrips = self.reel_files.get(reel_file)
+        if reelstrips is None:
+            return None
+        return [list(reel) for reel in reelstrips]
+
+    def get_sampler(self, betmode: str, criteria: str, gametype: str) -> tuple:
+        """Reel-weight sampler table, see draw_from_sampler()."""
+        return self.samplers.get(get_sampler_key(betmode, criteria, gametype))
+
+
+def load_compiled_config(game_path: str, game_hash: str = None) -> CompiledConfig:
+    """Load the compiled config matching the current contents of a game directory, None if it has not been written."""
+    game_hash = game_hash or get_game_hash(game_path)
+    filename = get_compiled_config_name(game_path, game_hash)
+    if not os.path.isfile(filename):
+        return None
+    with np.load(filename) as arrays:
+        return CompiledConfig(dict(arrays), game_hash)
+
+
+def compile_game_config(config: object) -> CompiledConfig:
+    """Write (if needed) and attach the compiled config of a constructed game config, replacing stale versions."""
+    game_path = config.get_game_path()
+    game_hash = get_game_hash(game_path)
+    compiled = load_compiled_config(game_path, game_hash)
+    if compiled is None:
+        filename = get_compiled_config_name(game_path, game_hash)
+        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        for name in os.listdir(os.path.dirname(filename)):
+            if name.startswith("config_") and name.endswith(".npz"):
+                os.remove(os.path.join(os.path.dirname(filename), name))
+        arrays = compile_arrays(config)
+        np.savez(filename, **arrays)
+        compiled = CompiledConfig(arrays, game_hash)
+    config.compiled_config = compiled
+    config.compiled_game_path = game_path
+    return compiled
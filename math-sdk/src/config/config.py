@@ -2,6 +2,8 @@
 
 from src.config.betmode import BetMode
 from src.config.paths import PATH_TO_GAMES
+from src.config.compiled_config import load_compiled_config, parse_reels_csv
+from src.config.win_levels import WinLevelTable
 import os
 
 
@@ -47,13 +49,33 @@ class Config:
         self.reel_location = ""
         self.reels = {}
         self.padding_reels = {}  # symbol configuration displayed before the board reveal
+        # Reelstrips read by read_reels_csv(), keyed by path relative to the game directory, see compiled_config.py
+        self.reel_files = {}
+        self.compiled_config = None
+        self.compiled_game_path = None
 
         self.write_event_list = True
+        # Debug option: raise if a book event is modified after being added, (see Book.add_event())
+        self.verify_book_events = False
+        # Number of board win-evaluations memoized per worker (0 disables), see Board.cached_win_evaluation()
+        self.win_cache_size = 0
+        # Books per independently compressed zstd frame, single books can be read using BookIndex.get_book()
+        self.book_frame_size = 1000
+        # Book compression: zstd level, zstd threads per frame (-1 uses all cores), and optional trained dictionary
+        self.book_compression_level = 3
+        self.book_compression_threads = 0
+        self.book_dictionary_size = 0  # dictionary size in bytes, 0 disables dictionary training
+        self.book_dictionary_samples = 10000  # number of books sampled per mode to train the dictionary
+        self.plain_book_frames = False  # if True, published books never require a dictionary to be decoded
+        # Write an archive of unique book payloads (books excluding their id) during the merge, see book_dedup.py
+        self.dedup_books = False
 
         self.bet_modes = []
         self.opt_params = {None: None}
 
         # Define win-levels for each game-mode, returned during win information events
+        # Additional schemes should be added with register_win_levels(), lookups use compiled WinLevelTables
+        self.win_level_tables = {}
         self.win_levels = {
             "standard": {
                 1: (0, 0.1),
@@ -81,12 +103,27 @@ class Config:
             },
         }
 
-    def get_win_level(self, win_amount: float, winlevel_key: str) -> int:
+    def register_win_levels(self, winlevel_key: str, levels: dict) -> None:
+        """Add or replace a win-level scheme {level: (lower, upper)}."""
+        self.win_levels[winlevel_key] = levels
+        self.win_level_tables[winlevel_key] = WinLevelTable(levels)
+
+    def get_win_level_table(self, winlevel_key: str) -> WinLevelTable:
+        """Compiled table of a win-level scheme, recompiled if win_levels[winlevel_key] has been reassigned."""
         levels = self.win_levels[winlevel_key]
-        for idx, pair in levels.items():
-            if win_amount >= pair[0] and win_amount < pair[1]:
-                return idx
-        return RuntimeError(f"winLevel not found: {win_amount}")
+        table = self.win_level_tables.get(winlevel_key)
+        if table is None or table.levels is not levels:
+            table = WinLevelTable(levels)
+            self.win_level_tables[winlevel_key] = table
+        return table
+
+    def get_win_level(self, win_amount: float, winlevel_key: str) -> int:
+        """Win-level of a single win amount, raises RuntimeError if no level contains it."""
+        return self.get_win_level_table(winlevel_key).get_level(win_amount)
+
+    def get_win_levels(self, win_amounts, winlevel_key: str) -> object:
+        """Vectorized get_win_level(), returning a numpy array of levels."""
+        return self.get_win_level_table(winlevel_key).get_levels(win_amounts)
 
     def get_special_symbol_names(self) -> None:
         """Get names of all special symbols"""
@@ -119,24 +156,33 @@ class Config:
                 f"Detected Symbols: {list(uniqueSymbols)}"
             )
 
-    def read_reels_csv(self, file_path):
-        """Read csv from reelstrip path."""
-        reelstrips = []
-        count = 0
-        with open(os.path.abspath(file_path), "r", encoding="UTF-8") as file:
-            for line in file:
-                split_line = line.strip().split(",")
-                for reelIndex in range(len(split_line)):
-                    if count == 0:
-                        reelstrips.append(["".join([ch for ch in split_line[reelIndex] if ch.strip().isalnum()])])
-                    else:
-                        reelstrips[reelIndex].append(
-                            "".join([ch for ch in split_line[reelIndex] if ch.strip().isalnum() and len(ch) > 0])
-                        )
-
-                    assert len(reelstrips[reelIndex][-1]) > 0, "Symbol is empty."
-                count += 1
+    def get_game_path(self) -> str:
+        """Directory containing the game files."""
+        return os.path.join(PATH_TO_GAMES, self.game_id)
+
+    def get_compiled_config(self) -> object:
+        """Compiled config matching the current game directory contents, None if it has not been compiled."""
+        game_path = self.get_game_path()
+        if self.compiled_game_path != game_path:
+            self.compiled_config = load_compiled_config(game_path)
+            self.compiled_game_path = game_path
+        return self.compiled_config
+
+    def get_reel_sampler(self, betmode: str, criteria: str, gametype: str) -> tuple:
+        """Compiled reel-weight sampler table, None if the game has not been compiled."""
+        compiled = self.get_compiled_config()
+        if compiled is None:
+            return None
+        return compiled.get_sampler(betmode, criteria, gametype)
 
+    def read_reels_csv(self, file_path):
+        """Read csv from reelstrip path, reelstrips are taken from the compiled config when available."""
+        reel_file = os.path.relpath(os.path.abspath(file_path), self.get_game_path()).replace(os.sep, "/")
+        compiled = self.get_compiled_config()
+        reelstrips = compiled.get_reelstrips(reel_file) if compiled is not None else None
+        if reelstrips is None:
+            reelstrips = parse_reels_csv(file_path)
+        self.reel_files[reel_file] = [list(reel) for reel in reelstrips]
         return reelstrips
 
     def construct_paths(self) -> None:
@@ -144,6 +190,7 @@ class Config:
         self.reels_path = os.path.join(PATH_TO_GAMES, self.game_id, "reels")
         self.library_path = os.path.join(PATH_TO_GAMES, self.game_id, "library")
         self.publish_path = os.path.join(PATH_TO_GAMES, self.game_id, "library", "publish_files")
+        self.book_path = os.path.join(PATH_TO_GAMES, self.game_id, "library", "books")
 
     def check_folder_exists(self, folder_path: str) -> None:
         """Check if target folder exists, and create if it does not."""
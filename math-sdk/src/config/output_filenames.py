@@ -2,6 +2,7 @@ import os
 from collections import defaultdict
 
 from src.config.paths import PATH_TO_GAMES
+from src.write_data.lookup_binary import get_binary_lookup_name
 
 
 class OutputFiles:
@@ -30,6 +31,7 @@ class OutputFiles:
         self.lookup_path = os.path.join(self.library_path, "lookup_tables")
         self.publish_path = os.path.join(self.library_path, "publish_files")
         self.optimization_path = os.path.join(self.library_path, "optimization_files")
+        self.analytics_path = os.path.join(self.library_path, "analytics")
         self.index_config_path = self.publish_path  # Required RGS files
         self.compressed_path = self.publish_path  # Required RGS files
         self.final_lookup_path = self.publish_path  # Required RGS files
@@ -46,6 +48,7 @@ class OutputFiles:
             "optimization_path",
             "optimization_result_path",
             "publish_path",
+            "analytics_path",
         ]
         for p in all_paths:
             self.check_folder_exists(getattr(self, p))
@@ -97,8 +100,14 @@ class OutputFiles:
         for mode in self.game_config.bet_modes:
             self.force[mode.get_name()] = {
                 "folder_dir": self.force_path,
-                "names": {"force_record": f"force_record_{mode.get_name()}.json"},
-                "paths": {"force_record": os.path.join(self.force_path, f"force_record_{mode.get_name()}.json")},
+                "names": {
+                    "force_record": f"force_record_{mode.get_name()}.json",
+                    "force_index": f"force_index_{mode.get_name()}.npz",
+                },
+                "paths": {
+                    "force_record": os.path.join(self.force_path, f"force_record_{mode.get_name()}.json"),
+                    "force_index": os.path.join(self.force_path, f"force_index_{mode.get_name()}.npz"),
+                },
             }
 
     def assign_lookup_details(self):
@@ -132,17 +141,33 @@ class OutputFiles:
 
         return os.path.join(self.temp_path, filename)
 
+    def get_temp_book_index_name(self, betmode: str, thread_index: int, repeat_count: int):
+        """Naming convention for temp compressed book frame indexes."""
+        return os.path.join(self.temp_path, f"books_{betmode}_{thread_index}_{repeat_count}_index.bin")
+
     def get_temp_lookup_name(self, betmode: str, thread_index: int, repeat_count: int):
         """Naming convention for temp lookup files."""
         return os.path.join(self.temp_path, f"lookUpTable_{betmode}_{thread_index}_{repeat_count}")
 
+    def get_temp_lookup_binary_name(self, betmode: str, thread_index: int, repeat_count: int):
+        """Naming convention for temp binary lookup files."""
+        return os.path.join(self.temp_path, f"lookUpTable_{betmode}_{thread_index}_{repeat_count}.bin")
+
     def get_temp_segmented_name(self, betmode: str, thread_index: int, repeat_count: int):
         """Naming convention for temp segmented lookup files."""
         return os.path.join(self.temp_path, f"lookUpTableSegmented_{betmode}_{thread_index}_{repeat_count}")
 
+    def get_temp_compact_book_name(self, betmode: str, thread_index: int, repeat_count: int):
+        """Naming convention for temp compact book files."""
+        return os.path.join(self.temp_path, f"books_{betmode}_{thread_index}_{repeat_count}_compact.bin")
+
     def get_temp_force_name(self, betmode: str, thread_index: int, repeat_count: int):
         """Naming convention for temp force files."""
-        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.json")
+        return os.path.join(self.temp_path, f"force_{betmode}_{thread_index}_{repeat_count}.bin")
+
+    def get_temp_event_name(self, betmode: str, thread_index: int, repeat_count: int):
+        """Naming convention for temp unique-event files."""
+        return os.path.join(self.temp_path, f"events_{betmode}_{thread_index}_{repeat_count}.json")
 
     def get_final_book_name(self, betmode: str, compress: bool):
         """Returns final simulation books output name."""
@@ -156,6 +181,25 @@ class OutputFiles:
             raise RuntimeError("Logic error in name generation.")
         return os.path.join(self.compressed_path if compress else self.book_path, filename)
 
+    def get_compact_book_name(self, betmode: str):
+        """Compact books (sim id, repeat count, criteria, payout) used to replay full books."""
+        return os.path.join(self.book_path, f"books_{betmode}_compact.npy")
+
+    def get_dedup_book_names(self, betmode: str) -> tuple:
+        """Deduplicated book archive and its book-id -> payload map."""
+        return (
+            os.path.join(self.book_path, f"books_{betmode}_dedup.jsonl.zst"),
+            os.path.join(self.book_path, f"books_{betmode}_dedup_map.npy"),
+        )
+
+    def get_book_index_name(self, betmode: str):
+        """Frame index of the final compressed books, not published."""
+        return os.path.join(self.book_path, f"books_{betmode}_index.npy")
+
+    def get_book_dictionary_name(self, betmode: str):
+        """Trained zstd dictionary of the final compressed books, not published."""
+        return os.path.join(self.book_path, f"books_{betmode}.dict")
+
     def get_final_lookup_name(self, betmode: str):
         """Final csv lookup table name."""
         return os.path.join(self.lookup_path, f"lookUpTable_{betmode}.csv")
@@ -164,6 +208,32 @@ class OutputFiles:
         """Optimized lookup table"""
         return os.path.join(self.publish_path, f"lookUpTable_{betmode}_0.csv")
 
+    def get_optimized_lookup_binary_name(self, betmode: str):
+        """Binary copy of the optimized lookup table, not published."""
+        return get_binary_lookup_name(self.get_optimized_lookup_name(betmode), self.lookup_path)
+
+    def get_force_record_name(self, betmode: str):
+        """Merged force record of a bet mode."""
+        return os.path.join(self.force_path, f"force_record_{betmode}.json")
+
+    def get_force_index_name(self, betmode: str):
+        """Book-id search index built from the force record."""
+        return os.path.join(self.force_path, f"force_index_{betmode}.npz")
+
     def get_final_segmented_name(self, betmode: str):
         """Final csv segmented wins lookup table name."""
         return os.path.join(self.lookup_path, f"lookUpTableSegmented_{betmode}.csv")
+
+    def get_analytics_store_name(self, betmode: str):
+        """Columnar analytics store of a bet mode."""
+        return os.path.join(self.analytics_path, f"analytics_{betmode}.npz")
+
+    def get_analytics_store_sources(self, betmode: str) -> dict:
+        """Files the analytics store of a bet mode is built from."""
+        return {
+            "lookup": self.get_optimized_lookup_name(betmode),
+            "lookup_binary": self.get_optimized_lookup_binary_name(betmode),
+            "segmented": self.get_final_segmented_name(betmode),
+            "force_index": self.get_force_index_name(betmode),
+            "force_record": self.get_force_record_name(betmode),
+        }
@@ -0,0 +1,40 @@
+"""Win-level schemes compiled into sorted boundary arrays, looked up by binary search."""
+
+import bisect
+import numpy as np
+
+
+class WinLevelTable:
+    """
+    Sorted lower/upper boundaries of a win-level scheme {level: (lower, upper)}.
+    A win belongs to a level if lower <= win < upper, levels must not overlap.
+    """
+
+    def __init__(self, levels: dict):
+        self.levels = levels
+        ranges = sorted(levels.items(), key=lambda item: (item[1][0], item[1][1]))
+        for (level, (_, upper)), (next_level, (next_lower, _)) in zip(ranges[:-1], ranges[1:]):
+            if upper > next_lower:
+                raise ValueError(f"winLevel {level} overlaps winLevel {next_level}.")
+        self.level_ids = [level for level, _ in ranges]
+        self.lower = [float(bounds[0]) for _, bounds in ranges]
+        self.upper = [float(bounds[1]) for _, bounds in ranges]
+        self.level_array = np.array(self.level_ids)
+        self.lower_array = np.array(self.lower)
+        self.upper_array = np.array(self.upper)
+
+    def get_level(self, win_amount: float) -> int:
+        """Level containing a single win amount."""
+        index = bisect.bisect_right(self.lower, win_amount) - 1
+        if index < 0 or not win_amount < self.upper[index]:
+            raise RuntimeError(f"winLevel not found: {win_amount}")
+        return self.level_ids[index]
+
+    def get_levels(self, win_amounts) -> np.ndarray:
+        """Levels of an array of win amounts."""
+        win_amounts = np.asarray(win_amounts, dtype=np.float64)
+        index = np.searchsorted(self.lower_array, win_amounts, side="right") - 1
+        found = (index >= 0) & (win_amounts < self.upper_array[np.maximum(index, 0)])
+        if not found.all():
+            raise RuntimeError(f"winLevel not found: {win_amounts[~found].flat[0]}")
+        return self.level_array[index]
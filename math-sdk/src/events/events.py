@@ -1,47 +1,76 @@
 """Defines reusable events"""
 
-from copy import deepcopy
+from functools import wraps
 from src.events.event_constants import EventConstants
+from src.wins.win_cache import copy_win_data
 
 
 def json_ready_sym(symbol: object, special_attributes: list = None):
-    """Converts a symbol to dictionary/JSON format."""
-    assert special_attributes is not None
-    print_sym = {"name": symbol.name}
+    """
+    Converts a symbol to dictionary/JSON format.
+    If special_attributes are not provided, all config.special_symbols properties are used. In this case the
+    precomputed symbol layout is used, only reading attributes which are special properties of the symbol
+    or a single 'multiplier'/'prize' value added after creation.
+    """
     attrs = vars(symbol)
+    if special_attributes is None:
+        num_attributes, special_properties, special_attributes, added_attributes = symbol.json_layout
+        print_sym = {"name": symbol.name}
+        for key in special_properties:
+            if attrs[key] != False:
+                print_sym[key] = attrs[key]
+        if len(attrs) == num_attributes:
+            return print_sym
+        if len(attrs) == num_attributes + 1:
+            for key in added_attributes:
+                if key in attrs:
+                    if attrs[key] != False:
+                        print_sym[key] = attrs[key]
+                    return print_sym
+
+    print_sym = {"name": symbol.name}
     for key, val in attrs.items():
         if key in special_attributes and symbol.get_attribute(key) != False:
             print_sym[key] = val
     return print_sym
 
 
+def skip_in_stats_only(event_function):
+    """Event functions are a no-op when simulating in stats-only mode, no event is constructed."""
+
+    @wraps(event_function)
+    def emit_event(gamestate, *args, **kwargs):
+        if gamestate.stats_only:
+            return None
+        return event_function(gamestate, *args, **kwargs)
+
+    return emit_event
+
+
+@skip_in_stats_only
 def reveal_event(gamestate):
     """Display the initial board drawn from reelstrips."""
     board_client = []
-    special_attributes = list(gamestate.config.special_symbols.keys())
     for reel, _ in enumerate(gamestate.board):
-        board_client.append([])
-        for row in range(len(gamestate.board[reel])):
-            board_client[reel].append(json_ready_sym(gamestate.board[reel][row], special_attributes))
+        board_client.append([json_ready_sym(sym) for sym in gamestate.board[reel]])
 
     if gamestate.config.include_padding:
         for reel, _ in enumerate(board_client):
-            board_client[reel] = [json_ready_sym(gamestate.top_symbols[reel], special_attributes)] + board_client[
-                reel
-            ]
-            board_client[reel].append(json_ready_sym(gamestate.bottom_symbols[reel], special_attributes))
+            board_client[reel] = [json_ready_sym(gamestate.top_symbols[reel])] + board_client[reel]
+            board_client[reel].append(json_ready_sym(gamestate.bottom_symbols[reel]))
 
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.REVEAL.value,
         "board": board_client,
-        "paddingPositions": gamestate.reel_positions,
+        "paddingPositions": list(gamestate.reel_positions),
         "gameType": gamestate.gametype,
-        "anticipation": gamestate.anticipation,
+        "anticipation": list(gamestate.anticipation),
     }
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def fs_trigger_event(
     gamestate,
     include_padding_index=True,
@@ -52,11 +81,9 @@ def fs_trigger_event(
     assert basegame_trigger != freegame_trigger, "must set either basegame_trigger or freeSpinTrigger to = True"
     event = {}
     scatter_positions = []
-    for reel, _ in enumerate(gamestate.special_syms_on_board["scatter"]):
-        scatter_positions.append(gamestate.special_syms_on_board["scatter"][reel])
-    if include_padding_index:
-        for pos in scatter_positions:
-            pos["row"] += 1
+    for pos in gamestate.special_syms_on_board["scatter"]:
+        # Copy positions so the recorded special symbol positions are not shifted by the padding offset
+        scatter_positions.append({"reel": pos["reel"], "row": pos["row"] + 1 * include_padding_index})
 
     if basegame_trigger:
         event = {
@@ -77,6 +104,7 @@ def fs_trigger_event(
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def set_win_event(gamestate, winlevel_key: str = "standard"):
     """Used for updating cumulative win ticker (for a single outcome)."""
     if not gamestate.wincap_triggered:
@@ -94,6 +122,7 @@ def set_win_event(gamestate, winlevel_key: str = "standard"):
         gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def set_total_event(gamestate):
     """Updates win amount for a betting round (including cumulative wins across multiple freespin wins)."""
     event = {
@@ -109,6 +138,7 @@ def set_total_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def set_tumble_event(gamestate):
     """Update banner indicating wins from successive tumbles."""
     event = {
@@ -119,6 +149,7 @@ def set_tumble_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def wincap_event(gamestate):
     """Emit to indicate end of spin actions."""
     event = {
@@ -134,12 +165,13 @@ def wincap_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def win_info_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
     """
     win_data_copy = {}
-    win_data_copy["wins"] = deepcopy(gamestate.win_data["wins"])
+    win_data_copy["wins"] = copy_win_data(gamestate.win_data["wins"])
     for idx, w in enumerate(win_data_copy["wins"]):
         if include_padding_index:
             new_positions = []
@@ -173,6 +205,7 @@ def win_info_event(gamestate, include_padding_index=True):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def update_tumble_win_event(gamestate):
     """Update a banner to record successive tumble wins."""
     event = {
@@ -183,6 +216,7 @@ def update_tumble_win_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def update_freespin_event(gamestate):
     """Update the current spin number and total freegame"""
     event = {
@@ -194,6 +228,7 @@ def update_freespin_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def freespin_end_event(gamestate, winlevel_key="endFeature"):
     """End of feature trigger."""
     event = {
@@ -205,6 +240,7 @@ def freespin_end_event(gamestate, winlevel_key="endFeature"):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def final_win_event(gamestate):
     """Assigns final payout multiplier for a simulation."""
     event = {
@@ -215,6 +251,7 @@ def final_win_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def update_global_mult_event(gamestate):
     """Increment global multiplier value."""
     event = {
@@ -226,10 +263,9 @@ def update_global_mult_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def tumble_board_event(gamestate):
     """States the symbol positions removed from a board during tumble, and which new symbols should take their place."""
-    special_attributes = list(gamestate.config.special_symbols.keys())
-
     exploding = []
     for win in gamestate.win_data["wins"]:
         for pos in win["positions"]:
@@ -243,7 +279,7 @@ def tumble_board_event(gamestate):
     new_symbols = [[] for _ in range(gamestate.config.num_reels)]
     for r, _ in enumerate(gamestate.new_symbols_from_tumble):
         if len(gamestate.new_symbols_from_tumble[r]) > 0:
-            new_symbols[r] = [json_ready_sym(s, special_attributes) for s in gamestate.new_symbols_from_tumble[r]]
+            new_symbols[r] = [json_ready_sym(s) for s in gamestate.new_symbols_from_tumble[r]]
 
     event = {
         "index": len(gamestate.book.events),
@@ -254,6 +290,7 @@ def tumble_board_event(gamestate):
     gamestate.book.add_event(event)
 
 
+@skip_in_stats_only
 def enter_bonus_event(gamestate) -> None:
     "Indicate feature game entry explicitly."
     event = {
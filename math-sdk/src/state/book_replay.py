@@ -0,0 +1,65 @@
+"""Regenerate full books from compact books by replaying simulations."""
+
+from copy import deepcopy
+import numpy as np
+from src.write_data.compact_books import get_criteria_names, load_compact_books
+
+
+class BookReplayer:
+    """
+    Replays simulations with reset_seed(sim) and the recorded criteria, the events of a replayed book are identical
+    to those written by create_books(). Payout and repeat count are verified against the compact books.
+    Simulations run on a private copy of the gamestate, so the gamestate passed in is left unchanged.
+    """
+
+    def __init__(self, gamestate: object):
+        self.gamestate = deepcopy(gamestate)
+        self.compact_books = {}
+
+    def get_compact_books(self, betmode: str) -> np.ndarray:
+        """Compact books of a bet mode, loaded once."""
+        if betmode not in self.compact_books:
+            self.compact_books[betmode] = load_compact_books(
+                self.gamestate.output_files.get_compact_book_name(betmode)
+            )
+        return self.compact_books[betmode]
+
+    def replay(self, betmode: str, compact_book: np.void) -> dict:
+        """Run the simulation of a compact book and return the full book."""
+        gamestate = self.gamestate
+        book_id = int(compact_book["id"])
+        gamestate.betmode = betmode
+        gamestate.stats_only = False
+        gamestate.library = {}
+        gamestate.repeat_counts = {}
+        gamestate.recorded_events = {}
+        gamestate.criteria = get_criteria_names(gamestate, betmode)[int(compact_book["criteria"])]
+        gamestate.run_spin(book_id - 1)
+
+        book = gamestate.library.pop(book_id)
+        if book["payoutMultiplier"] != int(compact_book["payout"]) or gamestate.repeat_counts[book_id] != int(
+            compact_book["repeat_count"]
+        ):
+            raise RuntimeError(
+                f"Replay of book {book_id} in {betmode} does not match its compact book: "
+                f"payout {book['payoutMultiplier']} (expected {int(compact_book['payout'])}), "
+                f"repeat count {gamestate.repeat_counts[book_id]} (expected {int(compact_book['repeat_count'])})."
+            )
+        return book
+
+    def get_book(self, betmode: str, book_id: int) -> dict:
+        """Replay a single book."""
+        compact_books = self.get_compact_books(betmode)
+        row = int(np.searchsorted(compact_books["id"], book_id))
+        if row >= len(compact_books) or compact_books["id"][row] != book_id:
+            raise KeyError(f"Book-id {book_id} is not contained in the compact books of {betmode}")
+        return self.replay(betmode, compact_books[row])
+
+    def iter_books(self, betmode: str, book_ids: list = None):
+        """Yield replayed books, for all compact books or the given book-ids."""
+        if book_ids is None:
+            for compact_book in self.get_compact_books(betmode):
+                yield self.replay(betmode, compact_book)
+        else:
+            for book_id in book_ids:
+                yield self.get_book(betmode, book_id)
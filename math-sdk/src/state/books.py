@@ -6,26 +6,52 @@ from copy import deepcopy
 class Book:
     "Stores simulation information."
 
-    def __init__(self, book_id: int, criteria: str):
-        "Initialize simulation book"
+    def __init__(self, book_id: int, criteria: str, verify_events: bool = False, record_events: bool = True):
+        "Initialize simulation book, events are discarded if record_events is False (stats-only simulations)"
         self.id = book_id
         self.payout_multiplier = 0.0
         self.events = []
         self.criteria = criteria
         self.basegame_wins = 0.0
         self.freegame_wins = 0.0
+        self.verify_events = verify_events
+        self.record_events = record_events
+        self.event_snapshots = []
+        self.event_types = {}
 
     def add_event(self, event: dict):
-        "Append event to book."
-        self.events.append(deepcopy(event))
+        """
+        Append event to book. The book takes ownership of the event without copying it,
+        so events must be built from new lists/dicts which are not modified by the gamestate afterwards.
+        """
+        if not self.record_events:
+            return
+        self.events.append(event)
+        if event["type"] not in self.event_types:
+            self.event_types[event["type"]] = event
+        if self.verify_events:
+            self.event_snapshots.append(deepcopy(event))
 
     def append_book_items(self, event_id: int, appended_info: dict):
         "Modify an existing book event at position 'event_id'"
         for k, v in appended_info.items():
             self.events[event_id][k] = v
+        if self.verify_events:
+            self.event_snapshots[event_id] = deepcopy(self.events[event_id])
+
+    def check_events(self):
+        "Debug check that no event has been modified since being added to the book."
+        for event, snapshot in zip(self.events, self.event_snapshots):
+            if event != snapshot:
+                raise RuntimeError(
+                    f"Book {self.id}: event {snapshot.get('index')} ({snapshot.get('type')}) was modified after being added.\n"
+                    f"added: {snapshot}\ncurrent: {event}"
+                )
 
     def to_json(self):
         "Return JSON-ready object."
+        if self.verify_events:
+            self.check_events()
         json_book = {
             "id": self.id,
             "payoutMultiplier": int(round(self.payout_multiplier * 100, 0)),
@@ -6,8 +6,12 @@ from warnings import warn
 import shutil
 import asyncio
 from typing import Dict
+import numpy as np
 
-from src.write_data.write_data import output_lookup_and_force_files
+from src.write_data.write_data import output_lookup_and_force_files, merge_book_files, restrict_optimized_lookup
+from src.write_data.lookup_binary import load_lookup_table
+from src.write_data.compact_books import load_compact_books
+from src.config.compiled_config import compile_game_config
 
 
 def create_books(
@@ -18,8 +22,12 @@ def create_books(
     threads: int,
     compress: bool,
     profiling: bool,
+    stats_only: bool = False,
 ):
-    """Main run-function for simulating game outcomes and outputting all files."""
+    """
+    Main run-function for simulating game outcomes and outputting all files.
+    stats_only runs simulations without constructing events or writing books, only lookup tables and force files.
+    """
     for key, ns in num_sim_args.items():
         if all([ns > 0, ns > batch_size * batch_size]):
             assert (
@@ -27,13 +35,15 @@ def create_books(
             ), "mode-sims/(batch * threads) must be divisible with no remainder"
         num_sim_args[key] = int(ns)
 
-    if not compress and sum(num_sim_args.values()) > 1e4:
+    if not compress and not stats_only and sum(num_sim_args.values()) > 1e4:
         warn("Generating large number of uncompressed books!")
 
     if profiling and threads > 1:
         raise RuntimeError("Multithread profiling not supported, threads must = 1 with profiling enabled")
 
     startTime = time.time()
+    compile_game_config(config)
+    gamestate.output_files.check_folder_exists(gamestate.output_files.temp_path)
     print("\nCreating books...")
     for betmode_name in num_sim_args:
         if num_sim_args[betmode_name] > 0:
@@ -48,6 +58,7 @@ def create_books(
                 compress=compress,
                 write_event_list=config.write_event_list,
                 profiling=profiling,
+                stats_only=stats_only,
             )
             output_lookup_and_force_files(
                 threads,
@@ -57,7 +68,9 @@ def create_books(
                 gamestate,
                 num_sims=num_sim_args[betmode_name],
                 compress=compress,
-            )  # , write_event_list=config.write_event_list)
+                write_event_list=config.write_event_list,
+                stats_only=stats_only,
+            )
     shutil.rmtree(gamestate.output_files.temp_path)
     print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
 
@@ -100,11 +113,12 @@ async def profile_and_visualize(
     repeat,
     compress,
     write_event_list,
+    stats_only=False,
 ):
     """Create flame-graph, automatically opens output on localhost."""
     output_string = f"games/{game_id}/simulationProfile_{betmode}.prof"
     cProfile.runctx(
-        "gamestate.run_sims(all_betmode_configs, betmode, sim_allocation, threads, num_repeats, sims_per_thread, 0, repeat, compress, write_event_list)",
+        "gamestate.run_sims(all_betmode_configs, betmode, sim_allocation, threads, num_repeats, sims_per_thread, 0, repeat, compress, write_event_list, stats_only)",
         globals(),
         locals(),
         output_string,
@@ -122,6 +136,7 @@ def run_multi_process_sims(
     compress: bool = True,
     write_event_list: bool = False,
     profiling: bool = False,
+    stats_only: bool = False,
 ):
     """Setup multiprocessing manager for running all game-mode simulations."""
     print("\nCreating books for", game_id, "in", betmode)
@@ -148,6 +163,7 @@ def run_multi_process_sims(
                     repeat=repeat,
                     compress=compress,
                     write_event_list=write_event_list,
+                    stats_only=stats_only,
                 )
             )
         elif threads == 1:
@@ -162,6 +178,7 @@ def run_multi_process_sims(
                 repeat_count=repeat,
                 compress=compress,
                 write_event_list=write_event_list,
+                stats_only=stats_only,
             )
         else:
             for thread in range(threads):
@@ -178,6 +195,7 @@ def run_multi_process_sims(
                         repeat,
                         compress,
                         write_event_list,
+                        stats_only,
                     ),
                 )
                 print("Started thread", thread)
@@ -189,3 +207,89 @@ def run_multi_process_sims(
             print("Finished joining threads.")
             gamestate.combine(all_betmode_configs, betmode)
             gamestate.get_betmode(betmode).lock_force_keys()
+
+
+def read_sim_criteria(segmented_name: str) -> Dict[int, str]:
+    """Map simulation numbers (book-id - 1) to their win criteria, from a segmented lookup table."""
+    sim_to_criteria = {}
+    with open(segmented_name, "r", encoding="UTF-8") as f:
+        for line in f:
+            book_id, criteria, _, _ = line.strip().split(",")
+            sim_to_criteria[int(book_id) - 1] = criteria
+    return sim_to_criteria
+
+
+def get_kept_book_ids(gamestate: object, betmode_name: str) -> np.ndarray:
+    """Book-ids with a non-zero weight in the optimized (_0) lookup table."""
+    output_files = gamestate.output_files
+    table = load_lookup_table(output_files.get_optimized_lookup_name(betmode_name), output_files.lookup_path)
+    return np.asarray(table["id"][table["weight"] > 0])
+
+
+def replay_books(
+    gamestate: object,
+    betmodes: list,
+    threads: int,
+    compress: bool,
+    book_ids: dict = None,
+):
+    """
+    Second phase of a two-phase run, after create_books(..., stats_only=True) and optimization.
+    Books are only constructed for kept book-ids (book_ids[mode] if given, otherwise those with non-zero weight in
+    the optimized lookup table), each payout is verified against the first phase before the books are written.
+    The _0 lookup table is then rewritten to the replayed book-ids, so the published books and table match.
+    """
+    startTime = time.time()
+    print("\nReplaying kept books...")
+    gamestate.output_files.check_folder_exists(gamestate.output_files.temp_path)
+    for betmode_name in betmodes:
+        gamestate.betmode = betmode_name
+        lookup = load_lookup_table(gamestate.output_files.get_final_lookup_name(betmode_name))
+        if book_ids is not None and betmode_name in book_ids:
+            ids = np.unique(np.asarray(book_ids[betmode_name], dtype=np.uint64))
+        else:
+            ids = get_kept_book_ids(gamestate, betmode_name)
+        positions = np.minimum(np.searchsorted(lookup["id"], ids), max(len(lookup) - 1, 0))
+        if len(ids) > 0 and (len(lookup) == 0 or np.any(lookup["id"][positions] != ids)):
+            raise ValueError(f"Kept book-ids for {betmode_name} are not contained in the simulated lookup table.")
+        sim_ids = (ids - 1).tolist()
+        payouts = lookup["payout"][positions].tolist() if len(ids) > 0 else []
+        sim_to_criteria = read_sim_criteria(gamestate.output_files.get_final_segmented_name(betmode_name))
+
+        chunks = np.array_split(np.arange(len(sim_ids)), threads)
+        if threads == 1:
+            gamestate.replay_sims(betmode_name, sim_ids, sim_to_criteria, payouts, 0, compress)
+        else:
+            processes = []
+            for thread, chunk in enumerate(chunks):
+                process = Process(
+                    target=gamestate.replay_sims,
+                    args=(
+                        betmode_name,
+                        [sim_ids[i] for i in chunk],
+                        sim_to_criteria,
+                        [payouts[i] for i in chunk],
+                        thread,
+                        compress,
+                    ),
+                )
+                process.start()
+                processes += [process]
+            for process in processes:
+                process.join()
+            if any(process.exitcode != 0 for process in processes):
+                raise RuntimeError(f"Replaying books for {betmode_name} failed, see thread output above.")
+
+        merge_book_files(gamestate, betmode_name, threads, 1, compress)
+        restrict_optimized_lookup(gamestate, betmode_name, ids)
+        print(f"Replayed {len(sim_ids)} of {len(lookup)} books for {betmode_name}.")
+    shutil.rmtree(gamestate.output_files.temp_path)
+    print("\nFinished replaying books in", time.time() - startTime, "seconds.\n")
+
+
+def publish_compact_books(gamestate: object, betmodes: list, threads: int, compress: bool):
+    """Write full books for every simulation in the compact books (i.e after a stats-only run), by replaying them."""
+    book_ids = {}
+    for betmode_name in betmodes:
+        book_ids[betmode_name] = load_compact_books(gamestate.output_files.get_compact_book_name(betmode_name))["id"]
+    replay_books(gamestate, betmodes, threads, compress, book_ids)
@@ -2,9 +2,11 @@ from copy import copy
 from abc import ABC, abstractmethod
 from warnings import warn
 import random
+from array import array
 
 # from src.config.config import BetMode
 from src.wins.win_manager import WinManager
+from src.wins.win_cache import WinCache
 from src.calculations.symbol import SymbolStorage
 from src.config.output_filenames import OutputFiles
 from src.state.books import Book
@@ -13,8 +15,10 @@ from src.write_data.write_data import (
     make_lookup_tables,
     write_json,
     make_lookup_pay_split,
-    write_library_events,
+    write_event_catalogue,
 )
+from src.write_data.lookup_binary import make_lookup_binary
+from src.write_data.compact_books import make_compact_books
 
 
 class GeneralGameState(ABC):
@@ -24,15 +28,22 @@ class GeneralGameState(ABC):
         self.config = config
         self.output_files = OutputFiles(self.config)
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
+        self.win_cache = WinCache(self.config.win_cache_size)
         self.library = {}
+        self.repeat_counts = {}
+        self.event_catalogue = {}
         self.recorded_events = {}
+        self.description_ids = {}
+        self.description_index = {}
+        self.descriptions = []
         self.special_symbol_functions = {}
         self.temp_wins = []
         self.create_symbol_map()
         self.assign_special_sym_function()
         self.sim = 0
         self.criteria = ""
-        self.book = Book(self.sim, self.criteria)
+        self.stats_only = False
+        self.book = Book(self.sim, self.criteria, self.config.verify_book_events)
         self.repeat = True
         self.repeat_count = 0
         self.win_data = {
@@ -67,8 +78,9 @@ class GeneralGameState(ABC):
         self.board = [[[] for _ in range(self.config.num_rows[x])] for x in range(self.config.num_reels)]
         self.top_symbols = None
         self.bottom_symbols = None
+        self.board_stops = None
         self.book_id = self.sim + 1
-        self.book = Book(self.book_id, self.criteria)
+        self.book = Book(self.book_id, self.criteria, self.config.verify_book_events, not self.stats_only)
         self.win_data = {
             "totalWin": 0,
             "wins": [],
@@ -138,12 +150,37 @@ class GeneralGameState(ABC):
         Freespin triggers are most commonly used, i.e {"kind": X, "symbol": "S", "gametype": "basegame"}
         It is recommended to otherwise record rare events with several keys in order to reduce the overall file-size containing many duplicate ids
         """
-        dstr = {}
-        for k, v in description.items():
-            dstr[str(k)] = str(v)
-        self.temp_wins.append(dstr)
+        self.record_values(tuple(description), tuple(description.values()))
+
+    def record_values(self, keys: tuple, values: tuple) -> None:
+        """Record a description from parallel key and value tuples, avoiding a new dict for every win."""
+        # values are keyed with their type, since 2, 2.0 and True are equal dict keys but different strings
+        cache_key = (keys, tuple((type(v), v) for v in values))
+        try:
+            description_id = self.description_ids.get(cache_key)
+        except TypeError:
+            # unhashable values (i.e lists) are not cached, only their string form is interned
+            description_id = self.intern_description(keys, values)
+        else:
+            if description_id is None:
+                description_id = self.intern_description(keys, values)
+                self.description_ids[cache_key] = description_id
+        self.temp_wins.append(description_id)
         self.temp_wins.append(self.book_id)
 
+    def intern_description(self, keys: tuple, values: tuple) -> int:
+        """
+        Assign a small int to a description, strings are only built the first time it is seen.
+        Descriptions equal after sorting and converting to strings share the same id.
+        """
+        description = tuple(sorted((str(k), str(v)) for k, v in zip(keys, values)))
+        description_id = self.description_index.get(description)
+        if description_id is None:
+            description_id = len(self.descriptions)
+            self.description_index[description] = description_id
+            self.descriptions.append(description)
+        return description_id
+
     def check_force_keys(self, description) -> None:
         """Check and append unique force-key parameters."""
         current_mode_force_keys = self.get_current_betmode().get_force_keys()  # type:ignore
@@ -165,23 +202,31 @@ class GeneralGameState(ABC):
     def imprint_wins(self) -> None:
         """Record all events to library if criteria conditions are satisfied."""
         for temp_win_index in range(int(len(self.temp_wins) / 2)):
-            description = tuple(sorted(self.temp_wins[2 * temp_win_index].items()))
+            description_id = self.temp_wins[2 * temp_win_index]
             book_id = self.temp_wins[2 * temp_win_index + 1]
-            if description in self.recorded_events and (
-                book_id not in self.recorded_events[description]["bookIds"]
-            ):
-                self.recorded_events[description]["timesTriggered"] += 1
-                self.recorded_events[description]["bookIds"] += [book_id]
-            elif description not in self.recorded_events:
-                self.check_force_keys(description)
-                self.recorded_events[description] = {
+            recorded = self.recorded_events.get(description_id)
+            if recorded is None:
+                self.check_force_keys(self.descriptions[description_id])
+                self.recorded_events[description_id] = {
                     "timesTriggered": 1,
-                    "bookIds": [book_id],
+                    "bookIds": array("I", [book_id]),
                 }
+            elif recorded["bookIds"][-1] != book_id:
+                # book-ids are imprinted in ascending order, so a repeat can only match the last entry
+                recorded["timesTriggered"] += 1
+                recorded["bookIds"].append(book_id)
         self.temp_wins = []
         self.library[self.sim + 1] = copy(self.book.to_json())
+        self.repeat_counts[self.sim + 1] = self.repeat_count
+        self.update_event_catalogue()
         self.win_manager.update_end_round_wins()
 
+    def update_event_catalogue(self) -> None:
+        """Keep one example of each event type from accepted books."""
+        for event_type, event in self.book.event_types.items():
+            if event_type not in self.event_catalogue:
+                self.event_catalogue[event_type] = {key: val for key, val in event.items() if key != "index"}
+
     def update_final_win(self) -> None:
         """Separate base and freegame wins, verify the sum of there are equal to the final simulation payout."""
         final = round(min(self.win_manager.running_bet_win, self.config.wincap), 2)
@@ -241,12 +286,21 @@ class GeneralGameState(ABC):
         repeat_count,
         compress=True,
         write_event_list=True,
+        stats_only=False,
     ) -> None:
-        """Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished."""
+        """
+        Assigns criteria and runs individual simulations. Results are stored in temporary file to be combined when all threads are finished.
+        With stats_only, events are not constructed and no books are written, only lookup tables and force records.
+        """
         self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
+        self.win_cache = WinCache(self.config.win_cache_size)
         self.library = {}
+        self.repeat_counts = {}
+        self.recorded_events = {}
+        self.event_catalogue = {}
         self.betmode = betmode
         self.num_sims = num_sims
+        self.stats_only = stats_only
         for sim in range(
             thread_index * num_sims + (total_threads * num_sims) * repeat_count,
             (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
@@ -263,17 +317,60 @@ class GeneralGameState(ABC):
             f"[baseGame: {round(self.win_manager.cumulative_base_wins/(num_sims*mode_cost), 3)}, freeGame: {round(self.win_manager.cumulative_free_wins/(num_sims*mode_cost), 3)}]",
             flush=True,
         )
+        if self.win_cache.enabled():
+            print(
+                "Thread " + str(thread_index),
+                f"win cache [hits: {self.win_cache.hits}, misses: {self.win_cache.misses}, hit-rate: {round(self.win_cache.hit_rate(), 3)}]",
+                flush=True,
+            )
 
-        write_json(
-            self,
-            self.output_files.get_temp_multi_thread_name(
-                betmode, thread_index, repeat_count, (compress) * True + (not compress) * False
-            ),
-        )
+        if not stats_only:
+            write_json(
+                self,
+                self.output_files.get_temp_multi_thread_name(
+                    betmode, thread_index, repeat_count, (compress) * True + (not compress) * False
+                ),
+                self.output_files.get_temp_book_index_name(betmode, thread_index, repeat_count),
+            )
         print_recorded_wins(self, self.output_files.get_temp_force_name(betmode, thread_index, repeat_count))
         make_lookup_tables(self, self.output_files.get_temp_lookup_name(betmode, thread_index, repeat_count))
         make_lookup_pay_split(self, self.output_files.get_temp_segmented_name(betmode, thread_index, repeat_count))
+        make_lookup_binary(self, self.output_files.get_temp_lookup_binary_name(betmode, thread_index, repeat_count))
+        make_compact_books(self, self.output_files.get_temp_compact_book_name(betmode, thread_index, repeat_count))
 
-        if write_event_list:
-            write_library_events(self, list(self.library.values()), betmode)
+        if write_event_list and not stats_only:
+            write_event_catalogue(
+                self.event_catalogue, self.output_files.get_temp_event_name(betmode, thread_index, repeat_count)
+            )
         betmode_copy_list.append(self.config.bet_modes)
+
+    def replay_sims(self, betmode, sim_ids, sim_to_criteria, payouts, thread_index, compress=True) -> None:
+        """
+        Second phase of a two-phase run: replay selected simulations (seeded by reset_seed(sim)) to construct their
+        books. The payout of every replayed book must match the payout recorded in the first (stats-only) phase.
+        """
+        self.win_manager = WinManager(self.config.basegame_type, self.config.freegame_type)
+        self.win_cache = WinCache(self.config.win_cache_size)
+        self.library = {}
+        self.repeat_counts = {}
+        self.recorded_events = {}
+        self.event_catalogue = {}
+        self.betmode = betmode
+        self.stats_only = False
+        mismatched = []
+        for sim, payout in zip(sim_ids, payouts):
+            self.criteria = sim_to_criteria[sim]
+            self.run_spin(sim)
+            if self.library[sim + 1]["payoutMultiplier"] != payout:
+                mismatched.append(sim + 1)
+        if len(mismatched) > 0:
+            raise RuntimeError(
+                f"Replayed payouts do not match the first simulation phase for {len(mismatched)} books in {betmode}, "
+                f"i.e book-ids {mismatched[:10]}. Simulations must only depend on reset_seed(sim) and the criteria."
+            )
+
+        write_json(
+            self,
+            self.output_files.get_temp_multi_thread_name(betmode, thread_index, 0, compress),
+            self.output_files.get_temp_book_index_name(betmode, thread_index, 0),
+        )
@@ -0,0 +1,47 @@
+"""Least-recently-used store of win evaluations for repeated boards."""
+
+from collections import OrderedDict
+
+
+def copy_win_data(data):
+    """Copy nested win-data dictionaries and lists, leaving values shared."""
+    if isinstance(data, dict):
+        return {key: copy_win_data(val) for key, val in data.items()}
+    if isinstance(data, list):
+        return [copy_win_data(val) for val in data]
+    return data
+
+
+class WinCache:
+    """Bounded win-data memoization, keyed by board signature. A max_size of 0 disables the cache."""
+
+    def __init__(self, max_size: int = 0):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def enabled(self) -> bool:
+        """Cache is only used with a positive size limit."""
+        return self.max_size > 0
+
+    def get(self, key: tuple):
+        """Return a copy of cached win data, or None if the key has not been evaluated."""
+        if key not in self.entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return copy_win_data(self.entries[key])
+
+    def put(self, key: tuple, win_data: dict) -> None:
+        """Store a copy of win data, evicting the least recently used entry when full."""
+        self.entries[key] = copy_win_data(win_data)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def hit_rate(self) -> float:
+        """Fraction of cache lookups returning stored win data."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups > 0 else 0.0
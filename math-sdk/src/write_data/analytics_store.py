@@ -0,0 +1,186 @@
+"""
+Per-mode columnar analytics store, combining the optimized lookup table, pay-split table and force index.
+Written to library/analytics/ after simulations and lookup table swaps, and rebuilt on load if any source is newer.
+Store and source filenames are taken from OutputFiles (get_analytics_store_name, get_analytics_store_sources).
+"""
+
+import os
+import json
+import numpy as np
+from src.write_data.force_index import ForceIndex
+from src.write_data.lookup_binary import LOOKUP_DTYPE, load_lookup_table
+
+NO_CRITERIA = -1
+
+
+def read_segmented_table(split_file: str) -> tuple:
+    """Book-id, criteria (fence), basegame and freegame win columns of a segmented lookup table."""
+    with open(split_file, "r", encoding="UTF-8") as f:
+        columns = np.loadtxt(f, delimiter=",", dtype=str, ndmin=2).reshape(-1, 4)
+    return (
+        columns[:, 0].astype(np.uint64),
+        columns[:, 1],
+        columns[:, 2].astype(np.float64),
+        columns[:, 3].astype(np.float64),
+    )
+
+
+class AnalyticsStore:
+    """
+    One row per book of the optimized lookup table: id, weight, payout, base_win, free_win and criteria,
+    where criteria is an index into criteria_names (NO_CRITERIA if the book is missing from the segmented table).
+
+    Force keys are stored as the book-ids of each force-record entry. force_mask() expands a search key into a
+    boolean column aligned with the rows, so filters can be combined with criteria and payout masks.
+    """
+
+    def __init__(self, columns: dict, criteria_names: list, force_index: ForceIndex):
+        self.ids = np.asarray(columns["id"], dtype=np.uint64)
+        self.weight = np.asarray(columns["weight"], dtype=np.uint64)
+        self.payout = np.asarray(columns["payout"], dtype=np.uint64)
+        self.base_win = np.asarray(columns["base_win"], dtype=np.float64)
+        self.free_win = np.asarray(columns["free_win"], dtype=np.float64)
+        self.criteria = np.asarray(columns["criteria"], dtype=np.int32)
+        self.criteria_names = list(criteria_names)
+
+        num_ids = int(self.ids.max()) + 1 if len(self.ids) > 0 else 1
+        self.id_rows = np.full(max(num_ids, force_index.num_books + 1), -1, dtype=np.int64)
+        self.id_rows[self.ids.astype(np.int64)] = np.arange(len(self.ids))
+
+        payouts = np.zeros(len(self.id_rows), dtype=np.int64)
+        payouts[self.ids.astype(np.int64)] = self.payout
+        self.force_index = ForceIndex(
+            force_index.keys,
+            force_index.times_triggered,
+            force_index.entry_offsets,
+            force_index.book_ids,
+            payouts,
+        )
+
+    @classmethod
+    def build(cls, output_files: object, mode: str, force_index: ForceIndex = None) -> "AnalyticsStore":
+        """Combine the current lookup, segmented and force files of a bet mode."""
+        sources = output_files.get_analytics_store_sources(mode)
+        table = load_lookup_table(sources["lookup"], os.path.dirname(sources["lookup_binary"]))
+        columns = {name: np.array(table[name]) for name in LOOKUP_DTYPE.names}
+        columns["criteria"] = np.full(len(table), NO_CRITERIA, dtype=np.int32)
+        criteria_names = []
+        if os.path.isfile(sources["segmented"]):
+            split_ids, fences, base_wins, free_wins = read_segmented_table(sources["segmented"])
+            unique_fences, fence_codes = np.unique(fences, return_inverse=True)
+            criteria_names = unique_fences.tolist()
+            order = np.argsort(split_ids, kind="stable")
+            positions = np.searchsorted(split_ids[order], columns["id"])
+            found = positions < len(order)
+            found[found] = split_ids[order][positions[found]] == columns["id"][found]
+            split_rows = order[positions[found]]
+            columns["criteria"][found] = fence_codes.ravel()[split_rows]
+            columns["base_win"][found] = base_wins[split_rows]
+            columns["free_win"][found] = free_wins[split_rows]
+
+        if force_index is None:
+            if os.path.isfile(sources["force_index"]):
+                force_index = ForceIndex.load(sources["force_index"])
+            elif os.path.isfile(sources["force_record"]):
+                with open(sources["force_record"], "r", encoding="UTF-8") as f:
+                    force_index = ForceIndex.from_force_record(json.load(f))
+            else:
+                force_index = ForceIndex([], [], [0], [])
+        return cls(columns, criteria_names, force_index)
+
+    @classmethod
+    def load(cls, filename: str) -> "AnalyticsStore":
+        """Load store written by save()."""
+        with np.load(filename) as data:
+            force_index = ForceIndex(
+                json.loads(str(data["force_keys"])),
+                data["force_times_triggered"],
+                data["force_entry_offsets"],
+                data["force_book_ids"],
+            )
+            return cls(data, data["criteria_names"].tolist(), force_index)
+
+    def save(self, filename: str) -> None:
+        """Write store to file (.npz), uncompressed so columns load without decoding."""
+        with open(filename, "wb") as f:
+            np.savez(
+                f,
+                id=self.ids,
+                weight=self.weight,
+                payout=self.payout,
+                base_win=self.base_win,
+                free_win=self.free_win,
+                criteria=self.criteria,
+                criteria_names=np.array(self.criteria_names, dtype=str),
+                force_keys=np.array(json.dumps(self.force_index.keys)),
+                force_times_triggered=self.force_index.times_triggered,
+                force_entry_offsets=self.force_index.entry_offsets,
+                force_book_ids=self.force_index.book_ids,
+            )
+
+    def get_rows(self, book_ids) -> np.ndarray:
+        """Row of each book-id (repeated ids give repeated rows)."""
+        return self.id_rows[np.asarray(book_ids, dtype=np.int64)]
+
+    def get_criteria(self, base_mode_name: str = None) -> np.ndarray:
+        """Criteria name of each row, the '0' (basegame) criteria is renamed to base_mode_name if given."""
+        names = np.array(self.criteria_names + [""], dtype=str)
+        if base_mode_name is not None:
+            names[names == "0"] = base_mode_name
+        return names[self.criteria]
+
+    def criteria_mask(self, criteria: str) -> np.ndarray:
+        """Rows simulated under a criteria."""
+        if criteria not in self.criteria_names:
+            return np.zeros(len(self.ids), dtype=bool)
+        return self.criteria == self.criteria_names.index(criteria)
+
+    def payout_mask(self, min_payout: float = None, max_payout: float = None) -> np.ndarray:
+        """Rows with min_payout <= payout < max_payout, using lookup table units."""
+        mask = np.ones(len(self.ids), dtype=bool)
+        if min_payout is not None:
+            mask &= self.payout >= min_payout
+        if max_payout is not None:
+            mask &= self.payout < max_payout
+        return mask
+
+    def force_mask(self, search_key: dict) -> np.ndarray:
+        """Rows with a partial match to a force search key, see ForceIndex.match()."""
+        return self.force_index.match(search_key)[self.ids.astype(np.int64)]
+
+    def force_rows(self, search_key: dict) -> np.ndarray:
+        """Rows of every matched force entry, books matched by several entries are repeated."""
+        rows = self.get_rows(self.force_index.entry_ids(self.force_index.match_entries(search_key)))
+        return rows[rows >= 0]
+
+    def total_weight(self, mask: np.ndarray = None) -> int:
+        """Summed weight of all (or the masked) rows."""
+        weights = self.weight if mask is None else self.weight[mask]
+        return int(weights.sum(dtype=np.uint64))
+
+
+def is_store_current(output_files: object, mode: str) -> bool:
+    """True if the store exists and is not older than any of its source files."""
+    filename = output_files.get_analytics_store_name(mode)
+    if not os.path.isfile(filename):
+        return False
+    store_time = os.path.getmtime(filename)
+    return all(
+        store_time >= os.path.getmtime(source)
+        for source in output_files.get_analytics_store_sources(mode).values()
+        if os.path.isfile(source)
+    )
+
+
+def write_analytics_store(output_files: object, mode: str, force_index: ForceIndex = None) -> AnalyticsStore:
+    """Build and save the analytics store of a bet mode."""
+    store = AnalyticsStore.build(output_files, mode, force_index)
+    store.save(output_files.get_analytics_store_name(mode))
+    return store
+
+
+def load_analytics_store(output_files: object, mode: str) -> AnalyticsStore:
+    """Load the analytics store of a bet mode, rebuilding it if it is missing or out of date."""
+    if is_store_current(output_files, mode):
+        return AnalyticsStore.load(output_files.get_analytics_store_name(mode))
+    return write_analytics_store(output_files, mode)
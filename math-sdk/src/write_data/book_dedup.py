@@ -0,0 +1,79 @@
+"""
+Deduplicated book archive: books are hashed excluding their id, unique payloads are stored once together with a
+book-id -> payload map. The archive is internal, published books are still written with one book per id.
+"""
+
+import re
+import json
+import hashlib
+import numpy as np
+import zstandard as zstd
+from src.write_data.book_index import read_temp_frames
+from src.write_data.book_stream import iter_books
+
+DEDUP_MAP_DTYPE = np.dtype([("id", "<u8"), ("payload", "<u4")])
+BOOK_ID_PREFIX = re.compile(rb'^\{"id": (\d+), ')
+
+
+def iter_temp_book_lines(file_list: list, index_list: list = None):
+    """Yield each temporary book as a JSON encoded line (bytes, without newline)."""
+    for position, filename in enumerate(file_list):
+        if filename.endswith(".zst"):
+            for _, raw in read_temp_frames(filename, index_list[position]):
+                yield from (line for line in raw.split(b"\n") if line)
+        else:
+            for book in iter_books(filename):
+                yield json.dumps(book).encode("UTF-8")
+
+
+def split_book_id(line: bytes) -> tuple:
+    """Return (book-id, payload), the payload is the JSON encoded book without its id."""
+    match = BOOK_ID_PREFIX.match(line)
+    if match is not None:
+        return int(match.group(1)), b"{" + line[match.end() :]
+    book = json.loads(line)
+    book_id = book.pop("id")
+    return book_id, json.dumps(book).encode("UTF-8")
+
+
+def dedup_books(book_lines, archive_name: str, map_name: str, level: int = 3) -> dict:
+    """
+    Write unique payloads (one per line, zstd compressed) to archive_name and the id -> payload map to map_name.
+    Returns the number of books and unique payloads, and their raw sizes.
+    """
+    payload_positions = {}
+    book_ids, payload_ids = [], []
+    raw_size, unique_size = 0, 0
+    with open(archive_name, "wb") as f:
+        with zstd.ZstdCompressor(level=level).stream_writer(f) as archive:
+            for line in book_lines:
+                book_id, payload = split_book_id(line)
+                raw_size += len(line) + 1
+                digest = hashlib.blake2b(payload, digest_size=16).digest()
+                position = payload_positions.get(digest)
+                if position is None:
+                    position = len(payload_positions)
+                    payload_positions[digest] = position
+                    archive.write(payload + b"\n")
+                    unique_size += len(payload) + 1
+                book_ids.append(book_id)
+                payload_ids.append(position)
+
+    dedup_map = np.zeros(len(book_ids), dtype=DEDUP_MAP_DTYPE)
+    dedup_map["id"], dedup_map["payload"] = book_ids, payload_ids
+    np.save(map_name, dedup_map)
+    return {
+        "books": len(book_ids),
+        "unique_payloads": len(payload_positions),
+        "raw_mb": round(raw_size / 1e6, 3),
+        "dedup_mb": round((unique_size + dedup_map.nbytes) / 1e6, 3),
+        "saved": round(1 - (unique_size + dedup_map.nbytes) / raw_size, 3) if raw_size > 0 else 0,
+    }
+
+
+def iter_dedup_books(archive_name: str, map_name: str):
+    """Expand the archive back into one JSON encoded book per id (str, without newline), in the original book order."""
+    with open(archive_name, "rb") as f:
+        payloads = zstd.ZstdDecompressor().stream_reader(f).read().split(b"\n")
+    for book_id, payload in np.load(map_name):
+        yield f'{{"id": {int(book_id)}, ' + payloads[payload][1:].decode("UTF-8")
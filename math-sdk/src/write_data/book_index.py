@@ -0,0 +1,254 @@
+"""Seekable compressed books: independent zstd frames of several books, with an index of frame offsets."""
+
+import os
+import json
+import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import zstandard as zstd
+from src.write_data.file_manifest import open_hashed
+
+BOOK_FRAME_DTYPE = np.dtype(
+    [
+        ("first_id", "<u8"),
+        ("last_id", "<u8"),
+        ("num_books", "<u8"),
+        ("offset", "<u8"),
+        ("size", "<u8"),
+        ("raw_size", "<u8"),
+    ]
+)
+# Temporary frame rows also record compression time, which is excluded from the (reproducible) final index
+TEMP_BOOK_FRAME_DTYPE = np.dtype(BOOK_FRAME_DTYPE.descr + [("seconds", "<f8")])
+
+
+def get_book_sidecar_name(book_name: str, suffix: str, index_path: str = None) -> str:
+    """File belonging to a compressed books file, stored in index_path (next to the books if not given)."""
+    base_name = os.path.basename(book_name)
+    if base_name.endswith(".jsonl.zst"):
+        base_name = base_name[: -len(".jsonl.zst")]
+    return os.path.join(index_path if index_path is not None else os.path.dirname(book_name), base_name + suffix)
+
+
+def get_book_index_name(book_name: str, index_path: str = None) -> str:
+    """Frame index of compressed books, i.e books_base.jsonl.zst -> <index_path>/books_base_index.npy"""
+    return get_book_sidecar_name(book_name, "_index.npy", index_path)
+
+
+def get_book_dictionary_name(book_name: str, index_path: str = None) -> str:
+    """Trained zstd dictionary of compressed books, i.e books_base.jsonl.zst -> <index_path>/books_base.dict"""
+    return get_book_sidecar_name(book_name, ".dict", index_path)
+
+
+def load_book_dictionary(book_name: str, index_path: str = None):
+    """Return the dictionary used to compress a books file, or None if it was written with plain frames."""
+    dictionary_name = get_book_dictionary_name(book_name, index_path)
+    if not os.path.isfile(dictionary_name):
+        return None
+    with open(dictionary_name, "rb") as f:
+        return zstd.ZstdCompressionDict(f.read())
+
+
+def get_book_decompressor(book_name: str, index_path: str = None) -> zstd.ZstdDecompressor:
+    """Decompressor for a books file, using its dictionary (from index_path) if one exists."""
+    dictionary = load_book_dictionary(book_name, index_path)
+    return zstd.ZstdDecompressor() if dictionary is None else zstd.ZstdDecompressor(dict_data=dictionary)
+
+
+def get_book_compressor(config: object, dictionary=None) -> zstd.ZstdCompressor:
+    """Book compressor using the level and thread count set in the game config."""
+    return zstd.ZstdCompressor(
+        level=config.book_compression_level,
+        threads=config.book_compression_threads,
+        dict_data=dictionary,
+    )
+
+
+def write_book_frames(books: list, filename: str, index_name: str, frame_size: int, compressor=None) -> None:
+    """
+    Compress books in independent frames of frame_size books, the concatenated frames are valid .jsonl.zst.
+    The frame table is written as raw rows to index_name, offsets are relative to the start of this file.
+    """
+    compressor = zstd.ZstdCompressor() if compressor is None else compressor
+    frame_size = max(int(frame_size), 1)
+    frames = np.zeros((len(books) + frame_size - 1) // frame_size, dtype=TEMP_BOOK_FRAME_DTYPE)
+    offset = 0
+    with open(filename, "wb") as f:
+        for frame, start in enumerate(range(0, len(books), frame_size)):
+            chunk = books[start : start + frame_size]
+            raw = ("\n".join(json.dumps(book) for book in chunk) + "\n").encode("UTF-8")
+            start_time = time.perf_counter()
+            compressed = compressor.compress(raw)
+            seconds = time.perf_counter() - start_time
+            f.write(compressed)
+            frames[frame] = (chunk[0]["id"], chunk[-1]["id"], len(chunk), offset, len(compressed), len(raw), seconds)
+            offset += len(compressed)
+    frames.tofile(index_name)
+
+
+def read_temp_frames(filename: str, index_name: str):
+    """Yield (frame row, decompressed books) for each frame of a temporary books file."""
+    frames = np.fromfile(index_name, dtype=TEMP_BOOK_FRAME_DTYPE)
+    decompressor = zstd.ZstdDecompressor()
+    with open(filename, "rb") as f:
+        for frame in frames:
+            f.seek(int(frame["offset"]))
+            yield frame, decompressor.decompress(f.read(int(frame["size"])))
+
+
+def train_book_dictionary(file_list: list, index_list: list, dictionary_size: int, num_samples: int):
+    """Train a zstd dictionary on individual books sampled evenly from the temporary books files."""
+    samples_per_file = max(num_samples // max(len(file_list), 1), 1)
+    samples = []
+    for filename, index_name in zip(file_list, index_list):
+        file_samples = []
+        for _, raw in read_temp_frames(filename, index_name):
+            file_samples += [line for line in raw.split(b"\n") if line]
+            if len(file_samples) >= samples_per_file:
+                break
+        samples += file_samples[:samples_per_file]
+    return zstd.train_dictionary(dictionary_size, samples)
+
+
+def map_frames(compress_frame, frames, workers: int):
+    """Apply compress_frame to (frame, raw) items on worker threads, yielding results in order."""
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for item in frames:
+            pending.append(executor.submit(compress_frame, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def merge_book_frames(
+    file_list: list,
+    index_list: list,
+    book_name: str,
+    make_compressor=None,
+    chunk_size: int = 1 << 24,
+    workers: int = 1,
+    index_path: str = None,
+) -> np.ndarray:
+    """
+    Combine temporary books and write the frame index to index_path. Frames are concatenated without recompression,
+    unless make_compressor is passed (i.e returning a compressor using a trained dictionary), in which case frames
+    are recompressed, split across workers threads.
+    """
+    local = threading.local()
+
+    def compress_frame(item):
+        # compressors are not thread safe, each worker uses its own
+        frame, raw = item
+        if not hasattr(local, "compressor"):
+            local.compressor = make_compressor()
+        start_time = time.perf_counter()
+        compressed = local.compressor.compress(raw)
+        frame["seconds"] = time.perf_counter() - start_time
+        return frame, compressed
+
+    all_frames = []
+    offset = 0
+    with open_hashed(book_name) as outfile:
+        if make_compressor is None:
+            for filename, index_name in zip(file_list, index_list):
+                frames = np.fromfile(index_name, dtype=TEMP_BOOK_FRAME_DTYPE)
+                frames["offset"] += offset
+                with open(filename, "rb") as infile:
+                    while True:
+                        data = infile.read(chunk_size)
+                        if not data:
+                            break
+                        outfile.write(data)
+                offset += os.path.getsize(filename)
+                all_frames.append(frames)
+        else:
+            temp_frames = (
+                item
+                for filename, index_name in zip(file_list, index_list)
+                for item in read_temp_frames(filename, index_name)
+            )
+            frames = []
+            for frame, compressed in map_frames(compress_frame, temp_frames, max(int(workers), 1)):
+                frame["offset"], frame["size"] = offset, len(compressed)
+                outfile.write(compressed)
+                offset += len(compressed)
+                frames.append(frame)
+            all_frames.append(np.array(frames, dtype=TEMP_BOOK_FRAME_DTYPE))
+        outfile.lines = int(sum(frames["num_books"].sum() for frames in all_frames))
+
+    frames = np.concatenate(all_frames) if len(all_frames) > 0 else np.zeros(0, dtype=TEMP_BOOK_FRAME_DTYPE)
+    final_frames = np.zeros(len(frames), dtype=BOOK_FRAME_DTYPE)
+    for name in BOOK_FRAME_DTYPE.names:
+        final_frames[name] = frames[name]
+    np.save(get_book_index_name(book_name, index_path), final_frames)
+    return frames
+
+
+def get_compression_summary(frames: np.ndarray) -> dict:
+    """Compression ratio and throughput of all frames in a books file."""
+    raw_mb = float(frames["raw_size"].sum()) / 1e6
+    compressed_mb = float(frames["size"].sum()) / 1e6
+    seconds = float(frames["seconds"].sum())
+    return {
+        "raw_mb": round(raw_mb, 3),
+        "compressed_mb": round(compressed_mb, 3),
+        "ratio": round(raw_mb / compressed_mb, 3) if compressed_mb > 0 else 0,
+        "mb_per_s": round(raw_mb / seconds, 3) if seconds > 0 else 0,
+    }
+
+
+class BookIndex:
+    """Locate and decompress single books from seekable compressed books."""
+
+    def __init__(self, book_name: str, index_path: str = None):
+        self.book_name = book_name
+        self.frames = np.load(get_book_index_name(book_name, index_path))
+        self.decompressor = get_book_decompressor(book_name, index_path)
+
+    def locate(self, book_id: int) -> tuple:
+        """Return (frame offset, frame size, line within frame) of a book-id."""
+        candidates = np.flatnonzero((self.frames["first_id"] <= book_id) & (self.frames["last_id"] >= book_id))
+        if len(candidates) == 0:
+            raise KeyError(f"Book-id {book_id} is not contained in {self.book_name}")
+        frame = self.frames[candidates[0]]
+        return int(frame["offset"]), int(frame["size"]), int(book_id - frame["first_id"])
+
+    def get_book(self, book_id: int) -> dict:
+        """Decompress the frame containing a book-id and return the book."""
+        offset, size, line = self.locate(book_id)
+        with open(self.book_name, "rb") as f:
+            f.seek(offset)
+            lines = self.decompressor.decompress(f.read(size)).decode("UTF-8").splitlines()
+
+        # book-ids within a frame are consecutive, otherwise fall back to searching the frame
+        if line < len(lines):
+            book = json.loads(lines[line])
+            if book["id"] == book_id:
+                return book
+        for book_line in lines:
+            book = json.loads(book_line)
+            if book["id"] == book_id:
+                return book
+        raise KeyError(f"Book-id {book_id} is not contained in {self.book_name}")
+
+
+class BookReader:
+    """
+    Read single books from the published compressed books of a game. Frame indexes and dictionaries are not
+    published, and are read from index_path (library/books/).
+    """
+
+    def __init__(self, publish_path: str, index_path: str):
+        self.publish_path = publish_path
+        self.index_path = index_path
+        self.indexes = {}
+
+    def get_book(self, mode: str, book_id: int) -> dict:
+        """Return book with the given id from books_<mode>.jsonl.zst."""
+        if mode not in self.indexes:
+            self.indexes[mode] = BookIndex(os.path.join(self.publish_path, f"books_{mode}.jsonl.zst"), self.index_path)
+        return self.indexes[mode].get_book(book_id)
@@ -0,0 +1,123 @@
+"""Streaming readers and writers for uncompressed .json (array) and .jsonl books."""
+
+import os
+import json
+from src.write_data.file_manifest import open_hashed
+
+READ_SIZE = 1 << 20
+
+
+def write_books(books, filename: str, regular_json: bool) -> None:
+    """Write books one at a time as a JSON array (regular_json) or as newline separated JSON."""
+    with open(filename, "w", encoding="UTF-8") as f:
+        if regular_json:
+            f.write("[")
+            for index, book in enumerate(books):
+                if index > 0:
+                    f.write(", ")
+                f.write(json.dumps(book))
+            f.write("]")
+        else:
+            for book in books:
+                f.write(json.dumps(book) + "\n")
+
+
+def iter_books(filename: str):
+    """Yield books one at a time from a .jsonl file or a .json array file."""
+    if filename.endswith(".jsonl"):
+        with open(filename, "r", encoding="UTF-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    decoder = json.JSONDecoder()
+    with open(filename, "r", encoding="UTF-8") as f:
+        buffer = f.read(READ_SIZE).lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"{filename} does not contain a JSON array.")
+        buffer = buffer[1:]
+        end_of_file = False
+        while True:
+            buffer = buffer.lstrip()
+            if buffer.startswith(","):
+                buffer = buffer[1:].lstrip()
+            if buffer.startswith("]"):
+                return
+            try:
+                book, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if end_of_file:
+                    raise
+                # book is split over the read boundary
+                data = f.read(READ_SIZE)
+                end_of_file = len(data) == 0
+                buffer += data
+                continue
+            yield book
+            buffer = buffer[end:]
+
+
+def get_array_bounds(filename: str) -> tuple:
+    """Return byte positions (start, end) of the contents between the outer '[' and ']' of a JSON array file."""
+    size = os.path.getsize(filename)
+    with open(filename, "rb") as f:
+        start = 0
+        while True:
+            char = f.read(1)
+            if char == b"[":
+                break
+            if not char or not char.isspace():
+                raise ValueError(f"{filename} does not contain a JSON array.")
+            start += 1
+        end = size
+        while end > start + 1:
+            f.seek(end - 1)
+            char = f.read(1)
+            end -= 1
+            if char == b"]":
+                return start + 1, end
+            if not char.isspace():
+                break
+    raise ValueError(f"{filename} does not contain a JSON array.")
+
+
+def copy_bytes(infile, outfile, num_bytes: int) -> None:
+    """Copy a number of bytes between open files in fixed size chunks."""
+    while num_bytes > 0:
+        data = infile.read(min(READ_SIZE, num_bytes))
+        if not data:
+            break
+        outfile.write(data)
+        num_bytes -= len(data)
+
+
+def merge_books(file_list: list, filename: str) -> None:
+    """Combine .jsonl or .json array files into a single file of the same format without loading whole files."""
+    with open_hashed(filename) as outfile:
+        if filename.endswith(".jsonl"):
+            for name in file_list:
+                with open(name, "rb") as infile:
+                    copy_bytes(infile, outfile, os.path.getsize(name))
+            return
+
+        outfile.write(b"[")
+        first = True
+        for name in file_list:
+            start, end = get_array_bounds(name)
+            with open(name, "rb") as infile:
+                # skip files without books (i.e '[]'), which would otherwise leave an empty array element
+                infile.seek(start)
+                if not infile.read(min(end - start, READ_SIZE)).strip():
+                    continue
+                infile.seek(start)
+                if not first:
+                    outfile.write(b",")
+                copy_bytes(infile, outfile, end - start)
+                first = False
+        outfile.write(b"]")
+
+
+def convert_books(input_name: str, output_name: str) -> None:
+    """Convert between .json array and .jsonl books, holding a single book in memory."""
+    write_books(iter_books(input_name), output_name, regular_json=not output_name.endswith(".jsonl"))
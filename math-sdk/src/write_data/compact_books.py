@@ -0,0 +1,48 @@
+"""
+Compact books: the sim id, repeat count, criteria and payout of each simulation.
+Books are fully determined by these values and the game config, and are regenerated with BookReplayer.
+"""
+
+import os
+import numpy as np
+
+COMPACT_BOOK_DTYPE = np.dtype(
+    [
+        ("id", "<u8"),
+        ("repeat_count", "<u4"),
+        ("criteria", "<u2"),
+        ("payout", "<u8"),
+    ]
+)
+
+
+def get_criteria_names(gamestate: object, betmode: str) -> list:
+    """Criteria of a bet mode, compact books store the position of the criteria in this list."""
+    return [distribution.get_criteria() for distribution in gamestate.get_betmode(betmode).get_distributions()]
+
+
+def make_compact_books(gamestate: object, name: str) -> None:
+    """Write raw (headerless) compact book rows for all simulations, to be combined by merge_compact_books()."""
+    criteria_names = get_criteria_names(gamestate, gamestate.betmode)
+    sims = sorted(gamestate.library.keys())
+    table = np.empty(len(sims), dtype=COMPACT_BOOK_DTYPE)
+    for row, sim in enumerate(sims):
+        book = gamestate.library[sim]
+        table[row] = (
+            book["id"],
+            gamestate.repeat_counts[sim],
+            criteria_names.index(book["criteria"]),
+            book["payoutMultiplier"],
+        )
+    table.tofile(name)
+
+
+def merge_compact_books(file_list: list, compact_name: str) -> None:
+    """Concatenate temporary compact book rows into a single .npy table."""
+    tables = [np.fromfile(filename, dtype=COMPACT_BOOK_DTYPE) for filename in file_list if os.path.isfile(filename)]
+    np.save(compact_name, np.concatenate(tables) if len(tables) > 0 else np.zeros(0, dtype=COMPACT_BOOK_DTYPE))
+
+
+def load_compact_books(compact_name: str) -> np.ndarray:
+    """Memory-map compact books."""
+    return np.load(compact_name, mmap_mode="r")
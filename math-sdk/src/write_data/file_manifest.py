@@ -0,0 +1,124 @@
+"""
+SHA-256, size and line counts of output files, computed while writing and stored in a per-directory manifest.
+Manifests are kept outside of the directories they describe, so folders such as publish_files/ only hold outputs.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from contextlib import contextmanager
+
+MANIFEST_FOLDER = "file_manifests"
+READ_SIZE = 1 << 20
+# output files may be merged concurrently, manifest updates are serialised
+MANIFEST_LOCK = threading.Lock()
+
+
+class HashingWriter:
+    """Binary file wrapper which hashes, sizes and counts lines of all data written through it."""
+
+    def __init__(self, file):
+        self.file = file
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+        self.lines = 0
+
+    def write(self, data) -> int:
+        """Write str (UTF-8 encoded) or bytes to the underlying file."""
+        if isinstance(data, str):
+            data = data.encode("UTF-8")
+        self.sha256.update(data)
+        self.size += len(data)
+        self.lines += data.count(b"\n")
+        return self.file.write(data)
+
+    def get_details(self) -> dict:
+        """Manifest entry of the data written so far."""
+        return {"sha256": self.sha256.hexdigest(), "size": self.size, "lines": self.lines}
+
+
+def get_manifest_name(filename: str) -> str:
+    """Manifest of the file's directory, i.e library/publish_files/x.csv -> library/file_manifests/publish_files.json"""
+    directory = os.path.dirname(os.path.abspath(filename))
+    return os.path.join(os.path.dirname(directory), MANIFEST_FOLDER, os.path.basename(directory) + ".json")
+
+
+def read_manifest(manifest_name: str) -> dict:
+    """Return all manifest entries, an unreadable manifest is treated as empty."""
+    if not os.path.isfile(manifest_name):
+        return {}
+    try:
+        with open(manifest_name, "r", encoding="UTF-8") as f:
+            return json.load(f)
+    except json.JSONDecodeError:
+        return {}
+
+
+def record_file(filename: str, details: dict) -> None:
+    """Store details of a file which has just been written, along with its modification time."""
+    manifest_name = get_manifest_name(filename)
+    with MANIFEST_LOCK:
+        manifest = read_manifest(manifest_name)
+        manifest[os.path.basename(filename)] = {**details, "mtime_ns": os.stat(filename).st_mtime_ns}
+        os.makedirs(os.path.dirname(manifest_name), exist_ok=True)
+        with open(manifest_name, "w", encoding="UTF-8") as f:
+            f.write(json.dumps(manifest, indent=4, sort_keys=True))
+
+
+@contextmanager
+def open_hashed(filename: str):
+    """
+    Open a file for writing through a HashingWriter, the manifest entry is recorded once the file is closed.
+    Writers may overwrite writer.lines with a count other than newlines written (i.e books in a compressed file).
+    """
+    with open(filename, "wb") as f:
+        writer = HashingWriter(f)
+        yield writer
+    record_file(filename, writer.get_details())
+
+
+def copy_file(source: str, destination: str) -> None:
+    """Copy a file in chunks, hashing the data on the way."""
+    with open(source, "rb") as infile, open_hashed(destination) as outfile:
+        while True:
+            data = infile.read(READ_SIZE)
+            if not data:
+                break
+            outfile.write(data)
+
+
+def hash_file(filename: str) -> dict:
+    """Compute details by reading the whole file, lines are not counted for compressed files."""
+    sha256 = hashlib.sha256()
+    size, lines = 0, 0
+    with open(filename, "rb") as f:
+        while True:
+            data = f.read(READ_SIZE)
+            if not data:
+                break
+            sha256.update(data)
+            size += len(data)
+            lines += data.count(b"\n")
+    return {"sha256": sha256.hexdigest(), "size": size, "lines": None if filename.endswith(".zst") else lines}
+
+
+def get_file_details(filename: str, compute: bool = True) -> dict:
+    """
+    Return {sha256, size, lines} of a file from its manifest entry. Entries are only trusted if the file size and
+    modification time are unchanged since it was written, otherwise the file is hashed (and recorded) if compute=True.
+    """
+    entry = read_manifest(get_manifest_name(filename)).get(os.path.basename(filename))
+    stat = os.stat(filename)
+    if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return entry
+    if not compute:
+        return None
+    details = hash_file(filename)
+    record_file(filename, details)
+    return details
+
+
+def get_file_sha(filename: str) -> str:
+    """SHA-256 of a file, read from the manifest where possible."""
+    return get_file_details(filename)["sha256"]
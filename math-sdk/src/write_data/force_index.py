@@ -0,0 +1,266 @@
+"""Persisted force-record index for fast book-id searches."""
+
+import re
+import json
+from collections import defaultdict
+import numpy as np
+from src.write_data.lookup_binary import load_lookup_table
+
+QUERY_TOKENS = re.compile(r"\s*(\(|\)|,|>=|<=|!=|=|<|>|[^\s(),=<>!]+)")
+PAYOUT_KEY = "payout"
+
+
+def read_lookup_payouts(lookup_name: str) -> np.ndarray:
+    """Payouts from a lookup table (id,weight,payout), indexed by book-id."""
+    table = load_lookup_table(lookup_name)
+    payouts = np.zeros(int(table["id"].max()) + 1 if len(table) > 0 else 1, dtype=np.int64)
+    payouts[table["id"]] = table["payout"]
+    return payouts
+
+
+class ForceIndex:
+    """
+    Book-ids of every force-record entry with a posting list of entries per (key, value) pair.
+
+    Search results are boolean masks indexed by book-id, which can be combined with &, | and ~ (see negate()).
+    A search key such as {"kind": "3", "symbol": "H1"} matches all entries containing each of the given pairs,
+    equivalent to the partial matches made on force_record_<mode>.json.
+    """
+
+    def __init__(
+        self,
+        keys: list,
+        times_triggered: np.ndarray,
+        entry_offsets: np.ndarray,
+        book_ids: np.ndarray,
+        payouts: np.ndarray = None,
+    ):
+        self.keys = keys
+        self.times_triggered = np.asarray(times_triggered, dtype=np.int64)
+        self.entry_offsets = np.asarray(entry_offsets, dtype=np.int64)
+        self.book_ids = np.asarray(book_ids, dtype=np.uint32)
+        self.payouts = None if payouts is None else np.asarray(payouts, dtype=np.int64)
+
+        self.num_books = int(self.book_ids.max()) if len(self.book_ids) > 0 else 0
+        if self.payouts is not None:
+            self.num_books = max(self.num_books, len(self.payouts) - 1)
+            self.payouts = np.pad(self.payouts, (0, self.num_books + 1 - len(self.payouts)))
+
+        postings = defaultdict(list)
+        for entry, key in enumerate(self.keys):
+            for name, value in key.items():
+                postings[(name, value)].append(entry)
+        self.postings = {pair: np.array(entries, dtype=np.int64) for pair, entries in postings.items()}
+
+    @classmethod
+    def from_force_results(cls, force_results: dict, payouts: np.ndarray = None) -> "ForceIndex":
+        """Build from merged force results, {((key, value), ...): {"timesTriggered": int, "bookIds": ids}}."""
+        keys, times_triggered, id_arrays = [], [], []
+        for description, details in force_results.items():
+            keys.append({str(k): str(v) for k, v in description})
+            times_triggered.append(details["timesTriggered"])
+            id_arrays.append(np.sort(np.asarray(details["bookIds"], dtype=np.uint32)))
+        return cls._from_arrays(keys, times_triggered, id_arrays, payouts)
+
+    @classmethod
+    def from_force_record(cls, force_record: list, payouts: np.ndarray = None) -> "ForceIndex":
+        """Build from the contents of force_record_<mode>.json."""
+        keys, times_triggered, id_arrays = [], [], []
+        for entry in force_record:
+            keys.append({str(item["name"]): str(item["value"]) for item in entry["search"]})
+            times_triggered.append(entry["timesTriggered"])
+            id_arrays.append(np.sort(np.asarray(entry["bookIds"], dtype=np.uint32)))
+        return cls._from_arrays(keys, times_triggered, id_arrays, payouts)
+
+    @classmethod
+    def _from_arrays(cls, keys, times_triggered, id_arrays, payouts) -> "ForceIndex":
+        entry_offsets = np.zeros(len(id_arrays) + 1, dtype=np.int64)
+        entry_offsets[1:] = np.cumsum([len(ids) for ids in id_arrays])
+        book_ids = np.concatenate(id_arrays) if len(id_arrays) > 0 else np.zeros(0, dtype=np.uint32)
+        return cls(keys, times_triggered, entry_offsets, book_ids, payouts)
+
+    @classmethod
+    def load(cls, filename: str) -> "ForceIndex":
+        """Load index written by save()."""
+        with np.load(filename) as data:
+            payouts = data["payouts"] if "payouts" in data.files else None
+            return cls(
+                json.loads(str(data["keys"])),
+                data["times_triggered"],
+                data["entry_offsets"],
+                data["book_ids"],
+                payouts,
+            )
+
+    def save(self, filename: str) -> None:
+        """Write compressed index to file (.npz)."""
+        arrays = {
+            "keys": np.array(json.dumps(self.keys)),
+            "times_triggered": self.times_triggered,
+            "entry_offsets": self.entry_offsets,
+            "book_ids": self.book_ids,
+        }
+        if self.payouts is not None:
+            arrays["payouts"] = self.payouts
+        with open(filename, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    def match_entries(self, search_key: dict) -> np.ndarray:
+        """Indices of entries containing all (key, value) pairs of the search key."""
+        entries = np.arange(len(self.keys))
+        for name, value in search_key.items():
+            posting = self.postings.get((str(name), str(value)))
+            if posting is None:
+                return np.zeros(0, dtype=np.int64)
+            entries = np.intersect1d(entries, posting, assume_unique=True)
+        return entries
+
+    def entry_ids(self, entries: np.ndarray) -> np.ndarray:
+        """Concatenated book-ids of the given entries (ids may repeat across entries)."""
+        if len(entries) == 0:
+            return np.zeros(0, dtype=np.uint32)
+        return np.concatenate([self.book_ids[self.entry_offsets[e] : self.entry_offsets[e + 1]] for e in entries])
+
+    def empty(self) -> np.ndarray:
+        """Mask containing no books."""
+        return np.zeros(self.num_books + 1, dtype=bool)
+
+    def all_books(self) -> np.ndarray:
+        """Mask containing every book-id."""
+        mask = np.ones(self.num_books + 1, dtype=bool)
+        mask[0] = False
+        return mask
+
+    def negate(self, mask: np.ndarray) -> np.ndarray:
+        """Complement of a mask within the valid book-ids."""
+        return ~mask & self.all_books()
+
+    def match(self, search_key: dict) -> np.ndarray:
+        """Mask of book-ids with a partial match to the search key."""
+        mask = self.empty()
+        mask[self.entry_ids(self.match_entries(search_key))] = True
+        return mask
+
+    def payout_range(self, min_payout: float = None, max_payout: float = None) -> np.ndarray:
+        """Mask of book-ids with min_payout <= payout < max_payout, using lookup table units."""
+        if self.payouts is None:
+            raise RuntimeError("Force index was built without lookup table payouts.")
+        mask = self.all_books()
+        if min_payout is not None:
+            mask &= self.payouts >= min_payout
+        if max_payout is not None:
+            mask &= self.payouts < max_payout
+        return mask
+
+    def get_times_triggered(self, search_key: dict) -> int:
+        """Total trigger count of all entries partially matching the search key."""
+        return int(self.times_triggered[self.match_entries(search_key)].sum())
+
+    @staticmethod
+    def get_ids(mask: np.ndarray) -> np.ndarray:
+        """Sorted book-ids contained in a mask."""
+        return np.flatnonzero(mask)
+
+    def query(self, expression: str) -> np.ndarray:
+        """
+        Evaluate a search expression and return the matching mask.
+
+        Terms are comma-separated key=value pairs which must all belong to a single force entry, or payout
+        comparisons against the lookup table (payout>=100). Terms are combined with NOT, AND, OR and parentheses,
+        i.e. "symbol=H1,kind=5 AND NOT gametype=freegame,symbol=scatter AND payout<10000"
+        """
+        tokens = QUERY_TOKENS.findall(expression.strip())
+        if "".join(tokens) != re.sub(r"\s+", "", expression):
+            raise ValueError(f"Could not parse force query: {expression}")
+        parser = _QueryParser(self, tokens)
+        mask = parser.parse_or()
+        if parser.position != len(tokens):
+            raise ValueError(f"Unexpected token '{tokens[parser.position]}' in force query: {expression}")
+        return mask
+
+
+class _QueryParser:
+    """Recursive-descent parser for ForceIndex.query()."""
+
+    def __init__(self, index: ForceIndex, tokens: list):
+        self.index = index
+        self.tokens = tokens
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def take(self, expected: str = None) -> str:
+        token = self.peek()
+        if token is None or (expected is not None and token.upper() != expected):
+            raise ValueError(f"Expected '{expected}' in force query, found '{token}'")
+        self.position += 1
+        return token
+
+    def parse_or(self) -> np.ndarray:
+        mask = self.parse_and()
+        while self.peek() is not None and self.peek().upper() == "OR":
+            self.take("OR")
+            mask = mask | self.parse_and()
+        return mask
+
+    def parse_and(self) -> np.ndarray:
+        mask = self.parse_not()
+        while self.peek() is not None and self.peek().upper() == "AND":
+            self.take("AND")
+            mask = mask & self.parse_not()
+        return mask
+
+    def parse_not(self) -> np.ndarray:
+        if self.peek() is not None and self.peek().upper() == "NOT":
+            self.take("NOT")
+            return self.index.negate(self.parse_not())
+        if self.peek() == "(":
+            self.take("(")
+            mask = self.parse_or()
+            self.take(")")
+            return mask
+        return self.parse_term()
+
+    def parse_term(self) -> np.ndarray:
+        """Comma-separated group, key=value pairs must share one entry and payout comparisons apply to every book."""
+        search_key = {}
+        payout_masks = []
+        while True:
+            name = self.take()
+            operator = self.take()
+            value = self.take()
+            if name == PAYOUT_KEY:
+                payout_masks.append(self.payout_comparison(operator, float(value)))
+            elif operator != "=":
+                raise ValueError(f"Force keys only support '=', found '{operator}'")
+            else:
+                search_key[name] = value
+            if self.peek() != ",":
+                break
+            self.take(",")
+        mask = self.index.match(search_key) if search_key else self.index.all_books()
+        for payout_mask in payout_masks:
+            mask &= payout_mask
+        return mask
+
+    def payout_comparison(self, operator: str, value: float) -> np.ndarray:
+        payouts = self.index.payouts
+        if payouts is None:
+            raise RuntimeError("Force index was built without lookup table payouts.")
+        match operator:
+            case ">=":
+                mask = payouts >= value
+            case ">":
+                mask = payouts > value
+            case "<=":
+                mask = payouts <= value
+            case "<":
+                mask = payouts < value
+            case "=":
+                mask = payouts == value
+            case "!=":
+                mask = payouts != value
+            case _:
+                raise ValueError(f"Unknown payout comparison '{operator}'")
+        return mask & self.index.all_books()
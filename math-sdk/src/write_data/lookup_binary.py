@@ -0,0 +1,112 @@
+"""
+Fixed-width binary lookup tables, written alongside the csv outputs and memory-mapped by analysis tools.
+Binary tables of published csv tables (lookUpTable_<mode>_0.csv) are kept in a separate binary_path (lookup_tables/).
+"""
+
+import os
+import numpy as np
+
+LOOKUP_DTYPE = np.dtype(
+    [
+        ("id", "<u8"),
+        ("weight", "<u8"),
+        ("payout", "<u8"),
+        ("base_win", "<f8"),
+        ("free_win", "<f8"),
+    ]
+)
+
+
+def get_binary_lookup_name(lookup_name: str, binary_path: str = None) -> str:
+    """
+    Binary table of a csv lookup table, i.e lookUpTable_base_0.csv -> <binary_path>/lookUpTable_base_0.npy
+    Stored next to the csv if binary_path is not given.
+    """
+    root, ext = os.path.splitext(lookup_name)
+    binary_name = (root if ext == ".csv" else lookup_name) + ".npy"
+    if binary_path is None:
+        return binary_name
+    return os.path.join(binary_path, os.path.basename(binary_name))
+
+
+def make_lookup_binary(gamestate: object, name: str) -> None:
+    """Write raw (headerless) binary lookup rows for all simulations, to be combined by merge_lookup_binaries()."""
+    sims = sorted(gamestate.library.keys())
+    table = np.empty(len(sims), dtype=LOOKUP_DTYPE)
+    for row, sim in enumerate(sims):
+        book = gamestate.library[sim]
+        table[row] = (
+            book["id"],
+            1,
+            book["payoutMultiplier"],
+            round(book["baseGameWins"], 2),
+            round(book["freeGameWins"], 2),
+        )
+    table.tofile(name)
+
+
+def merge_lookup_binaries(file_list: list, lookup_name: str, binary_path: str = None) -> None:
+    """Concatenate temporary binary rows into a single .npy table for the given csv lookup table."""
+    num_rows = sum(os.path.getsize(filename) // LOOKUP_DTYPE.itemsize for filename in file_list)
+    if num_rows == 0:
+        write_lookup_binary(lookup_name, np.zeros(0, dtype=LOOKUP_DTYPE), binary_path)
+        return
+    table = np.lib.format.open_memmap(
+        get_binary_lookup_name(lookup_name, binary_path), mode="w+", dtype=LOOKUP_DTYPE, shape=(num_rows,)
+    )
+    row = 0
+    for filename in file_list:
+        chunk = np.fromfile(filename, dtype=LOOKUP_DTYPE)
+        table[row : row + len(chunk)] = chunk
+        row += len(chunk)
+    table.flush()
+    del table
+
+
+def write_lookup_binary(lookup_name: str, table: np.ndarray, binary_path: str = None) -> None:
+    """Write a complete table for the given csv lookup table."""
+    np.save(get_binary_lookup_name(lookup_name, binary_path), np.asarray(table, dtype=LOOKUP_DTYPE))
+
+
+def read_lookup_csv(lookup_name: str) -> np.ndarray:
+    """Parse an id,weight,payout csv table, base/free splits are not available and set to zero."""
+    with open(lookup_name, "r", encoding="UTF-8") as f:
+        rows = np.loadtxt(f, delimiter=",", dtype=np.uint64, ndmin=2)
+    table = np.zeros(len(rows), dtype=LOOKUP_DTYPE)
+    if len(rows) > 0:
+        table["id"], table["weight"], table["payout"] = rows[:, 0], rows[:, 1], rows[:, 2]
+    return table
+
+
+def copy_pay_splits(table: np.ndarray, base_lookup_name: str) -> None:
+    """Fill base_win/free_win of a table (i.e an optimized table) from the simulation lookup table, matched by id."""
+    if not os.path.isfile(base_lookup_name):
+        return
+    base_table = load_lookup_table(base_lookup_name)
+    positions = np.searchsorted(base_table["id"], table["id"])
+    found = positions < len(base_table)
+    found[found] = base_table["id"][positions[found]] == table["id"][found]
+    table["base_win"][found] = base_table["base_win"][positions[found]]
+    table["free_win"][found] = base_table["free_win"][positions[found]]
+
+
+def rebuild_lookup_binary(lookup_name: str, base_lookup_name: str = None, binary_path: str = None) -> np.ndarray:
+    """Rewrite the binary table of a csv lookup table written by another tool (i.e the optimizer)."""
+    table = read_lookup_csv(lookup_name)
+    if base_lookup_name is not None:
+        copy_pay_splits(table, base_lookup_name)
+    write_lookup_binary(lookup_name, table, binary_path)
+    return table
+
+
+def load_lookup_table(lookup_name: str, binary_path: str = None) -> np.ndarray:
+    """
+    Memory-map the binary version of a csv lookup table.
+    Falls back to parsing the csv if the binary table is missing or older than the csv (i.e an edited table).
+    """
+    binary_name = get_binary_lookup_name(lookup_name, binary_path)
+    if os.path.isfile(binary_name) and (
+        not os.path.isfile(lookup_name) or os.path.getmtime(binary_name) >= os.path.getmtime(lookup_name)
+    ):
+        return np.load(binary_name, mmap_mode="r")
+    return read_lookup_csv(lookup_name)
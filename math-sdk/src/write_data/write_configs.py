@@ -2,22 +2,19 @@
 
 import json
 import os
-import shutil
 import warnings
 from collections import defaultdict
 from utils.get_file_hash import get_hash
-from utils.analysis.distribution_functions import (
-    make_win_distribution,
-    get_lookup_length,
-    get_distribution_moments,
-)
+from src.write_data.file_manifest import open_hashed, copy_file
+from src.write_data.lookup_binary import load_lookup_table
+from utils.analysis.distribution_functions import get_distribution_arrays, get_distribution_statistics
 
 
 def copy_and_rename_csv(filepath: str) -> None:
     """If no optimization has been run, initialise the lookup table."""
     file_location = os.path.dirname(filepath)
     new_filepath = os.path.join(file_location, os.path.splitext(os.path.basename(filepath))[0] + "_0.csv")
-    shutil.copy(filepath, new_filepath)
+    copy_file(filepath, new_filepath)
 
 
 def generate_configs(gamestate: object, json_padding: bool = True, assign_properties: bool = True):
@@ -285,9 +282,8 @@ def make_fe_config(gamestate, json_padding=True, assign_properties=True, **kwarg
         json_info["paddingReels"] = gamestate.config.paddingReels
 
     f_name = os.path.join(gamestate.output_files.config_path, f"config_fe_{gamestate.config.game_id}.json")
-    fe_json = open(f_name, "w", encoding="UTF-8")
-    fe_json.write(json.dumps(json_info, indent=4))
-    fe_json.close()
+    with open_hashed(f_name) as fe_json:
+        fe_json.write(json.dumps(json_info, indent=4))
 
 
 def make_be_config(gamestate):
@@ -328,10 +324,10 @@ def make_be_config(gamestate):
             copy_and_rename_csv(base_table)
 
         lut_sha_value = get_hash(lut_table)
-        dist = make_win_distribution(lut_table)
-        _, std_val, _, _ = get_distribution_moments(dist, bet.get_cost())
-        std_val = round(std_val / bet.get_cost(), 2)
-        booklength = get_lookup_length(lut_table)
+        table = load_lookup_table(lut_table, gamestate.output_files.lookup_path)
+        wins, weights = get_distribution_arrays(table)
+        std_val = round(get_distribution_statistics(wins, weights, bet.get_cost())["std"] / bet.get_cost(), 2)
+        booklength = len(table)
 
         _, lut_nme = os.path.split(lut_table)
         dic = {
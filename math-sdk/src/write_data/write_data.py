@@ -4,23 +4,41 @@ from collections import defaultdict
 from warnings import warn
 import shutil
 import os
-import hashlib
+import sys
 import json
-import ast
-import zstandard as zstd
+import struct
+import time
+from array import array
+import numpy as np
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from src.write_data.force_index import ForceIndex, read_lookup_payouts
+from src.write_data.analytics_store import write_analytics_store
+from src.write_data.lookup_binary import (
+    merge_lookup_binaries,
+    get_binary_lookup_name,
+    load_lookup_table,
+    write_lookup_binary,
+)
+from src.write_data.compact_books import merge_compact_books
+from src.write_data.file_manifest import open_hashed, copy_file, get_file_sha
+from src.write_data.book_stream import write_books, merge_books
+from src.write_data.book_dedup import dedup_books, iter_temp_book_lines
+from src.write_data.book_index import (
+    write_book_frames,
+    merge_book_frames,
+    train_book_dictionary,
+    get_book_compressor,
+    get_compression_summary,
+)
+
+FORCE_RECORD_MAGIC = b"FRC1"
 
 
 def get_sha_256(file_to_hash: str):
-    """Get human readable hash of file."""
+    """Get human readable hash of file, from the file manifest if it was written by the SDK."""
     try:
-        with open(file_to_hash, "rb") as f:
-            sha256_file = hashlib.sha256()
-            while True:
-                data = f.read(65536)
-                if not data:
-                    break
-                sha256_file.update(data)
-        sha256_hexRep = sha256_file.hexdigest()
+        sha256_hexRep = get_file_sha(file_to_hash)
     except FileNotFoundError:
         warn(f"{file_to_hash} is empty.\nCould not create hash")
         sha256_hexRep = ""
@@ -61,8 +79,8 @@ def make_force_json(gamestate: object):
                 else:
                     print("Expected a list, found:", type(data))
 
-    with open(force_file_path, "w", encoding="UTF-8") as force_file:
-        json.dump(force_data, force_file, indent=4)
+    with open_hashed(force_file_path) as force_file:
+        force_file.write(json.dumps(force_data, indent=4))
 
 
 def get_force_options(force_results: dict):
@@ -103,18 +121,21 @@ def make_lookup_pay_split(gamestate: object, name: str):
     file.close()
 
 
-def write_library_events(gamestate: object, library: list, gametype: str):
-    """Write all unique events within a given mode - with one example application."""
-    unique_event = []
+def write_event_catalogue(event_catalogue: dict, name: str):
+    """Temporary file generation for unique events recorded by a single thread."""
+    with open(name, "w", encoding="UTF-8") as f:
+        f.write(json.dumps(event_catalogue))
+
+
+def write_library_events(gamestate: object, file_list: list, gametype: str):
+    """Write all unique events within a given mode - with one example application.
+    Combines the unique events recorded by each thread, keeping the first example of each event type."""
     event_items = {}
-    for event in library:
-        for instance in event["events"]:
-            lib_event = instance["type"]
-            if lib_event not in unique_event:
-                unique_event.append(lib_event)
-                item_keys = instance.keys()
-                dict_details = {key: instance[key] for key in item_keys if key != "index"}
-                event_items[lib_event] = dict_details
+    for filename in file_list:
+        with open(filename, "r", encoding="UTF-8") as f:
+            for lib_event, dict_details in json.load(f).items():
+                if lib_event not in event_items:
+                    event_items[lib_event] = dict_details
     json_object = json.dumps(event_items, indent=4)
     with open(
         os.path.join(gamestate.output_files.config_path, f"event_config_{gametype}.json"),
@@ -124,76 +145,104 @@ def write_library_events(gamestate: object, library: list, gametype: str):
         f.write(json_object)
 
 
-def output_lookup_and_force_files(
-    threads: int,
-    batching_size: int,
-    game_id: str,
-    betmode: str,
-    gamestate: object,
-    num_sims: int = 1000000,
-    compress: bool = True,
-):
-    """Combine temporary lookup tables and force files into a single output."""
-    print("Saving books for ", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+def get_temp_file_list(get_temp_name, betmode: str, threads: int, num_repeats: int) -> list:
+    """Temporary files of all threads and batches, in book-id order."""
     file_list = []
     for repeat_index in range(num_repeats):
         for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress)
-            )
-
-    if compress:
-        temp_book_output_path = os.path.join(gamestate.output_files.book_path, "temp_book_output.json")
-        with open(temp_book_output_path, "w", encoding="UTF-8") as outfile:
-            for fname in file_list:
-                with open(fname, "rb") as infile:
-                    decompressed = zstd.ZstdDecompressor().decompress(infile.read())
-                    outfile.write(decompressed.decode("UTF-8"))
+            file_list.append(get_temp_name(betmode, thread, repeat_index))
+    return file_list
+
+
+def merge_book_files(gamestate: object, betmode: str, threads: int, num_repeats: int, compress: bool) -> None:
+    """Combine temporary books, recompressed frames are split across threads when using a trained dictionary."""
+    output_files = gamestate.output_files
+    file_list = get_temp_file_list(
+        lambda mode, thread, repeat: output_files.get_temp_multi_thread_name(mode, thread, repeat, compress),
+        betmode,
+        threads,
+        num_repeats,
+    )
+    if gamestate.config.dedup_books:
+        index_list = get_temp_file_list(output_files.get_temp_book_index_name, betmode, threads, num_repeats)
+        summary = dedup_books(iter_temp_book_lines(file_list, index_list), *output_files.get_dedup_book_names(betmode))
+        print(
+            f"Deduplicated books for {betmode}: {summary['unique_payloads']} unique of {summary['books']} books,",
+            f"{summary['raw_mb']} MB -> {summary['dedup_mb']} MB ({round(100 * summary['saved'], 1)}% saved)",
+        )
 
-        final_out = gamestate.output_files.get_final_book_name(betmode, True)
-        with open(temp_book_output_path, "rb") as f_in, open(final_out, "wb") as f_out:
-            f_out.write(zstd.ZstdCompressor().compress(f_in.read()))
+    if not compress:
+        merge_books(file_list, output_files.get_final_book_name(betmode, False))
+        return
+
+    # Temporary books are independent zstd frames, which are only recompressed when using a trained dictionary
+    index_list = get_temp_file_list(output_files.get_temp_book_index_name, betmode, threads, num_repeats)
+    final_out = output_files.get_final_book_name(betmode, True)
+    config = gamestate.config
+    make_compressor = None
+    if config.book_dictionary_size > 0 and config.plain_book_frames:
+        warn("plain_book_frames is set, books are published without a trained dictionary.")
+    elif config.book_dictionary_size > 0:
+        dictionary = train_book_dictionary(
+            file_list, index_list, config.book_dictionary_size, config.book_dictionary_samples
+        )
+        with open(output_files.get_book_dictionary_name(betmode), "wb") as f:
+            f.write(dictionary.as_bytes())
+        make_compressor = partial(get_book_compressor, config, dictionary)
+    if make_compressor is None and os.path.isfile(output_files.get_book_dictionary_name(betmode)):
+        os.remove(output_files.get_book_dictionary_name(betmode))
+
+    # frame index and dictionary are kept out of the publish folder
+    frames = merge_book_frames(
+        file_list, index_list, final_out, make_compressor, workers=threads, index_path=output_files.book_path
+    )
+    summary = get_compression_summary(frames)
+    print(
+        f"Compressed books for {betmode}: {summary['raw_mb']} MB -> {summary['compressed_mb']} MB",
+        f"(ratio: {summary['ratio']}, {summary['mb_per_s']} MB/s)",
+    )
+
+
+def merge_two_sorted(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Merge two ascending arrays, ids of the second array are placed after equal ids of the first."""
+    merged = np.empty(len(first) + len(second), dtype=first.dtype)
+    second_positions = np.searchsorted(first, second, side="right") + np.arange(len(second))
+    first_mask = np.ones(len(merged), dtype=bool)
+    first_mask[second_positions] = False
+    merged[second_positions] = second
+    merged[first_mask] = first
+    return merged
+
+
+def merge_sorted_ids(id_arrays: list) -> array:
+    """Merge ascending book-id arrays into a single ascending array, by pairwise merges of neighbouring runs."""
+    if len(id_arrays) == 1:
+        return id_arrays[0]
+    runs = [np.frombuffer(ids, dtype=np.uint32) for ids in id_arrays if len(ids) > 0]
+    if len(runs) == 0:
+        return array("I")
+    # runs from consecutive batches are usually already in order and only need to be joined
+    if all(previous[-1] <= run[0] for previous, run in zip(runs, runs[1:])):
+        return array("I", np.concatenate(runs).tobytes())
+    while len(runs) > 1:
+        merged_runs = [merge_two_sorted(first, second) for first, second in zip(runs[::2], runs[1::2])]
+        runs = merged_runs + runs[len(merged_runs) * 2 :]
+    return array("I", runs[0].tobytes())
+
+
+def merge_force_files(gamestate: object, betmode: str, threads: int, num_repeats: int) -> dict:
+    """Combine temporary force records, writing force_record_<mode>.json and updating force.json."""
+    file_list = get_temp_file_list(gamestate.output_files.get_temp_force_name, betmode, threads, num_repeats)
+    force_ids = defaultdict(list)
+    force_triggers = defaultdict(int)
+    for filename in file_list:
+        for key, times_triggered, book_ids in read_recorded_wins(filename):
+            force_triggers[key] += times_triggered
+            force_ids[key].append(book_ids)
 
-        os.remove(temp_book_output_path)
-    else:
-        with open(
-            gamestate.output_files.get_final_book_name(betmode, False),
-            "w",
-            encoding="UTF-8",
-        ) as outfile:
-            for id, filename in enumerate(file_list):
-                with open(filename, "r", encoding="UTF-8") as infile:
-                    file_data = infile.read()
-                    if filename.endswith(".jsonl"):
-                        outfile.write(file_data)
-                    elif filename.endswith(".json"):
-                        if id == 0 and len(file_list) == 1:
-                            outfile.write(file_data)
-                        elif id == 0 and len(file_list) > 1:
-                            outfile.write(file_data[:-1])  # don't write final ']'
-                        elif id != len(file_list) - 1:
-                            outfile.write("," + file_data[1:-1])  # don't write first or last '[/]'
-                        else:
-                            outfile.write("," + file_data[1::])  # dont write first '[', write last ']'
-
-    print("Saving force files for", game_id, "in", betmode)
     force_results_dict = {}
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index),
-            )
-
-    for filename in file_list:
-        force_chunk = ast.literal_eval(json.load(open(filename, "r", encoding="UTF-8")))
-        for key in force_chunk:
-            if force_results_dict.get(key) is not None:
-                force_results_dict[key]["timesTriggered"] += force_chunk[key]["timesTriggered"]
-                force_results_dict[key]["bookIds"] += force_chunk[key]["bookIds"]
-            else:
-                force_results_dict[key] = force_chunk[key]
+    for key, id_arrays in force_ids.items():
+        force_results_dict[key] = {"timesTriggered": force_triggers[key], "bookIds": merge_sorted_ids(id_arrays)}
 
     force_results_dict_just_for_rob = []
     for force_combination in force_results_dict:
@@ -203,13 +252,13 @@ def output_lookup_and_force_files(
         force_dict = {
             "search": search_dict,
             "timesTriggered": force_results_dict[force_combination]["timesTriggered"],
-            "bookIds": force_results_dict[force_combination]["bookIds"],
+            "bookIds": force_results_dict[force_combination]["bookIds"].tolist(),
         }
         force_results_dict_just_for_rob.append(force_dict)
 
     json_object_for_rob = json.dumps(force_results_dict_just_for_rob, indent=4)
     force_record_path = os.path.join(gamestate.output_files.force_path, f"force_record_{betmode}.json")
-    with open(force_record_path, "w", encoding="UTF-8") as file:
+    with open_hashed(force_record_path) as file:
         file.write(json_object_for_rob)
 
     forceResultKeys = get_force_options(force_results_dict)
@@ -219,70 +268,186 @@ def output_lookup_and_force_files(
             data = json.load(file)
     except FileNotFoundError:
         data = {}
-    data[gamestate.get_current_betmode().get_name()] = forceResultKeys
+    data[betmode] = forceResultKeys
     json_object = json.dumps(data, indent=4)
-    with open(json_file_path, "w", encoding="UTF-8") as file:
+    with open_hashed(json_file_path) as file:
         file.write(json_object)
 
-    weights_plus_wins_file_list = []
-    segmented_lut_file_list = []
-    print("Saving LUTs for", game_id, "in", betmode)
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            weights_plus_wins_file_list += [
-                gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)
-            ]
-            segmented_lut_file_list += [
-                gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)
-            ]
+    return force_results_dict
 
-    with open(
-        gamestate.output_files.get_final_lookup_name(betmode),
-        "w",
-        encoding="UTF-8",
-    ) as outfile:
+
+def merge_lookup_files(gamestate: object, betmode: str, threads: int, num_repeats: int) -> None:
+    """Combine temporary lookup tables (csv and binary) and write the _0 table if it does not exist."""
+    output_files = gamestate.output_files
+    weights_plus_wins_file_list = get_temp_file_list(output_files.get_temp_lookup_name, betmode, threads, num_repeats)
+    lookup_binary_file_list = get_temp_file_list(
+        output_files.get_temp_lookup_binary_name, betmode, threads, num_repeats
+    )
+    with open_hashed(output_files.get_final_lookup_name(betmode)) as outfile:
         for filename in weights_plus_wins_file_list:
-            with open(filename, "r", encoding="UTF-8") as infile:
+            with open(filename, "rb") as infile:
                 outfile.write(infile.read())
+    merge_lookup_binaries(lookup_binary_file_list, output_files.get_final_lookup_name(betmode))
 
     # Write _0 file if it does not exist
-    if not (os.path.exists(gamestate.output_files.get_optimized_lookup_name(betmode))):
+    if not (os.path.exists(output_files.get_optimized_lookup_name(betmode))):
+        copy_file(
+            output_files.get_final_lookup_name(betmode),
+            output_files.get_optimized_lookup_name(betmode),
+        )
+        # the binary table is not published, it is kept next to the simulation table
         shutil.copy(
-            gamestate.output_files.get_final_lookup_name(betmode),
-            gamestate.output_files.get_optimized_lookup_name(betmode),
+            get_binary_lookup_name(output_files.get_final_lookup_name(betmode)),
+            get_binary_lookup_name(output_files.get_optimized_lookup_name(betmode), output_files.lookup_path),
         )
-    with open(
-        gamestate.output_files.get_final_segmented_name(betmode),
-        "w",
-        encoding="UTF-8",
-    ) as outfile:
+
+
+def restrict_optimized_lookup(gamestate: object, betmode: str, book_ids: np.ndarray) -> None:
+    """Rewrite the _0 lookup table (csv and binary) to exactly the given book-ids, i.e those of the published books."""
+    output_files = gamestate.output_files
+    optimized_name = output_files.get_optimized_lookup_name(betmode)
+    table = load_lookup_table(optimized_name, output_files.lookup_path)
+    kept = table[np.isin(table["id"], book_ids)]
+    if len(kept) != len(book_ids):
+        raise ValueError(f"Book-ids for {betmode} are not contained in the optimized lookup table.")
+    if len(kept) == len(table):
+        return
+    with open_hashed(optimized_name) as outfile:
+        for idx, weight, payout in zip(kept["id"].tolist(), kept["weight"].tolist(), kept["payout"].tolist()):
+            outfile.write(f"{idx},{weight},{payout}\n")
+    write_lookup_binary(optimized_name, kept, output_files.lookup_path)
+
+
+def merge_segmented_files(gamestate: object, betmode: str, threads: int, num_repeats: int) -> None:
+    """Combine temporary base/free game pay-split tables."""
+    segmented_lut_file_list = get_temp_file_list(
+        gamestate.output_files.get_temp_segmented_name, betmode, threads, num_repeats
+    )
+    with open_hashed(gamestate.output_files.get_final_segmented_name(betmode)) as outfile:
         for filename in segmented_lut_file_list:
-            with open(filename, "r", encoding="UTF-8") as infile:
+            with open(filename, "rb") as infile:
                 outfile.write(infile.read())
 
 
-def write_json(gamestate, filename: str):
-    """Convert the list of dictionaries to a JSON-encoded string and compress it in chunks."""
-    json_objects = [json.dumps(item) for item in gamestate.library.values()]
-    combined_data = "\n".join(json_objects) + "\n"
+def merge_compact_book_files(gamestate: object, betmode: str, threads: int, num_repeats: int) -> None:
+    """Combine temporary compact books (sim id, repeat count, criteria, payout)."""
+    compact_file_list = get_temp_file_list(
+        gamestate.output_files.get_temp_compact_book_name, betmode, threads, num_repeats
+    )
+    merge_compact_books(compact_file_list, gamestate.output_files.get_compact_book_name(betmode))
+
 
+def timed(function, *args) -> tuple:
+    """Return (result, wall time in seconds) of a function call."""
+    start_time = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start_time
+
+
+def output_lookup_and_force_files(
+    threads: int,
+    batching_size: int,
+    game_id: str,
+    betmode: str,
+    gamestate: object,
+    num_sims: int = 1000000,
+    compress: bool = True,
+    write_event_list: bool = False,
+    stats_only: bool = False,
+):
+    """
+    Combine temporary lookup tables, pay-split tables, force files and books into single outputs.
+    The merges run concurrently and their wall times (seconds) are returned and printed.
+    Stats-only simulations have no books to merge.
+    """
+    print("Saving books, force files and LUTs for", game_id, "in", betmode)
+    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+    if stats_only and os.path.isfile(gamestate.output_files.get_final_book_name(betmode, compress)):
+        warn(f"Stats-only simulation, existing books for {betmode} no longer match the lookup tables.")
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        merges = {}
+        if not stats_only:
+            merges["books"] = executor.submit(
+                timed, merge_book_files, gamestate, betmode, threads, num_repeats, compress
+            )
+        merges["force"] = executor.submit(timed, merge_force_files, gamestate, betmode, threads, num_repeats)
+        merges["lookup"] = executor.submit(timed, merge_lookup_files, gamestate, betmode, threads, num_repeats)
+        merges["segmented"] = executor.submit(timed, merge_segmented_files, gamestate, betmode, threads, num_repeats)
+        merges["compact"] = executor.submit(timed, merge_compact_book_files, gamestate, betmode, threads, num_repeats)
+        merge_times = {}
+        for name, merge in merges.items():
+            result, merge_times[name] = merge.result()
+            if name == "force":
+                force_results_dict = result
+
+    force_index = ForceIndex.from_force_results(
+        force_results_dict, read_lookup_payouts(gamestate.output_files.get_final_lookup_name(betmode))
+    )
+    force_index.save(gamestate.output_files.get_force_index_name(betmode))
+    write_analytics_store(gamestate.output_files, betmode, force_index)
+    print(
+        f"Merge times for {betmode}:",
+        ", ".join(f"{name} {round(seconds, 3)}s" for name, seconds in merge_times.items()),
+    )
+
+    if write_event_list and not stats_only:
+        event_file_list = get_temp_file_list(gamestate.output_files.get_temp_event_name, betmode, threads, num_repeats)
+        write_library_events(gamestate, event_file_list, betmode)
+
+    return merge_times
+
+
+def write_json(gamestate, filename: str, index_name: str = None):
+    """Write library books as compressed frames, or stream them one book at a time to .json/.jsonl."""
     if filename.endswith(".zst"):
-        compressor = zstd.ZstdCompressor()
-        compressed_data = compressor.compress(combined_data.encode("UTF-8"))
-        with open(filename, "wb") as f:
-            f.write(compressed_data)
+        write_book_frames(
+            list(gamestate.library.values()),
+            filename,
+            index_name,
+            gamestate.config.book_frame_size,
+            get_book_compressor(gamestate.config),
+        )
     else:
-        with open(filename, "w", encoding="UTF-8") as f:
-            if not (gamestate.config.output_regular_json):
-                f.write(combined_data)
-            else:
-                j_regular = [item for item in gamestate.library.values()]
-                f.write(json.dumps(j_regular))
+        write_books(gamestate.library.values(), filename, gamestate.config.output_regular_json)
 
 
 def print_recorded_wins(gamestate: object, name: str = ""):
-    """Temporary file generation for wins/recorded results."""
-    json_object = json.dumps(str(gamestate.recorded_events), indent=4)
-    file = open(name, "w", encoding="UTF-8")
-    file.write(json_object)
-    file.close()
+    """Temporary file generation for wins/recorded results.
+
+    Binary layout: magic, uint32 header length, JSON header holding each description key once along with
+    its trigger and id counts, followed by the book-ids of every key as packed little-endian uint32 arrays.
+    recorded_events are keyed by interned description ids, which are converted back to strings here.
+    """
+    keys, triggered, counts = [], [], []
+    for description_id, details in gamestate.recorded_events.items():
+        keys.append([list(key_value) for key_value in gamestate.descriptions[description_id]])
+        triggered.append(details["timesTriggered"])
+        counts.append(len(details["bookIds"]))
+    header = json.dumps({"keys": keys, "timesTriggered": triggered, "counts": counts}).encode("UTF-8")
+
+    with open(name, "wb") as f:
+        f.write(FORCE_RECORD_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for details in gamestate.recorded_events.values():
+            book_ids = details["bookIds"]
+            if not isinstance(book_ids, array) or sys.byteorder != "little":
+                book_ids = array("I", book_ids)
+                if sys.byteorder != "little":
+                    book_ids.byteswap()
+            book_ids.tofile(f)
+
+
+def read_recorded_wins(name: str):
+    """Stream (description, timesTriggered, bookIds) entries from a temporary force-record file."""
+    with open(name, "rb") as f:
+        if f.read(len(FORCE_RECORD_MAGIC)) != FORCE_RECORD_MAGIC:
+            raise RuntimeError(f"{name} is not a force-record file.")
+        (header_length,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_length).decode("UTF-8"))
+        for key, times_triggered, count in zip(header["keys"], header["timesTriggered"], header["counts"]):
+            book_ids = array("I")
+            book_ids.fromfile(f, count)
+            if sys.byteorder != "little":
+                book_ids.byteswap()
+            yield tuple(tuple(key_value) for key_value in key), times_triggered, book_ids
@@ -0,0 +1,66 @@
+"""Shared test fixtures."""
+
+import os
+import sys
+import shutil
+import importlib
+import pytest
+import src.config.config as config_module
+import src.config.output_filenames as output_filenames
+from src.config.paths import PATH_TO_GAMES
+
+GAME_MODULES = [
+    "game_config",
+    "gamestate",
+    "game_override",
+    "game_executables",
+    "game_calculations",
+    "game_events",
+    "game_optimization",
+]
+
+
+@pytest.fixture
+def make_book():
+    """
+    Factory for minimal books with the fields read by the book, lookup and compact table writers.
+    Books with the same payout and criteria differ only by id.
+    """
+
+    def make(book_id: int, payout: int = 0, criteria: str = "0", base_win: float = 0.0, free_win: float = 0.0):
+        return {
+            "id": book_id,
+            "payoutMultiplier": payout,
+            "events": [{"index": 0, "type": "finalWin", "amount": payout}],
+            "criteria": criteria,
+            "baseGameWins": base_win,
+            "freeGameWins": free_win,
+        }
+
+    return make
+
+
+@pytest.fixture
+def sample_game(tmp_path, monkeypatch):
+    """
+    Loader returning (config, gamestate) of a sample game copied to tmp_path/games,
+    so compiled configs, books and lookup tables are written there instead of the repository.
+    """
+    games_path = tmp_path / "games"
+
+    def load(game_id: str) -> tuple:
+        game_path = games_path / game_id
+        shutil.copytree(
+            os.path.join(PATH_TO_GAMES, game_id), game_path, ignore=shutil.ignore_patterns("library", "__pycache__")
+        )
+        monkeypatch.setattr(config_module, "PATH_TO_GAMES", str(games_path))
+        monkeypatch.setattr(output_filenames, "PATH_TO_GAMES", str(games_path))
+        monkeypatch.syspath_prepend(str(game_path))
+        for name in GAME_MODULES:
+            monkeypatch.delitem(sys.modules, name, raising=False)
+        config = importlib.import_module("game_config").GameConfig()
+        return config, importlib.import_module("gamestate").GameState(config)
+
+    yield load
+    for name in GAME_MODULES:
+        sys.modules.pop(name, None)
@@ -0,0 +1,63 @@
+"""Test analytics store columns, force filters and rebuilds."""
+
+import os
+import json
+from types import SimpleNamespace
+import numpy as np
+from src.config import output_filenames
+from src.config.output_filenames import OutputFiles
+from src.write_data.analytics_store import AnalyticsStore, load_analytics_store, write_analytics_store
+
+FORCE_RECORD = [
+    {
+        "search": [{"name": "kind", "value": "3"}, {"name": "symbol", "value": "H1"}],
+        "timesTriggered": 3,
+        "bookIds": [1, 4],
+    },
+    {
+        "search": [{"name": "kind", "value": "3"}, {"name": "symbol", "value": "L1"}],
+        "timesTriggered": 1,
+        "bookIds": [4],
+    },
+]
+
+
+def make_library(tmp_path, monkeypatch, weights=(1, 2, 3, 4)):
+    monkeypatch.setattr(output_filenames, "PATH_TO_GAMES", str(tmp_path))
+    output_files = OutputFiles(SimpleNamespace(game_id="0_0_test", bet_modes=[], output_regular_json=False))
+    payouts = [0, 150, 0, 2000]
+    with open(output_files.get_optimized_lookup_name("base"), "w", encoding="UTF-8") as f:
+        f.write("".join(f"{i + 1},{w},{p}\n" for i, (w, p) in enumerate(zip(weights, payouts))))
+    with open(output_files.get_final_segmented_name("base"), "w", encoding="UTF-8") as f:
+        f.write("1,0,0.0,0.0\n2,basegame,1.5,0.0\n3,0,0.0,0.0\n4,freegame,2.0,18.0\n")
+    with open(output_files.get_force_record_name("base"), "w", encoding="UTF-8") as f:
+        json.dump(FORCE_RECORD, f)
+    return output_files
+
+
+def test_store_columns_and_filters(tmp_path, monkeypatch):
+    output_files = make_library(tmp_path, monkeypatch)
+    write_analytics_store(output_files, "base")
+    store = AnalyticsStore.load(output_files.get_analytics_store_name("base"))
+
+    assert store.ids.tolist() == [1, 2, 3, 4]
+    assert store.free_win.tolist() == [0.0, 0.0, 0.0, 18.0]
+    assert store.get_criteria("basegame").tolist() == ["basegame", "basegame", "basegame", "freegame"]
+    assert store.total_weight(store.criteria_mask("0")) == 4
+
+    mask = store.force_mask({"kind": "3"}) & store.payout_mask(min_payout=1000)
+    assert store.ids[mask].tolist() == [4]
+    # book 4 is matched by both entries
+    assert store.force_rows({"kind": "3"}).tolist() == [0, 3, 3]
+    assert store.force_index.get_ids(store.force_index.query("symbol=L1 OR payout=150")).tolist() == [2, 4]
+
+
+def test_store_rebuilt_when_sources_change(tmp_path, monkeypatch):
+    output_files = make_library(tmp_path, monkeypatch)
+    assert load_analytics_store(output_files, "base").total_weight() == 10
+
+    make_library(tmp_path, monkeypatch, weights=(5, 5, 5, 5))
+    store_name = output_files.get_analytics_store_name("base")
+    os.utime(store_name, (0, 0))
+    assert load_analytics_store(output_files, "base").total_weight() == 20
+    assert np.load(store_name)["weight"].tolist() == [5, 5, 5, 5]
@@ -0,0 +1,20 @@
+"""Test the deduplicated book archive."""
+
+import json
+from src.write_data.book_dedup import dedup_books, iter_dedup_books, split_book_id
+
+
+def test_repeated_payloads_are_stored_once(tmp_path, make_book):
+    lines = [json.dumps(make_book(book_id, 100 * (book_id % 3 == 0))) for book_id in range(1, 31)]
+    archive_name, map_name = str(tmp_path / "books_base_dedup.jsonl.zst"), str(tmp_path / "books_base_dedup_map.npy")
+    summary = dedup_books((line.encode("UTF-8") for line in lines), archive_name, map_name)
+
+    assert summary["books"] == 30
+    assert summary["unique_payloads"] == 2
+    assert summary["saved"] > 0
+    assert list(iter_dedup_books(archive_name, map_name)) == lines
+
+
+def test_split_book_id_without_leading_id():
+    line = json.dumps({"payoutMultiplier": 0, "id": 7}).encode("UTF-8")
+    assert split_book_id(line) == (7, b'{"payoutMultiplier": 0}')
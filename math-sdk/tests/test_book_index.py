@@ -0,0 +1,68 @@
+"""Test seekable compressed books."""
+
+import os
+import json
+from types import SimpleNamespace
+import zstandard as zstd
+from src.write_data.book_index import (
+    write_book_frames,
+    merge_book_frames,
+    train_book_dictionary,
+    get_book_compressor,
+    get_book_dictionary_name,
+    get_compression_summary,
+    BookIndex,
+    BookReader,
+)
+
+
+def test_books_can_be_read_individually(tmp_path, make_book):
+    file_list, index_list = [], []
+    for chunk, ids in enumerate([range(1, 11), range(21, 24), range(11, 21)]):
+        file_list.append(str(tmp_path / f"books_{chunk}.jsonl.zst"))
+        index_list.append(str(tmp_path / f"books_{chunk}_index.bin"))
+        books = [make_book(book_id, 10 * book_id) for book_id in ids]
+        write_book_frames(books, file_list[-1], index_list[-1], frame_size=4)
+
+    book_name = str(tmp_path / "books_base.jsonl.zst")
+    merge_book_frames(file_list, index_list, book_name)
+
+    with open(book_name, "rb") as f:
+        reader = zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+        all_books = [json.loads(line) for line in reader.read().decode("UTF-8").splitlines()]
+    assert [book["id"] for book in all_books] == list(range(1, 11)) + list(range(21, 24)) + list(range(11, 21))
+
+    index = BookIndex(book_name)
+    assert len(index.frames) == 3 + 1 + 3
+    for book in all_books:
+        assert index.get_book(book["id"]) == book
+
+
+def test_dictionary_compressed_books(tmp_path, make_book):
+    config = SimpleNamespace(book_compression_level=5, book_compression_threads=2)
+    file_list, index_list = [str(tmp_path / "books_0.jsonl.zst")], [str(tmp_path / "books_0_index.bin")]
+    books = [make_book(book_id, 10 * book_id) for book_id in range(1, 301)]
+    write_book_frames(books, file_list[0], index_list[0], 50, get_book_compressor(config))
+
+    dictionary = train_book_dictionary(file_list, index_list, 2048, 300)
+    # index and dictionary are written outside of the publish folder
+    publish_path, index_path = tmp_path / "publish_files", tmp_path / "books"
+    publish_path.mkdir()
+    index_path.mkdir()
+    book_name = str(publish_path / "books_base.jsonl.zst")
+    with open(get_book_dictionary_name(book_name, str(index_path)), "wb") as f:
+        f.write(dictionary.as_bytes())
+    frames = merge_book_frames(
+        file_list,
+        index_list,
+        book_name,
+        lambda: get_book_compressor(config, dictionary),
+        workers=3,
+        index_path=str(index_path),
+    )
+
+    assert os.listdir(publish_path) == ["books_base.jsonl.zst"]
+    assert sorted(os.listdir(index_path)) == ["books_base.dict", "books_base_index.npy"]
+    assert get_compression_summary(frames)["ratio"] > 1
+    assert "seconds" not in BookIndex(book_name, str(index_path)).frames.dtype.names
+    assert BookReader(str(publish_path), str(index_path)).get_book("base", 123) == books[122]
@@ -0,0 +1,19 @@
+"""Test books replayed from compact books against create_books() outputs."""
+
+from src.state.run_sims import create_books
+from src.state.book_replay import BookReplayer
+from src.write_data.book_index import BookReader
+
+
+def test_replayed_compact_books_match_published_books(sample_game):
+    config, gamestate = sample_game("0_0_lines")
+    create_books(gamestate, config, {"base": 20}, 10, 1, True, False)
+    reader = BookReader(config.publish_path, config.book_path)
+    library, win_manager = gamestate.library, gamestate.win_manager
+
+    replayer = BookReplayer(gamestate)
+    assert replayer.get_book("base", 7) == reader.get_book("base", 7)
+    replayed = list(replayer.iter_books("base"))
+    assert [book["id"] for book in replayed] == list(range(1, 21))
+    assert replayed == [reader.get_book("base", book_id) for book_id in range(1, 21)]
+    assert gamestate.library is library and gamestate.win_manager is win_manager
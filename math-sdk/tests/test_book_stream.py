@@ -0,0 +1,40 @@
+"""Test streaming uncompressed .json/.jsonl books."""
+
+import json
+from src.write_data import book_stream
+from src.write_data.book_stream import write_books, iter_books, merge_books, convert_books
+
+
+def test_merged_books_match_single_write(tmp_path, make_book):
+    chunks = [range(1, 6), range(6, 6), range(6, 9), range(9, 10)]
+    for regular_json, ext in [(True, ".json"), (False, ".jsonl")]:
+        file_list = []
+        for chunk, ids in enumerate(chunks):
+            file_list.append(str(tmp_path / f"books_{chunk}{ext}"))
+            write_books([make_book(book_id, 10 * book_id) for book_id in ids], file_list[-1], regular_json)
+        book_name = str(tmp_path / f"books_base{ext}")
+        merge_books(file_list, book_name)
+
+        books = [make_book(book_id, 10 * book_id) for book_id in range(1, 10)]
+        with open(book_name, "r", encoding="UTF-8") as f:
+            if regular_json:
+                assert json.loads(f.read()) == books
+            else:
+                assert [json.loads(line) for line in f] == books
+        assert list(iter_books(book_name)) == books
+
+
+def test_convert_books(tmp_path, monkeypatch, make_book):
+    # force books to be split across reads
+    monkeypatch.setattr(book_stream, "READ_SIZE", 16)
+    books = [make_book(book_id, 10 * book_id) for book_id in range(1, 20)]
+    json_name, jsonl_name = str(tmp_path / "books.json"), str(tmp_path / "books.jsonl")
+    with open(json_name, "w", encoding="UTF-8") as f:
+        f.write(json.dumps(books))
+
+    convert_books(json_name, jsonl_name)
+    assert list(iter_books(jsonl_name)) == books
+
+    convert_books(jsonl_name, str(tmp_path / "books_2.json"))
+    with open(str(tmp_path / "books_2.json"), "r", encoding="UTF-8") as f:
+        assert f.read() == json.dumps(books)
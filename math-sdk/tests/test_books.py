@@ -0,0 +1,37 @@
+"""Test book event ownership checks and stats-only books."""
+
+from types import SimpleNamespace
+import pytest
+from src.state.books import Book
+from src.events.events import set_total_event
+
+
+def test_modified_event_is_flagged():
+    positions = [1, 2, 3]
+    book = Book(1, "basegame", verify_events=True)
+    book.add_event({"index": 0, "type": "reveal", "paddingPositions": positions})
+    book.to_json()
+
+    positions[0] = 10
+    with pytest.raises(RuntimeError):
+        book.to_json()
+
+
+def test_appended_items_are_not_flagged():
+    book = Book(1, "basegame", verify_events=True)
+    book.add_event({"index": 0, "type": "reveal"})
+    book.append_book_items(0, {"gameType": "basegame"})
+    assert book.to_json()["events"][0]["gameType"] == "basegame"
+
+
+def test_stats_only_books_have_no_events():
+    config = SimpleNamespace(wincap=5000)
+    win_manager = SimpleNamespace(running_bet_win=1.5)
+    gamestate = SimpleNamespace(stats_only=False, book=Book(1, "basegame"), config=config, win_manager=win_manager)
+    set_total_event(gamestate)
+    assert gamestate.book.events == [{"index": 0, "type": "setTotalWin", "amount": 150}]
+
+    gamestate.stats_only, gamestate.book = True, Book(2, "basegame", record_events=False)
+    set_total_event(gamestate)
+    gamestate.book.add_event({"index": 0, "type": "reveal"})
+    assert gamestate.book.to_json()["events"] == []
@@ -0,0 +1,32 @@
+"""Test compact book tables."""
+
+from types import SimpleNamespace
+from src.write_data.compact_books import make_compact_books, merge_compact_books, load_compact_books
+
+
+class CompactGameState:
+    def __init__(self, library, repeat_counts):
+        distributions = [SimpleNamespace(get_criteria=lambda name=name: name) for name in ["wincap", "freegame", "0"]]
+        self.betmode = "base"
+        self.library = library
+        self.repeat_counts = repeat_counts
+        self.betmode_details = SimpleNamespace(get_distributions=lambda: distributions)
+
+    def get_betmode(self, betmode):
+        return self.betmode_details
+
+
+def test_compact_books_round_trip(tmp_path, make_book):
+    file_list = [str(tmp_path / "compact_0.bin"), str(tmp_path / "compact_1.bin")]
+    gamestate = CompactGameState({2: make_book(2, 0, "0"), 1: make_book(1, 1520, "freegame")}, {1: 4, 2: 0})
+    make_compact_books(gamestate, file_list[0])
+    gamestate = CompactGameState({3: make_book(3, 500000, "wincap")}, {3: 12})
+    make_compact_books(gamestate, file_list[1])
+
+    compact_name = str(tmp_path / "books_base_compact.npy")
+    merge_compact_books(file_list, compact_name)
+    table = load_compact_books(compact_name)
+    assert table["id"].tolist() == [1, 2, 3]
+    assert table["repeat_count"].tolist() == [4, 0, 12]
+    assert table["criteria"].tolist() == [1, 2, 0]
+    assert table["payout"].tolist() == [1520, 0, 500000]
@@ -0,0 +1,69 @@
+"""Test compiled game configs."""
+
+import random
+import pytest
+import numpy as np
+from types import SimpleNamespace
+from src.calculations.statistics import get_random_outcome
+from src.config.compiled_config import (
+    compile_arrays,
+    CompiledConfig,
+    parse_reels_csv,
+    make_sampler,
+    draw_from_sampler,
+    get_game_hash,
+)
+
+
+def test_parse_reels_csv(tmp_path):
+    name = tmp_path / "BR0.csv"
+    name.write_text("L1, H1,S\nW ,L2,L1\n H2,L1,W\n", encoding="UTF-8")
+    assert parse_reels_csv(str(name)) == [["L1", "W", "H2"], ["H1", "L2", "L1"], ["S", "L1", "W"]]
+
+
+def test_compiled_round_trip(tmp_path):
+    reel_weights = {"basegame": {"BR0": 3, "BR1": 1}}
+    distribution = SimpleNamespace(_criteria="basegame", _conditions={"reel_weights": reel_weights})
+    betmode = SimpleNamespace(get_name=lambda: "base", get_distributions=lambda: [distribution])
+    config = SimpleNamespace(
+        reel_files={"reels/BR0.csv": [["L1", "W", "S"], ["H1", "L1"]], "reels/BR1.csv": [["H1"], ["W", "L1"]]},
+        bet_modes=[betmode],
+    )
+    name = tmp_path / "config.npz"
+    np.savez(name, **compile_arrays(config))
+    with np.load(name) as arrays:
+        compiled = CompiledConfig(dict(arrays), "hash")
+
+    assert compiled.get_reelstrips("reels/BR0.csv") == config.reel_files["reels/BR0.csv"]
+    assert compiled.get_reelstrips("reels/BR1.csv") == config.reel_files["reels/BR1.csv"]
+    assert compiled.get_reelstrips("reels/FR0.csv") is None
+    assert compiled.symbols.tolist() == ["H1", "L1", "S", "W"]
+    assert compiled.get_sampler("base", "basegame", "basegame") == (["BR0", "BR1"], [3.0, 4.0], 4.0)
+    assert compiled.get_sampler("base", "basegame", "freegame") is None
+
+
+def test_sampler_matches_random_outcome():
+    distribution = {2: 0.1, 3: 50, 5: 0.7, 10: 7, 20: 0}
+    sampler = make_sampler(distribution)
+    random.seed(4)
+    expected = [get_random_outcome(distribution) for _ in range(2000)]
+    random.seed(4)
+    assert [draw_from_sampler(sampler) for _ in range(2000)] == expected
+
+
+def test_sampler_raises_past_last_weight():
+    random.seed(1)
+    with pytest.raises(Exception, match="error drawing item"):
+        for _ in range(100):
+            draw_from_sampler((["L1"], [1.0], 2.0))
+
+
+def test_game_hash_ignores_library(tmp_path):
+    (tmp_path / "reels").mkdir()
+    (tmp_path / "reels" / "BR0.csv").write_text("L1,L2\n", encoding="UTF-8")
+    game_hash = get_game_hash(str(tmp_path))
+    (tmp_path / "library").mkdir()
+    (tmp_path / "library" / "lookUpTable_base.csv").write_text("1,1,0\n", encoding="UTF-8")
+    assert get_game_hash(str(tmp_path)) == game_hash
+    (tmp_path / "reels" / "BR0.csv").write_text("L1,L3\n", encoding="UTF-8")
+    assert get_game_hash(str(tmp_path)) != game_hash
@@ -0,0 +1,57 @@
+"""Test the vectorized distribution statistics against a row by row calculation."""
+
+from math import sqrt
+import numpy as np
+from src.write_data.lookup_binary import LOOKUP_DTYPE
+from utils.analysis.distribution_functions import get_distribution_arrays, get_distribution_statistics
+
+
+def loop_statistics(dist: dict, bet_cost: float) -> dict:
+    """Statistics of an ordered, normalized win-distribution, accumulated one payout at a time."""
+    wins = list(dist.keys())
+    av_win = float(np.average(wins, weights=list(dist.values())))
+    total_weight = sum(dist.values())
+    variance, skewness, kurtosis, cumulative_weight, prob_less_bet = 0.0, 0.0, 0.0, 0, 0
+    median = None
+    for win, weight in dist.items():
+        variance += ((win - av_win) ** 2) * (weight / total_weight)
+        cumulative_weight += weight
+        if median is None and cumulative_weight >= total_weight / 2:
+            median = win
+        if win < bet_cost:
+            prob_less_bet += weight
+    standard_dev = sqrt(variance) / bet_cost
+    for win, weight in dist.items():
+        skewness += ((win - av_win) ** 3) * weight
+        kurtosis += ((win - av_win) ** 4) * weight
+
+    min_diff = None
+    for i in range(len(wins) - 2):
+        if min_diff is None or min_diff > abs(wins[i + 1]) - wins[i]:
+            min_diff = abs(wins[i + 1]) - wins[i]
+    return {
+        "average": av_win,
+        "rtp": float(np.dot(wins, list(dist.values()))) / total_weight / bet_cost,
+        "var": variance,
+        "std": sqrt(variance),
+        "skew": skewness / standard_dev**3,
+        "excess_kurtosis": kurtosis / standard_dev**4 - 3,
+        "median": median,
+        "hr_max": 1.0 / (dist[wins[-1]] / total_weight),
+        "non_zero_hr": 1 / (1 - dist[0] / total_weight) if wins[0] == 0 else 1,
+        "prob_nil": dist[0] if wins[0] == 0 else 0,
+        "prob_less_bet": prob_less_bet / total_weight,
+        "min_diff": int(round(min_diff * 100)),
+    }
+
+
+def test_statistics_identical_to_loop():
+    rng = np.random.default_rng(7)
+    for bet_cost in [1.0, 2.0, 100.0]:
+        table = np.zeros(3000, dtype=LOOKUP_DTYPE)
+        table["payout"] = rng.choice(np.arange(0, 200000, 10), len(table)) * (rng.random(len(table)) < 0.6)
+        table["weight"] = rng.integers(1, 10**9, len(table))
+        wins, weights = get_distribution_arrays(table)
+        dist = dict(zip(wins.tolist(), weights.tolist()))
+
+        assert get_distribution_statistics(wins, weights, bet_cost) == loop_statistics(dist, bet_cost)
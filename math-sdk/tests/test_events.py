@@ -0,0 +1,27 @@
+"""Test JSON symbol formatting used in board events."""
+
+from src.calculations.symbol import SymbolStorage
+from src.events.events import json_ready_sym
+
+
+class SymbolConfig:
+    def __init__(self):
+        self.paytable = {(3, "H1"): 1.0, (3, "W"): 2.0}
+        self.special_symbols = {"wild": ["W"], "scatter": ["S"], "multiplier": ["W"], "prize": ["P"]}
+
+
+def test_symbol_layout_matches_attributes():
+    config = SymbolConfig()
+    storage = SymbolStorage(config, ["H1", "W", "S", "P"])
+    special_attributes = list(config.special_symbols.keys())
+
+    symbols = [storage.create_symbol_state(name) for name in ["H1", "W", "S", "P", "W", "H1", "H1", "P"]]
+    symbols[4].assign_attribute({"multiplier": 5})
+    symbols[5].assign_attribute({"multiplier": 2})
+    symbols[6].assign_attribute({"explode": True, "prize": 3})
+    symbols[7].assign_attribute({"prize": 0.5})
+    symbols[1].assign_attribute({"wild": False})
+
+    for sym in symbols:
+        assert json_ready_sym(sym) == json_ready_sym(sym, special_attributes)
+        assert list(json_ready_sym(sym)) == list(json_ready_sym(sym, special_attributes))
@@ -0,0 +1,43 @@
+"""Test hashing output files on write."""
+
+import os
+import json
+import hashlib
+from src.write_data.file_manifest import open_hashed, copy_file, get_file_details, get_manifest_name, MANIFEST_FOLDER
+
+
+def test_manifest_matches_file_contents(tmp_path):
+    publish_path = tmp_path / "publish_files"
+    publish_path.mkdir()
+    filename = str(publish_path / "lookUpTable_base.csv")
+    with open_hashed(filename) as f:
+        f.write("1,1,0\n")
+        f.write(b"2,1,150\n")
+    copy_file(filename, str(publish_path / "lookUpTable_base_0.csv"))
+
+    with open(get_manifest_name(filename), "r", encoding="UTF-8") as f:
+        manifest = json.load(f)
+    # the manifest is kept out of the directory it describes
+    assert get_manifest_name(filename) == str(tmp_path / MANIFEST_FOLDER / "publish_files.json")
+    assert sorted(os.listdir(publish_path)) == ["lookUpTable_base.csv", "lookUpTable_base_0.csv"]
+    for name in ["lookUpTable_base.csv", "lookUpTable_base_0.csv"]:
+        with open(str(publish_path / name), "rb") as f:
+            data = f.read()
+        assert manifest[name]["sha256"] == hashlib.sha256(data).hexdigest()
+        assert manifest[name]["size"] == len(data)
+        assert manifest[name]["lines"] == 2
+
+
+def test_modified_file_is_rehashed(tmp_path):
+    (tmp_path / "forces").mkdir()
+    filename = str(tmp_path / "forces" / "force.json")
+    with open_hashed(filename) as f:
+        f.write("{}")
+    assert get_file_details(filename)["sha256"] == hashlib.sha256(b"{}").hexdigest()
+
+    with open(filename, "w", encoding="UTF-8") as f:
+        f.write('{"base": {}}')
+    os.utime(filename, ns=(0, 0))
+    assert get_file_details(filename, compute=False) is None
+    assert get_file_details(filename)["sha256"] == hashlib.sha256(b'{"base": {}}').hexdigest()
+    assert get_file_details(filename, compute=False)["size"] == len('{"base": {}}')
@@ -0,0 +1,40 @@
+"""Test force-index searches against force-record semantics."""
+
+import numpy as np
+from src.write_data.force_index import ForceIndex
+
+FORCE_RESULTS = {
+    (("gametype", "basegame"), ("kind", "3"), ("symbol", "H1")): {"timesTriggered": 2, "bookIds": [1, 4]},
+    (("gametype", "basegame"), ("kind", "4"), ("symbol", "L1")): {"timesTriggered": 2, "bookIds": [2, 4]},
+    (("gametype", "freegame"), ("kind", "3"), ("symbol", "L1")): {"timesTriggered": 2, "bookIds": [3, 5]},
+}
+PAYOUTS = np.array([0, 10, 0, 500, 2000, 100])
+
+
+def get_index(tmp_path):
+    name = str(tmp_path / "force_index.npz")
+    ForceIndex.from_force_results(FORCE_RESULTS, PAYOUTS).save(name)
+    return ForceIndex.load(name)
+
+
+def test_partial_matches_stay_within_one_entry(tmp_path):
+    index = get_index(tmp_path)
+    assert index.get_ids(index.match({"kind": "3"})).tolist() == [1, 3, 4, 5]
+    assert index.get_ids(index.match({"kind": "3", "symbol": "L1"})).tolist() == [3, 5]
+    # book 4 has a 3-kind and a L1 win, but not a 3-kind L1 win
+    assert index.get_ids(index.match({"kind": "3", "symbol": "L1", "gametype": "basegame"})).tolist() == []
+    assert index.get_times_triggered({"gametype": "basegame"}) == 4
+
+
+def test_query_expressions(tmp_path):
+    index = get_index(tmp_path)
+    assert index.get_ids(index.query("NOT symbol=L1")).tolist() == [1]
+    assert index.get_ids(index.query("kind=3 AND NOT (gametype=freegame OR payout>=1000)")).tolist() == [1]
+    assert index.get_ids(index.query("kind=4,symbol=L1 OR payout<50 and payout>0")).tolist() == [1, 2, 4]
+
+
+def test_payout_comparisons_within_key_groups(tmp_path):
+    index = get_index(tmp_path)
+    assert index.get_ids(index.query("gametype=freegame,payout>=1000")).tolist() == []
+    assert index.get_ids(index.query("gametype=freegame AND payout>=1000")).tolist() == []
+    assert index.get_ids(index.query("payout>=100,kind=3,payout<1000")).tolist() == [3, 5]
@@ -0,0 +1,89 @@
+"""Test array based PAR-sheet calculations."""
+
+from collections import defaultdict
+from types import SimpleNamespace
+import numpy as np
+from utils.game_analytics.get_pay_splits import split_win_distributions, load_segmented_table
+from utils.game_analytics.print_all_results import PrintXLSX
+
+
+def row_split_distributions(weights, fences, base_wins, free_wins, all_modes, base_mode_name="basegame"):
+    combined = defaultdict(lambda: defaultdict(float))
+    for weight, fence, base_win, free_win in zip(weights, fences, base_wins, free_wins):
+        if base_mode_name in all_modes:
+            combined[base_mode_name][base_win] += weight
+        if fence != base_mode_name and fence != "wincap":
+            combined[fence][free_win] += weight
+        else:
+            for mode in all_modes:
+                if mode != base_mode_name and mode != "cumulative":
+                    combined[mode][free_win] += weight
+        combined["cumulative"][base_win + free_win] += weight
+    return {mode: dict(sorted(combined[mode].items())) for mode in all_modes}
+
+
+def test_split_win_distributions(tmp_path):
+    rng = np.random.default_rng(3)
+    rows = []
+    for sim in range(1, 2001):
+        fence = str(rng.choice(["0", "basegame", "freegame", "wincap"]))
+        base_win = round(float(rng.choice([0, 0.2, 1.5, 20.0])), 2)
+        free_win = 0.0 if fence in ("0", "basegame") else round(float(rng.choice([0, 3.1, 250.5])), 2)
+        rows.append(f"{sim},{fence},{base_win},{free_win}\n")
+    split_file = tmp_path / "lookUpTableSegmented_base.csv"
+    split_file.write_text("".join(rows), encoding="UTF-8")
+    weights = rng.integers(1, 10**12, len(rows), dtype=np.uint64)
+
+    fences, base_wins, free_wins = load_segmented_table(str(split_file))
+    all_modes = ["basegame", "freegame", "cumulative"]
+    expected = row_split_distributions(
+        weights.tolist(), fences.tolist(), base_wins.tolist(), free_wins.tolist(), all_modes
+    )
+    assert split_win_distributions(weights, fences, base_wins, free_wins, all_modes) == expected
+
+
+def test_xlsx_cells_written_in_row_order():
+    class Worksheet:
+        def __init__(self):
+            self.writes = []
+
+        def write(self, row, col, value):
+            self.writes.append((row, col, value))
+
+        def write_row(self, row, col, values):
+            for idx, value in enumerate(values):
+                self.write(row, col + idx, value)
+
+    win_ranges = [(0, 1), (1, 10)]
+    game_info = SimpleNamespace(
+        win_ranges=win_ranges,
+        mode_hit_rate_info={
+            "base": {
+                "all_gameType_hits": {mode: {wr: 2.0 for wr in win_ranges} for mode in ["basegame", "cumulative"]},
+                "all_gameType_rtp": {mode: {wr: 0.5 for wr in win_ranges} for mode in ["basegame", "cumulative"]},
+            }
+        },
+        mode_hit_counts={"base": {wr: 7 for wr in win_ranges}},
+        hr_summary={"base": {str({"kind": "3", "symbol": "H1"}): 12.345}},
+        sim_count_summary={"base": {str({"kind": "3", "symbol": "H1"}): 4}},
+        av_win_summary={"base": {str({"kind": "3", "symbol": "H1"}): 1.25}},
+        custom_hr_summary={"base": {"{}": 1.0}},
+        custom_sim_count_summary={"base": {"{}": 10}},
+        custom_av_win_summary={"base": {"{}": 0.5}},
+    )
+    printer = PrintXLSX.__new__(PrintXLSX)
+    printer.game_info = game_info
+    printer.global_ranges = win_ranges
+    printer.hit_rate_sheet = Worksheet()
+    printer.write_mode_probs("base", 0, 0)
+    printer.write_symbol_info("base", len(win_ranges) + 5, 0)
+    printer.write_custom_key_info("base", printer.last_row_end + 2)
+
+    writes = printer.hit_rate_sheet.writes
+    rows = [row for row, _, _ in writes]
+    assert rows == sorted(rows)
+    cells = {(row, col): value for row, col, value in writes}
+    assert len(cells) == len(writes)
+    assert cells[(1, 9)] == "(0, 1)" and cells[(1, 10)] == 7
+    assert cells[(6, 4)] == "SIM COUNTS" and cells[(8, 5)] == 4 and cells[(8, 9)] == 1.2
+    assert cells[(13, 0)] == "CUSTOM" and cells[(15, 0)] == "{}" and cells[(15, 3)] == "0.5"
@@ -0,0 +1,77 @@
+"""Test binary lookup tables written alongside csv outputs."""
+
+import os
+from types import SimpleNamespace
+from src.write_data.lookup_binary import (
+    make_lookup_binary,
+    merge_lookup_binaries,
+    load_lookup_table,
+    get_binary_lookup_name,
+    rebuild_lookup_binary,
+)
+from utils.rgs_verification import verify_lookup_format
+
+
+def make_library(make_book, ids):
+    return SimpleNamespace(library={sim: make_book(sim + 1, 10 * sim, base_win=0.1 * sim) for sim in ids})
+
+
+def test_merged_table_matches_library(tmp_path, make_book):
+    chunks = []
+    for index, ids in enumerate([range(0, 3), range(3, 5)]):
+        chunks.append(str(tmp_path / f"chunk_{index}.bin"))
+        make_lookup_binary(make_library(make_book, ids), chunks[-1])
+
+    lookup_name = str(tmp_path / "lookUpTable_base.csv")
+    with open(lookup_name, "w", encoding="UTF-8") as f:
+        f.write("".join(f"{sim + 1},1,{10 * sim}\n" for sim in range(5)))
+    merge_lookup_binaries(chunks, lookup_name)
+
+    table = load_lookup_table(lookup_name)
+    assert table["id"].tolist() == [1, 2, 3, 4, 5]
+    assert table["payout"].tolist() == [0, 10, 20, 30, 40]
+    assert table["base_win"].tolist() == [round(0.1 * sim, 2) for sim in range(5)]
+
+
+def test_stale_binary_falls_back_to_csv(tmp_path, make_book):
+    lookup_name = str(tmp_path / "lookUpTable_base_0.csv")
+    chunk = str(tmp_path / "chunk.bin")
+    make_lookup_binary(make_library(make_book, range(2)), chunk)
+    merge_lookup_binaries([chunk], lookup_name)
+
+    with open(lookup_name, "w", encoding="UTF-8") as f:
+        f.write("1,5,0\n2,7,10\n")
+    binary_mtime = os.path.getmtime(get_binary_lookup_name(lookup_name))
+    os.utime(lookup_name, (binary_mtime + 1, binary_mtime + 1))
+
+    assert load_lookup_table(lookup_name)["weight"].tolist() == [5, 7]
+
+
+def test_optimized_binary_rebuilt_from_csv(tmp_path, make_book):
+    lookup_path, publish_path = tmp_path / "lookup_tables", tmp_path / "publish_files"
+    lookup_path.mkdir()
+    publish_path.mkdir()
+    base_lookup = str(lookup_path / "lookUpTable_base.csv")
+    chunk = str(tmp_path / "chunk.bin")
+    make_lookup_binary(make_library(make_book, range(3)), chunk)
+    with open(base_lookup, "w", encoding="UTF-8") as f:
+        f.write("".join(f"{sim + 1},1,{10 * sim}\n" for sim in range(3)))
+    merge_lookup_binaries([chunk], base_lookup)
+
+    # optimizer rewrites the published csv, leaving a binary table with the old weights
+    optimized_lookup = str(publish_path / "lookUpTable_base_0.csv")
+    merge_lookup_binaries([chunk], optimized_lookup, str(lookup_path))
+    with open(optimized_lookup, "w", encoding="UTF-8") as f:
+        f.write("1,40,0\n2,30,10\n3,20,20\n")
+    os.utime(optimized_lookup, (0, 0))
+
+    # upload checks parse the csv, even though the binary table looks current
+    assert load_lookup_table(optimized_lookup, str(lookup_path))["weight"].tolist() == [1, 1, 1]
+    assert verify_lookup_format(optimized_lookup)[2] == 90
+
+    rebuild_lookup_binary(optimized_lookup, base_lookup, str(lookup_path))
+    table = load_lookup_table(optimized_lookup, str(lookup_path))
+    assert table["weight"].tolist() == [40, 30, 20]
+    assert table["base_win"].tolist() == [0.0, 0.1, 0.2]
+    # binary tables are never written to the publish folder
+    assert sorted(os.listdir(publish_path)) == ["lookUpTable_base_0.csv"]
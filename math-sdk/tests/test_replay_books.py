@@ -0,0 +1,70 @@
+"""Test two-phase simulation: stats-only books replayed from their seeds."""
+
+import os
+import pytest
+from src.state.run_sims import create_books, replay_books
+from src.write_data.book_index import BookReader
+from src.write_data.lookup_binary import load_lookup_table
+from utils.rgs_verification import compare_payout_values, verify_books_and_payout_mults, verify_lookup_format
+
+KEPT_IDS = [2, 5, 11]
+
+
+def test_replayed_books_match_full_simulation(sample_game):
+    config, gamestate = sample_game("0_0_lines")
+    create_books(gamestate, config, {"base": 20}, 10, 1, True, False)
+    reader = BookReader(config.publish_path, config.book_path)
+    expected = [reader.get_book("base", book_id) for book_id in KEPT_IDS]
+
+    create_books(gamestate, config, {"base": 20}, 10, 1, True, False, stats_only=True)
+    replay_books(gamestate, ["base"], 1, True, {"base": KEPT_IDS})
+    reader = BookReader(config.publish_path, config.book_path)
+    assert [reader.get_book("base", book_id) for book_id in KEPT_IDS] == expected
+
+
+def test_replay_raises_on_payout_mismatch(sample_game):
+    config, gamestate = sample_game("0_0_lines")
+    create_books(gamestate, config, {"base": 20}, 10, 1, True, False, stats_only=True)
+
+    # edit a first-phase payout, the csv is newer than its binary table so it is read instead
+    lookup_name = gamestate.output_files.get_final_lookup_name("base")
+    with open(lookup_name, "r", encoding="UTF-8") as f:
+        rows = [line.strip().split(",") for line in f if line.strip()]
+    rows[KEPT_IDS[0] - 1][2] = str(int(rows[KEPT_IDS[0] - 1][2]) + 10)
+    with open(lookup_name, "w", encoding="UTF-8") as f:
+        f.write("".join(",".join(row) + "\n" for row in rows))
+    binary_time = os.path.getmtime(os.path.splitext(lookup_name)[0] + ".npy")
+    os.utime(lookup_name, (binary_time + 1, binary_time + 1))
+
+    with pytest.raises(RuntimeError, match="Replayed payouts do not match"):
+        replay_books(gamestate, ["base"], 1, True, {"base": KEPT_IDS})
+
+
+def test_replayed_subset_passes_upload_checks(sample_game):
+    config, gamestate = sample_game("0_0_lines")
+    output_files = gamestate.output_files
+    create_books(gamestate, config, {"base": 20}, 10, 1, True, False, stats_only=True)
+
+    # zero the weight of every book not kept, as the optimizer would, the csv is read as it is newer than its binary
+    optimized_name = output_files.get_optimized_lookup_name("base")
+    with open(optimized_name, "r", encoding="UTF-8") as f:
+        rows = [line.strip().split(",") for line in f if line.strip()]
+    for row in rows:
+        if int(row[0]) not in KEPT_IDS:
+            row[1] = "0"
+    with open(optimized_name, "w", encoding="UTF-8") as f:
+        f.write("".join(",".join(row) + "\n" for row in rows))
+    binary_name = os.path.join(output_files.lookup_path, "lookUpTable_base_0.npy")
+    binary_time = os.path.getmtime(binary_name)
+    os.utime(optimized_name, (binary_time + 1, binary_time + 1))
+
+    replay_books(gamestate, ["base"], 1, True)
+    assert load_lookup_table(optimized_name, output_files.lookup_path)["id"].tolist() == KEPT_IDS
+    assert os.path.getmtime(binary_name) >= os.path.getmtime(optimized_name)
+
+    _, lut_payouts, _, _, _ = verify_lookup_format(optimized_name)
+    book_payouts, _ = verify_books_and_payout_mults(
+        output_files.get_final_book_name("base", True), output_files.book_path
+    )
+    assert len(book_payouts) == len(KEPT_IDS)
+    compare_payout_values(book_payouts, lut_payouts)
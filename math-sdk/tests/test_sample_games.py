@@ -0,0 +1,37 @@
+"""Test sample game simulations only depend on their seed and criteria, and how their events are recorded."""
+
+
+def run_payouts(gamestate, sims: list) -> dict:
+    for sim in sims:
+        gamestate.run_spin(sim)
+    return {book_id: book["payoutMultiplier"] for book_id, book in gamestate.library.items()}
+
+
+def test_cluster_payouts_independent_of_previous_sims(sample_game):
+    _, gamestate = sample_game("0_0_cluster")
+    gamestate.betmode, gamestate.criteria = "bonus", "freegame"
+    sims = list(range(8))
+    in_order = run_payouts(gamestate, sims)
+    gamestate.library = {}
+    assert run_payouts(gamestate, sims[::-1]) == in_order
+
+
+def test_recorded_values_keep_their_string_form(sample_game):
+    _, gamestate = sample_game("0_0_lines")
+    gamestate.reset_book()
+    for value in [2, 2.0, True, 2]:
+        gamestate.record({"kind": value, "symbol": "H1"})
+
+    recorded = [gamestate.descriptions[gamestate.temp_wins[index]] for index in range(0, len(gamestate.temp_wins), 2)]
+    kinds = [dict(description)["kind"] for description in recorded]
+    assert kinds == ["2", "2.0", "True", "2"]
+
+
+def test_recorded_unhashable_values(sample_game):
+    _, gamestate = sample_game("0_0_lines")
+    gamestate.reset_book()
+    for _ in range(2):
+        gamestate.record({"positions": [1, 2], "symbol": "H1"})
+
+    assert gamestate.temp_wins[0] == gamestate.temp_wins[2]
+    assert dict(gamestate.descriptions[gamestate.temp_wins[0]])["positions"] == "[1, 2]"
@@ -0,0 +1,41 @@
+"""Test compiled win-level lookups."""
+
+import pytest
+from src.config.config import Config
+from src.config.win_levels import WinLevelTable
+
+
+def linear_win_level(levels: dict, win_amount: float) -> int:
+    for idx, pair in levels.items():
+        if win_amount >= pair[0] and win_amount < pair[1]:
+            return idx
+    return None
+
+
+def test_matches_linear_scan():
+    config = Config()
+    wins = [0, 0.05, 0.1, 0.99, 1.0, 2.0, 14.99, 15.0, 99.9, 100.0, 4999.99, 5000.0, 1e9]
+    for key, levels in config.win_levels.items():
+        assert [config.get_win_level(win, key) for win in wins] == [linear_win_level(levels, win) for win in wins]
+        assert config.get_win_levels(wins, key).tolist() == [linear_win_level(levels, win) for win in wins]
+
+
+def test_missing_and_registered_levels():
+    config = Config()
+    with pytest.raises(RuntimeError):
+        config.get_win_level(-1.0, "standard")
+    with pytest.raises(RuntimeError):
+        config.get_win_levels([1.0, -1.0], "standard")
+
+    config.register_win_levels("bonus", {2: (10.0, 100.0), 1: (0.0, 10.0)})
+    assert config.get_win_levels([0.0, 9.99, 10.0, 50.0], "bonus").tolist() == [1, 1, 2, 2]
+    with pytest.raises(RuntimeError):
+        config.get_win_level(100.0, "bonus")
+
+    config.win_levels["bonus"] = {1: (0.0, 1.0), 2: (1.0, float("inf"))}
+    assert config.get_win_level(100.0, "bonus") == 2
+
+
+def test_overlapping_levels():
+    with pytest.raises(ValueError):
+        WinLevelTable({1: (0.0, 2.0), 2: (1.0, 5.0)})
@@ -0,0 +1,82 @@
+"""Test temporary force-record and event catalogue files."""
+
+import json
+from array import array
+import numpy as np
+from types import SimpleNamespace
+from src.state.books import Book
+from src.state.state import GeneralGameState
+from src.write_data.write_data import (
+    print_recorded_wins,
+    read_recorded_wins,
+    merge_sorted_ids,
+    write_event_catalogue,
+    write_library_events,
+)
+
+
+def test_force_record_round_trip(tmp_path):
+    descriptions = [
+        (("gametype", "basegame"), ("kind", "3"), ("symbol", "scatter")),
+        (("gametype", "freegame"), ("symbol", "H1")),
+        (("kind", "5"),),
+    ]
+    recorded_events = {
+        0: {"timesTriggered": 2, "bookIds": [4, 9]},
+        2: {"timesTriggered": 0, "bookIds": []},
+        1: {"timesTriggered": 1, "bookIds": [2**32 - 1]},
+    }
+    name = str(tmp_path / "force.bin")
+    print_recorded_wins(SimpleNamespace(recorded_events=recorded_events, descriptions=descriptions), name)
+
+    read_back = {key: (times, list(ids)) for key, times, ids in read_recorded_wins(name)}
+    assert list(read_back) == [descriptions[description_id] for description_id in recorded_events]
+    for description_id, details in recorded_events.items():
+        assert read_back[descriptions[description_id]] == (details["timesTriggered"], details["bookIds"])
+
+
+def test_merge_sorted_ids():
+    in_order = [array("I", [1, 4]), array("I", []), array("I", [4, 7, 9])]
+    assert merge_sorted_ids(in_order).tolist() == [1, 4, 4, 7, 9]
+    interleaved = [array("I", [2, 8, 11]), array("I", [1, 3, 12]), array("I", [5])]
+    assert merge_sorted_ids(interleaved).tolist() == [1, 2, 3, 5, 8, 11, 12]
+    assert merge_sorted_ids([array("I", [6])]).tolist() == [6]
+    rng = np.random.default_rng(3)
+    runs = [np.sort(rng.integers(0, 50, rng.integers(0, 20))).astype(np.uint32) for _ in range(7)]
+    merged = merge_sorted_ids([array("I", run.tobytes()) for run in runs])
+    assert merged.tolist() == sorted(np.concatenate(runs).tolist())
+
+
+def make_event_catalogue(books_events: list) -> dict:
+    """Event catalogue of a thread, built from the event types of each accepted book."""
+    gamestate = SimpleNamespace(event_catalogue={})
+    for book_id, events in enumerate(books_events):
+        gamestate.book = Book(book_id + 1, "0")
+        for event in events:
+            gamestate.book.add_event(event)
+        GeneralGameState.update_event_catalogue(gamestate)
+    return gamestate.event_catalogue
+
+
+def test_library_events_merge_catalogues(tmp_path):
+    first = make_event_catalogue(
+        [
+            [{"index": 0, "type": "reveal", "board": ["H1"]}, {"index": 1, "type": "winInfo", "totalWin": 10}],
+            [{"index": 0, "type": "reveal", "board": ["L1"]}],
+        ]
+    )
+    second = make_event_catalogue(
+        [[{"index": 0, "type": "winInfo", "totalWin": 20}, {"index": 1, "type": "freeSpinTrigger", "totalFs": 10}]]
+    )
+    file_list = [str(tmp_path / "events_base_0_0.json"), str(tmp_path / "events_base_1_0.json")]
+    write_event_catalogue(first, file_list[0])
+    write_event_catalogue(second, file_list[1])
+
+    write_library_events(SimpleNamespace(output_files=SimpleNamespace(config_path=str(tmp_path))), file_list, "base")
+    with open(tmp_path / "event_config_base.json", "r", encoding="UTF-8") as f:
+        library_events = json.load(f)
+
+    assert list(library_events) == ["reveal", "winInfo", "freeSpinTrigger"]
+    assert library_events["reveal"] == {"type": "reveal", "board": ["H1"]}
+    assert library_events["winInfo"] == {"type": "winInfo", "totalWin": 10}
+    assert library_events["freeSpinTrigger"] == {"type": "freeSpinTrigger", "totalFs": 10}
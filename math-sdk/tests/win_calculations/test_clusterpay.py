@@ -1,5 +1,6 @@
 """Test basic cluster-calculation functionality."""
 
+import random
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.cluster import Cluster
@@ -99,3 +100,26 @@ def test_basic_cluster(gamestate):
         clusters=clusters,
     )
     assert total_win == gamestate.config.paytable[(9, "H1")]
+
+
+def test_clusters_after_tumble(gamestate):
+    """Re-evaluating only the tumbled region must match a full board evaluation."""
+    rng = random.Random(7)
+    symbols = ["H1", "H2", "WM", "X"]
+    for _ in range(50):
+        for idx, _ in enumerate(gamestate.board):
+            for idy, _ in enumerate(gamestate.board[idx]):
+                gamestate.board[idx][idy] = gamestate.create_symbol(rng.choice(symbols))
+        clusters = Cluster.get_clusters(gamestate.board)
+
+        dirty_rows = [0] * len(gamestate.board)
+        for idx, reel in enumerate(gamestate.board):
+            exploding_rows = [idy for idy in range(len(reel)) if rng.random() < 0.2]
+            if len(exploding_rows) > 0:
+                dirty_rows[idx] = max(exploding_rows) + 1
+                kept = [sym for idy, sym in enumerate(reel) if idy not in exploding_rows]
+                new_syms = [gamestate.create_symbol(rng.choice(symbols)) for _ in exploding_rows]
+                gamestate.board[idx] = new_syms + kept
+
+        tumble_clusters = Cluster.get_clusters_after_tumble(gamestate.board, clusters, dirty_rows)
+        assert list(tumble_clusters.items()) == list(Cluster.get_clusters(gamestate.board).items())
@@ -0,0 +1,110 @@
+"""Test tumbled boards against a reference refill from the reelstrip."""
+
+import random
+import pytest
+from tests.win_calculations.game_test_config import GamestateTest
+from src.calculations.tumble import Tumble
+
+REELSTRIP = [
+    ["H1", "L1", "S", "H2", "L2", "M", "L1", "H1", "L2", "H2"],
+    ["L2", "H2", "H1", "S", "L1", "L1", "M", "H2", "H1", "L2", "S"],
+    ["S", "H1", "H1", "L1", "M", "L2", "H2", "L1", "H2"],
+    ["M", "L1", "H2", "H1", "L2", "S", "L1", "H1", "L2", "H2", "L1", "H1"],
+]
+
+
+class GameTumbleConfig:
+    """Testing game functions"""
+
+    def __init__(self, include_padding: bool):
+        self.game_id = "0_test_class"
+        self.num_reels = len(REELSTRIP)
+        self.num_rows = [3, 4, 4, 3]
+        self.include_padding = include_padding
+        self.paytable = {(3, "H1"): 1.0, (3, "H2"): 1.0, (3, "L1"): 0.5, (3, "L2"): 0.5}
+        self.special_symbols = {"scatter": ["S"], "multiplier": ["M"]}
+
+
+class TumbleGamestateTest(GamestateTest, Tumble):
+    """Test gamestate with tumble actions."""
+
+
+def create_seeded_gamestate(include_padding: bool, seed: int) -> TumbleGamestateTest:
+    random.seed(seed)
+    gamestate = TumbleGamestateTest(GameTumbleConfig(include_padding))
+    gamestate.create_symbol_map()
+    gamestate.assign_special_sym_function()
+    gamestate.reelstrip = REELSTRIP
+    gamestate.reel_positions = [random.randrange(len(strip)) for strip in REELSTRIP]
+    gamestate.board = [
+        [gamestate.create_symbol(strip[(pos + row) % len(strip)]) for row in range(rows)]
+        for strip, pos, rows in zip(REELSTRIP, gamestate.reel_positions, gamestate.config.num_rows)
+    ]
+    gamestate.top_symbols = [
+        gamestate.create_symbol(strip[(pos - 1) % len(strip)])
+        for strip, pos in zip(REELSTRIP, gamestate.reel_positions)
+    ]
+    gamestate.get_special_symbols_on_board()
+    return gamestate
+
+
+def reference_tumble(board: list, exploding: list, positions: list, top_names: list, include_padding: bool) -> tuple:
+    """Symbol names after a tumble, drawing one reelstrip position at a time and inserting at the top of the reel."""
+    new_board, new_symbols, new_positions, new_top = [], [], list(positions), list(top_names)
+    for reel, column in enumerate(board):
+        strip = REELSTRIP[reel]
+        column = list(column)
+        drawn = []
+        for i in range(sum(exploding[reel])):
+            new_positions[reel] = (new_positions[reel] - 1) % len(strip)
+            if i == 0 and include_padding:
+                column.insert(0, top_names[reel])
+            else:
+                column.insert(0, strip[new_positions[reel]])
+                drawn.insert(0, strip[new_positions[reel]])
+        remaining = [name for name, explode in zip(board[reel], exploding[reel]) if not explode]
+        new_board.append(column[: len(column) - len(board[reel])] + remaining)
+        if include_padding and sum(exploding[reel]) > 0:
+            new_top[reel] = strip[(new_positions[reel] - 1) % len(strip)]
+            drawn.insert(0, new_top[reel])
+        new_symbols.append(drawn)
+    return new_board, new_symbols, new_positions, new_top
+
+
+def names(symbols: list) -> list:
+    return [[sym.name for sym in column] for column in symbols]
+
+
+@pytest.mark.parametrize("include_padding", [True, False])
+def test_tumble_matches_reference_refill(include_padding):
+    for seed in range(20):
+        gamestate = create_seeded_gamestate(include_padding, seed)
+        for _ in range(3):
+            exploding = [[random.random() < 0.4 for _ in column] for column in gamestate.board]
+            for reel, column in enumerate(gamestate.board):
+                for row, sym in enumerate(column):
+                    if exploding[reel][row]:
+                        sym.assign_attribute({"explode": True})
+            expected = reference_tumble(
+                names(gamestate.board),
+                exploding,
+                gamestate.reel_positions,
+                [sym.name for sym in gamestate.top_symbols],
+                include_padding,
+            )
+
+            gamestate.tumble_board()
+            board, new_symbols, positions, top_names = expected
+            assert names(gamestate.board) == board
+            assert names(gamestate.new_symbols_from_tumble) == new_symbols
+            assert gamestate.reel_positions == positions
+            if include_padding:
+                assert [sym.name for sym in gamestate.top_symbols] == top_names
+
+            special_positions = {special: [] for special in gamestate.config.special_symbols}
+            for reel, column in enumerate(board):
+                for row, name in enumerate(column):
+                    for special, special_names in gamestate.config.special_symbols.items():
+                        if name in special_names:
+                            special_positions[special].append({"reel": reel, "row": row})
+            assert gamestate.special_syms_on_board == special_positions
@@ -0,0 +1,97 @@
+"""Test win-data memoization used for repeated boards."""
+
+import random
+from copy import deepcopy
+from src.wins.win_cache import WinCache
+from src.calculations.lines import Lines
+from src.calculations.scatter import Scatter
+
+
+def test_cache_eviction_order():
+    cache = WinCache(max_size=2)
+    cache.put(("a",), {"totalWin": 1, "wins": []})
+    cache.put(("b",), {"totalWin": 2, "wins": []})
+    assert cache.get(("a",))["totalWin"] == 1
+    cache.put(("c",), {"totalWin": 3, "wins": []})
+    # "b" is the least recently used entry
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",))["totalWin"] == 1
+    assert cache.get(("c",))["totalWin"] == 3
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_cached_data_is_independent():
+    cache = WinCache(max_size=10)
+    win_data = {"totalWin": 5, "wins": [{"symbol": "H1", "positions": [{"reel": 0, "row": 1}], "meta": {}}]}
+    cache.put(("a",), win_data)
+    win_data["wins"][0]["positions"][0]["row"] += 1
+
+    cached = cache.get(("a",))
+    assert cached["wins"][0]["positions"][0]["row"] == 1
+    cached["wins"].clear()
+    assert len(cache.get(("a",))["wins"]) == 1
+
+
+def draw_seeded_board(gamestate, seed: int) -> None:
+    random.seed(seed)
+    gamestate.reset_book()
+    gamestate.draw_board(emit_event=False)
+
+
+def get_exploding_positions(board) -> list:
+    return [
+        (reel, row)
+        for reel, column in enumerate(board)
+        for row, sym in enumerate(column)
+        if sym.check_attribute("explode")
+    ]
+
+
+def evaluate_scatter_through_cache(gamestate) -> dict:
+    return gamestate.cached_win_evaluation(Scatter.get_scatterpay_wins, explode_wins=True, global_multiplier=1)
+
+
+def find_winning_seed(gamestate, config) -> int:
+    for seed in range(200):
+        draw_seeded_board(gamestate, seed)
+        if Scatter.get_scatterpay_wins(config=config, board=deepcopy(gamestate.board))["totalWin"] > 0:
+            return seed
+
+
+def test_cached_lines_match_direct_evaluation(sample_game):
+    config, gamestate = sample_game("0_0_lines")
+    gamestate.win_cache = WinCache(max_size=10)
+    gamestate.betmode, gamestate.criteria = "base", "basegame"
+    for seed in range(20):
+        draw_seeded_board(gamestate, seed)
+        direct = Lines.get_lines(board=deepcopy(gamestate.board), config=config, global_multiplier=2)
+        assert gamestate.cached_win_evaluation(Lines.get_lines, global_multiplier=2) == direct
+        draw_seeded_board(gamestate, seed)
+        assert gamestate.cached_win_evaluation(Lines.get_lines, global_multiplier=2) == direct
+    assert (gamestate.win_cache.hits, gamestate.win_cache.misses) == (20, 20)
+
+
+def test_cached_scatter_wins_reapply_explode_and_skip_tumbled_boards(sample_game):
+    config, gamestate = sample_game("0_0_scatter")
+    gamestate.win_cache = WinCache(max_size=10)
+    gamestate.betmode, gamestate.criteria = "base", "basegame"
+    seed = find_winning_seed(gamestate, config)
+
+    draw_seeded_board(gamestate, seed)
+    direct_board = deepcopy(gamestate.board)
+    direct = Scatter.get_scatterpay_wins(config=config, board=direct_board, global_multiplier=1)
+    assert direct["totalWin"] > 0
+    assert evaluate_scatter_through_cache(gamestate) == direct
+
+    # the redrawn board has no exploding symbols until they are re-applied from the cached wins
+    draw_seeded_board(gamestate, seed)
+    assert get_exploding_positions(gamestate.board) == []
+    assert evaluate_scatter_through_cache(gamestate) == direct
+    assert gamestate.win_cache.hits == 1
+    assert get_exploding_positions(gamestate.board) == get_exploding_positions(direct_board)
+
+    gamestate.tumble_board()
+    assert gamestate.board_stops is None
+    direct = Scatter.get_scatterpay_wins(config=config, board=deepcopy(gamestate.board), global_multiplier=1)
+    assert evaluate_scatter_through_cache(gamestate) == direct
+    assert (gamestate.win_cache.hits, gamestate.win_cache.misses) == (1, 1)
@@ -3,10 +3,11 @@
 import os
 import sys
 import json
-import hashlib
 import warnings
 import threading
 from botocore.exceptions import NoCredentialsError
+from src.write_data.lookup_binary import read_lookup_csv
+from src.write_data.file_manifest import get_file_sha
 
 
 class check_files:
@@ -16,25 +17,16 @@ class check_files:
         self.game = game
 
     def get_lut_length(self, lut_base_path, file):
-        """Verify LUT item count matches book count."""
+        """Verify LUT item count matches book count, parsing the csv which is uploaded."""
         full_file = lut_base_path + file
-        csv = open(full_file, "r")
-        book_count = len(csv.readlines())
+        book_count = len(read_lookup_csv(full_file))
 
         return book_count
 
     def get_lut_sha(self, lut_base_path, target_file):
         """Compare hash of lookup tables."""
         file_to_hash = lut_base_path + target_file
-        with open(file_to_hash, "rb") as f:
-            sha256_file = hashlib.sha256()
-            while True:
-                data = f.read(65536)
-                if not data:
-                    break
-                sha256_file.update(data)
-
-        sha256_hexRep = sha256_file.hexdigest()
+        sha256_hexRep = get_file_sha(file_to_hash)
 
         return sha256_hexRep
 
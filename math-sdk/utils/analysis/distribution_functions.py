@@ -1,125 +1,48 @@
-from collections import defaultdict
 from math import sqrt
 import numpy as np
 
 
-def get_lookup_length(filepath: str) -> int:
-    """Get length of lookup table."""
-    return sum(1 for _ in open(filepath, "rb"))
-
-
-def make_win_distribution(filepath: str, normalize: bool = True) -> dict:
-    """Construct win-distribution with unique, ordered payouts."""
-    dist = defaultdict(float)
-    with open(filepath, "r", encoding="UTF-8") as f:
-        for line in f:
-            _, weight, payout = line.strip().split(",")
-            weight = int(weight)
-            payout = float(payout) / 100
-            dist[payout] += weight
-
-    # Sort by win amount
-    dist = dict(sorted(dist.items(), key=lambda x: x[0], reverse=False))
+def get_distribution_arrays(table: np.ndarray, normalize: bool = True) -> tuple:
+    """Unique payouts (sorted, as bet multiples) and their total (normalized) weights from a loaded lookup table."""
+    payouts, payout_index = np.unique(table["payout"], return_inverse=True)
+    weights = np.bincount(payout_index, weights=table["weight"], minlength=len(payouts))
     if normalize:
-        total_weight = sum(dist.values())
-        dist = {x: y / total_weight for x, y in dist.items()}
-
-    return dist
-
-
-def get_distribution_average(dist: dict) -> float:
-    """Return weighted average from ordered win distribution."""
-    return np.average(list(dist.keys()), weights=list(dist.values()))
-
-
-def get_distribution_moments(dist: dict, bet_cost: float) -> float:
-    """Given a (weighted) lookup-table, return standard deviation."""
-    av_win = get_distribution_average(dist)
-    total_weight = sum(list(dist.values()))
-
-    variance = 0.0
-    for pay, weight in dist.items():
-        variance += ((pay - av_win) ** 2) * (weight / total_weight)
-    norm_std_dev = sqrt(variance)
+        weights = weights / sum(weights.tolist())
+    return payouts / 100, weights
+
+
+def get_distribution_statistics(wins: np.ndarray, weights: np.ndarray, bet_cost: float) -> dict:
+    """
+    All win-distribution statistics from the arrays returned by get_distribution_arrays().
+    Sums are accumulated sequentially in payout order, so values do not depend on numpy's pairwise summation.
+    """
+    total_weight = sum(weights.tolist())
+    # python floats are used for the powers (libm pow()), numpy powers can differ in the last bit
+    deviations = (wins - np.average(wins, weights=weights)).tolist()
+    weight_list = weights.tolist()
+    norm_weights = (weights / total_weight).tolist()
+    square_terms = np.array([(deviation**2) * norm_weight for deviation, norm_weight in zip(deviations, norm_weights)])
+    cube_terms = np.array([(deviation**3) * weight for deviation, weight in zip(deviations, weight_list)])
+    fourth_terms = np.array([(deviation**4) * weight for deviation, weight in zip(deviations, weight_list)])
+    variance = float(np.cumsum(square_terms)[-1])
     standard_dev = sqrt(variance) / bet_cost
 
-    skewness, kurtosis = 0.0, 0.0
-    av_win = float(av_win)
-    for win, weight in dist.items():
-        skewness += ((win - av_win) ** 3) * weight
-        kurtosis += ((win - av_win) ** 4) * weight
-    skewness /= (standard_dev) ** 3
-    kurtosis /= (standard_dev) ** 4
-    kurtosis -= 3
-
-    return variance, norm_std_dev, skewness, kurtosis
-
-
-def get_distribution_median(dist: dict, total_weight=None) -> float:
-    """Return median of an ordered win-distribution."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    cumulative_weight = 0
-    for win, weight in dist.items():
-        cumulative_weight += weight
-        if cumulative_weight >= total_weight / 2:
-            return win
-    return 0
-
-
-def get_maxwin_hitrate(dist: dict, total_weight=None) -> float:
-    """Return frequency of max-win."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    max_win_prob = dist[max(list(dist.keys()))] / total_weight
-    return 1.0 / max_win_prob
-
-
-def get_prob_no_win(dist: dict, total_weight=None) -> float:
-    "Probability of 0x payout amount."
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-
-    if min(dist.keys()) == 0:
-        return dist[0]
-    return 0
-
-
-def prob_less_than_bet(dist: dict, bet_cost: float, total_weight=None):
-    """Probability of winning less than mode bet cost."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    cumulative_prob = 0
-    for win, weight in dist.items():
-        if win < bet_cost:
-            cumulative_prob += weight
-
-    return cumulative_prob / total_weight
-
-
-def non_zero_hitrate(dist: dict, total_weight=None):
-    """Calculate probability of"""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-
-    if min(dist.keys()) == 0:
-        return 1 / (1 - dist[0] / total_weight)
-    else:
-        return 1
-
-
-def calculate_rtp(dist: dict, bet_cost: float, total_weight: float = None) -> float:
-    """Get distribution RTP."""
-    if total_weight is not None:
-        total_weight = sum(list(dist.values()))
-    return float(np.dot(list(dist.keys()), list(dist.values()))) / total_weight / bet_cost
-
-
-def min_dist_difference(dist: dict):
-    """Minimum payout amount difference"""
-    wins = list(dist.keys())
-    diff = None
-    for i in range(len(wins) - 2):
-        if diff is None or (diff > abs(wins[i + 1]) - wins[i]):
-            diff = abs(wins[i + 1]) - wins[i]
-    return int(round(diff * 100))
+    cumulative_weights = np.cumsum(weights)
+    median_index = np.flatnonzero(cumulative_weights >= total_weight / 2)
+    has_zero = wins[0] == 0
+    min_diffs = np.abs(wins[1:-1]) - wins[:-2]
+
+    return {
+        "average": float(np.average(wins, weights=weights)),
+        "rtp": float(np.dot(wins, weights)) / total_weight / bet_cost,
+        "var": variance,
+        "std": sqrt(variance),
+        "skew": float(np.cumsum(cube_terms)[-1]) / standard_dev**3,
+        "excess_kurtosis": float(np.cumsum(fourth_terms)[-1]) / standard_dev**4 - 3,
+        "median": float(wins[median_index[0]]) if len(median_index) > 0 else 0,
+        "hr_max": 1.0 / (float(weights[-1]) / total_weight),
+        "non_zero_hr": 1 / (1 - float(weights[0]) / total_weight) if has_zero else 1,
+        "prob_nil": float(weights[0]) if has_zero else 0,
+        "prob_less_bet": float(np.cumsum(weights[wins < bet_cost])[-1]) / total_weight if wins[0] < bet_cost else 0.0,
+        "min_diff": int(round(float(min_diffs.min()) * 100)) if len(min_diffs) > 0 else None,
+    }
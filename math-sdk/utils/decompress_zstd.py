@@ -1,11 +1,14 @@
 """Test file decompression and validate data structure is valid JSON."""
 
 import json
-import zstandard as zstd
+from src.write_data.book_index import get_book_decompressor
 
 
-def decompress(input_path: str, save_output: bool = False):
-    """Decompress zst files assuming newline char to indicate different sims."""
+def decompress(input_path: str, save_output: bool = False, index_path: str = None):
+    """
+    Decompress zst files assuming newline char to indicate different sims.
+    index_path is the folder holding the books dictionary (library/books/), next to the books if not given.
+    """
 
     def json_validate(json_blob):
         """Validate each uncompressed result to ensure valid json format."""
@@ -15,9 +18,10 @@ def decompress(input_path: str, save_output: bool = False):
             print("Invalid JSON!")
             raise RuntimeError("Invalid JSON")
 
-    decompressor = zstd.ZstdDecompressor()
+    decompressor = get_book_decompressor(input_path, index_path)
     with open(input_path, "rb") as f:
-        with decompressor.stream_reader(f) as reader:
+        # books are written as several independent frames, see src/write_data/book_index.py
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
             decompressed_data = reader.read().decode("utf-8")
 
     all_sims = decompressed_data.split("\n")
@@ -1,100 +1,99 @@
 from src.config.paths import PATH_TO_GAMES
 from collections import defaultdict
 import os
+import numpy as np
+from src.write_data.lookup_binary import load_lookup_table
+from src.write_data.analytics_store import AnalyticsStore, read_segmented_table
 
 
-def get_unoptimized_hits(lut_path, all_modes, win_ranges):
-    """Calculate hit-rates of simulation output lookup table."""
-    all_modes_base_dist = defaultdict(lambda: defaultdict(int))
-    total_mode_count = {}
-    for mode in all_modes:
-        base_lut_file = os.path.join(lut_path, "lookUpTable_" + str(mode) + ".csv")
-        lut = open(base_lut_file, "r", encoding="UTF-8")
-        counter = 0
-        for line in lut:
-            _, _, payout = line.strip().split(",")
-            all_modes_base_dist[mode][float(round(int(payout) / 100, 2))] += 1
-            counter += 1
-
-        total_mode_count[mode] = counter
+def get_mode_range_hits(lut: np.ndarray, win_ranges: list) -> tuple:
+    """Hit-rates and simulation counts of each win range from a single mode's (unoptimized) lookup table."""
+    range_hits = {wr: 0 for wr in win_ranges}
+    payouts, counts = np.unique(lut["payout"], return_counts=True)
+    base_dist = defaultdict(int)
+    for payout, count in zip(payouts.tolist(), counts.tolist()):
+        base_dist[float(round(payout / 100, 2))] += count
 
     # Segregate to win-ranges
-    all_modes_range_hits = {}
-    for mode in all_modes:
-        all_modes_range_hits[mode] = {}
+    for payout, count in base_dist.items():
         for wr in win_ranges:
-            all_modes_range_hits[mode][wr] = 0
+            if payout >= wr[0] and payout < wr[1]:
+                range_hits[wr] += count
+                break
+
+    hit_rates = {}
+    for wr in win_ranges:
+        try:
+            hit_rates[wr] = round(1 / (range_hits[wr] / len(lut)), 3)
+        except ZeroDivisionError:
+            hit_rates[wr] = 0
+    return hit_rates, range_hits
 
-        for payout in list(all_modes_base_dist[mode].keys()):
-            for wr in win_ranges:
-                if payout >= wr[0] and payout < wr[1]:
-                    all_modes_range_hits[mode][wr] += all_modes_base_dist[mode][payout]
-                    break
 
-    all_modes_hit_rates = {}
+def get_unoptimized_hits(lut_path, all_modes, win_ranges):
+    """Calculate hit-rates of simulation output lookup table."""
+    all_modes_hit_rates, all_modes_range_hits = {}, {}
     for mode in all_modes:
-        all_modes_hit_rates[mode] = {}
-        for wr in win_ranges:
-            try:
-                all_modes_hit_rates[mode][wr] = round(
-                    1 / (all_modes_range_hits[mode][wr] / total_mode_count[mode]), 3
-                )
-            except ZeroDivisionError:
-                all_modes_hit_rates[mode][wr] = 0
+        base_lut_file = os.path.join(lut_path, "lookUpTable_" + str(mode) + ".csv")
+        all_modes_hit_rates[mode], all_modes_range_hits[mode] = get_mode_range_hits(
+            load_lookup_table(base_lut_file), win_ranges
+        )
     return all_modes_hit_rates, all_modes_range_hits
 
 
-def make_split_win_distribution(lut_file, split_file, all_modes, base_mode_name="basegame"):
-    """Separate probability information for different game-types."""
-    combined_distributions = defaultdict(lambda: defaultdict(float))
-    all_modes.append("cumulative")
-    split = open(split_file, "r", encoding="UTF-8")
-    lut = open(lut_file, "r", encoding="UTF-8")
-
-    all_base, all_free, all_fences = [], [], []
-    for line in split:
-        idx, idv_fence, base_win, free_win = line.strip().split(",")
-        all_base.append(float(base_win))
-        all_free.append(float(free_win))
-        if str(idv_fence) == "0":
-            idv_fence = base_mode_name
-        all_fences.append(str(idv_fence))
-
-    all_weights = []
-    for line in lut:
-        _, weight, _ = line.strip().split(",")
-        all_weights.append(int(weight))
-    total_lut_weight = int(sum(all_weights))
-
-    for idx, _ in enumerate(all_weights):
-        if base_mode_name in all_modes:
-            combined_distributions[base_mode_name][all_base[idx]] += all_weights[idx]
-
-        if all_fences[idx] != base_mode_name and all_fences[idx] != "wincap":
-            combined_distributions[all_fences[idx]][all_free[idx]] += all_weights[idx]
-        else:
-            for mode in all_modes:
-                if mode != base_mode_name and mode != "cumulative":
-                    combined_distributions[mode][all_free[idx]] += all_weights[idx]
-            if (all_free[idx] != 0) and (all_fences[idx] == base_mode_name):
-                raise ValueError("Non-Zero FreeGame win in baseGame Fence.")
+def load_segmented_table(split_file: str, base_mode_name: str = "basegame") -> tuple:
+    """Criteria (fence), basegame and freegame win columns of a segmented lookup table, read in a single pass."""
+    _, fences, base_wins, free_wins = read_segmented_table(split_file)
+    return np.where(fences == "0", base_mode_name, fences), base_wins, free_wins
+
 
-        # Construct cumulative hit-rate data
-        combined_distributions["cumulative"][all_base[idx] + all_free[idx]] += all_weights[idx]
+def split_win_distributions(weights, fences, base_wins, free_wins, all_modes, base_mode_name="basegame") -> dict:
+    """
+    Sorted {win: total weight} distributions of each game-type from lookup table columns.
+    Weights are accumulated in simulation order, matching a row by row summation.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    fence_is_base = (fences == base_mode_name) | (fences == "wincap")
+    if np.any((free_wins != 0) & (fences == base_mode_name)):
+        raise ValueError("Non-Zero FreeGame win in baseGame Fence.")
 
-    # Sort all dictionaries by payout
-    all_sorted_payouts = {}
     all_sorted_distributions = {}
     for mode in all_modes:
-        all_sorted_payouts[mode] = sorted(list(combined_distributions[mode].keys()))
-        all_sorted_distributions[mode] = {}
+        if mode == base_mode_name:
+            wins, mode_weights = base_wins, weights
+        elif mode == "cumulative":
+            wins, mode_weights = base_wins + free_wins, weights
+        else:
+            rows = fence_is_base | (fences == mode)
+            wins, mode_weights = free_wins[rows], weights[rows]
+        unique_wins, win_index = np.unique(wins, return_inverse=True)
+        totals = np.bincount(win_index.ravel(), weights=mode_weights, minlength=len(unique_wins))
+        all_sorted_distributions[mode] = dict(zip(unique_wins.tolist(), totals.tolist()))
+    return all_sorted_distributions
 
-    for mode in all_modes:
-        mode_pays = list(all_sorted_payouts[mode])
-        for pay in mode_pays:
-            all_sorted_distributions[mode][pay] = combined_distributions[mode][pay]
 
-    return all_sorted_distributions, total_lut_weight
+def make_split_win_distribution(lut_file, split_file, all_modes, base_mode_name="basegame"):
+    """Separate probability information for different game-types."""
+    all_modes.append("cumulative")
+    fences, base_wins, free_wins = load_segmented_table(split_file, base_mode_name)
+    weights = load_lookup_table(lut_file)["weight"]
+    all_sorted_distributions = split_win_distributions(
+        weights, fences, base_wins, free_wins, all_modes, base_mode_name
+    )
+    return all_sorted_distributions, int(weights.sum(dtype=np.uint64))
+
+
+def make_store_split_win_distribution(store: AnalyticsStore, all_modes, base_mode_name="basegame"):
+    """make_split_win_distribution() using the weight, criteria and pay-split columns of an analytics store."""
+    all_sorted_distributions = split_win_distributions(
+        store.weight,
+        store.get_criteria(base_mode_name),
+        store.base_win,
+        store.free_win,
+        all_modes + ["cumulative"],
+        base_mode_name,
+    )
+    return all_sorted_distributions, store.total_weight()
 
 
 def return_hit_rates(all_mode_distributions, total_weight, win_ranges, mode_cost):
@@ -1,53 +1,32 @@
 """Analyze symbol hit-rates"""
 
-import json
 import os
-from src.config.paths import PATH_TO_GAMES
+import numpy as np
+from src.config.output_filenames import OutputFiles
+from src.write_data.analytics_store import AnalyticsStore, load_analytics_store
 
 
 class HitRateCalculations:
     """Calculate hit-rates of symbol and search key combinations."""
 
-    def __init__(self, game_id, mode, mode_cost):
+    def __init__(self, game_id, mode, mode_cost, store: AnalyticsStore):
         self.game_id = game_id
         self.mode = mode
         self.cost = mode_cost
-        self.initialize_file()
+        self.initialize_file(store)
 
-    def initialize_file(self) -> None:
-        """Initialize force files and lookup tables."""
-        force_file = os.path.join(
-            PATH_TO_GAMES, self.game_id, "library", "forces", f"force_record_{self.mode}.json"
-        )
-        lut_file = os.path.join(
-            PATH_TO_GAMES, self.game_id, "library", "publish_files", f"lookUpTable_{self.mode}_0.csv"
-        )
-        with open(force_file, "r", encoding="UTF-8") as f:
-            file_dict = json.load(f)
-            all_keys = [d.keys() for d in file_dict]
-        f.close()
-
-        lut_ids = []
-        weights = []
-        payouts = []
-        with open(lut_file, "r", encoding="UTF-8") as f:
-            for line in f:
-                lut_ids.append(int(line.strip().split(",")[0]))
-                weights.append(int(line.strip().split(",")[1]))
-                payouts.append(float(line.strip().split(",")[2]))
-        f.close()
-
-        self.weights = weights
-        self.total_weight = sum(self.weights)
-        self.payouts = payouts
-        self.force_dict = file_dict
-        self.all_keys = all_keys
+    def initialize_file(self, store: AnalyticsStore) -> None:
+        """Use the analytics store (optimized lookup table and force index) of the mode."""
+        self.store = store
+        self.weights = store.weight
+        self.total_weight = store.total_weight()
+        self.payouts = store.payout.astype(np.float64)
+        self.force_index = store.force_index
+        self.all_keys = store.force_index.keys
 
     def get_hit_rates(self, unique_ids: list) -> float:
         """Get hit-rates using inverse probabilities from optimized lookup tables."""
-        cumulative_weight = 0
-        for idx in unique_ids:
-            cumulative_weight += self.weights[idx - 1]
+        cumulative_weight = int(self.weights[self.store.get_rows(unique_ids)].sum())
 
         prob = cumulative_weight / self.total_weight
         try:
@@ -57,44 +36,22 @@ class HitRateCalculations:
 
     def get_av_wins(self, unique_ids: list) -> float:
         """Return average win amount for a specified list of simulation ids."""
-        search_key_tot_weight = 0
+        rows = self.store.get_rows(unique_ids)
         # find out the total payout and weights from the force keys subset of the lookup table
-        for id in unique_ids:
-            search_key_tot_weight += self.weights[id - 1]
-        average_win = 0
-        # multiply each win in the subset of lookup table by the ratio of its weight to normalize the avg payout
-        for id in unique_ids:
-            norm_payout = self.payouts[id - 1] * (self.weights[id - 1] / search_key_tot_weight)
-            average_win += norm_payout
-        try:
-            return average_win
-        except ZeroDivisionError:
+        search_key_tot_weight = int(self.weights[rows].sum())
+        if search_key_tot_weight == 0:
             return 0
+        # multiply each win in the subset of lookup table by the ratio of its weight to normalize the avg payout
+        # accumulate sequentially in float64, matching a row by row summation
+        return float(np.cumsum(self.payouts[rows] * (self.weights[rows] / search_key_tot_weight))[-1])
 
     def get_sim_count(self, search_key: dict) -> int:
         """Get raw sim count with partial or complete matches to force file keys."""
-        search_key_count = 0
-        for key in self.force_dict:
-            transform_dict = {}
-            for i in key["search"]:
-                transform_dict[i["name"]] = i["value"]
-            if all(transform_dict.get(x) == y for x, y in search_key.items()):
-                search_key_count += key["timesTriggered"]
-        return search_key_count
+        return self.force_index.get_times_triggered(search_key)
 
     def return_valid_ids(self, search_key) -> list:
         """Extract all ids with a partial match to search conditions."""
-        valid_ids = []
-        for item in self.force_dict:
-            transform_dict = {}
-            for i in item["search"]:
-                transform_dict[i["name"]] = str(i["value"])
-
-            if all(transform_dict.get(k) == v for k, v in search_key.items()):
-                validIDs = item["bookIds"]
-                valid_ids.extend(validIDs)
-
-        return valid_ids
+        return self.force_index.entry_ids(self.force_index.match_entries(search_key)).tolist()
 
 
 def construct_symbol_keys(config) -> list:
@@ -106,30 +63,38 @@ def construct_symbol_keys(config) -> list:
     return search_keys
 
 
+def analyse_mode_search_keys(game_object: HitRateCalculations, search_keys: list[dict]) -> tuple:
+    """Hit-rate, average win and simulation count of each search key within a single mode."""
+    hr_summary, av_win_summary, sim_count_summary = {}, {}, {}
+    for search_key in search_keys:
+        valid_key_ids = game_object.return_valid_ids(search_key)
+        hr_summary[str(search_key)] = game_object.get_hit_rates(valid_key_ids)
+        av_win_summary[str(search_key)] = game_object.get_av_wins(valid_key_ids)
+        sim_count_summary[str(search_key)] = game_object.get_sim_count(search_key)
+    return hr_summary, av_win_summary, sim_count_summary
+
+
 def analyse_search_keys(config, modes_to_analyse: list, search_keys: list[dict]) -> type:
     """Extract win information from search keys."""
     hr_summary, av_win_summary, sim_count_summary = {}, {}, {}
+    output_files = OutputFiles(config)
     for mode in modes_to_analyse:
         for bm in config.bet_modes:
             if bm.get_name() == mode:
                 cost = bm._cost
                 break
-        GameObject = HitRateCalculations(config.game_id, mode, mode_cost=cost)
-        hr_summary[mode], av_win_summary[mode], sim_count_summary[mode] = {}, {}, {}
-        for search_key in search_keys:
-            valid_key_ids = GameObject.return_valid_ids(search_key)
-            hr = GameObject.get_hit_rates(valid_key_ids)
-            avg_win = GameObject.get_av_wins(valid_key_ids)
-            key_instances = GameObject.get_sim_count(search_key)
-            hr_summary[mode][str(search_key)] = hr
-            av_win_summary[mode][str(search_key)] = avg_win
-            sim_count_summary[mode][str(search_key)] = key_instances
+        GameObject = HitRateCalculations(
+            config.game_id, mode, mode_cost=cost, store=load_analytics_store(output_files, mode)
+        )
+        hr_summary[mode], av_win_summary[mode], sim_count_summary[mode] = analyse_mode_search_keys(
+            GameObject, search_keys
+        )
 
     return hr_summary, av_win_summary, sim_count_summary
 
 
-def construct_symbol_probabilities(config, modes_to_analyse: list) -> type:
-    """Find hit-rates of all symbol combinations."""
+def check_force_files(config, modes_to_analyse: list) -> None:
+    """Raise if the force-record file of any mode is missing."""
     check_file = []
     for mode in modes_to_analyse:
         force_file = os.path.join(config.library_path, "forces", f"force_record_{mode}.json")
@@ -137,6 +102,11 @@ def construct_symbol_probabilities(config, modes_to_analyse: list) -> type:
     if not all(check_file):
         raise RuntimeError("Force File Does Not Exist.")
 
+
+def construct_symbol_probabilities(config, modes_to_analyse: list) -> type:
+    """Find hit-rates of all symbol combinations."""
+    check_force_files(config, modes_to_analyse)
+
     symbol_search_keys = construct_symbol_keys(config)
     hr_summary, av_win_summary, sim_count_summary = analyse_search_keys(
         config, modes_to_analyse, symbol_search_keys
@@ -146,12 +116,7 @@ def construct_symbol_probabilities(config, modes_to_analyse: list) -> type:
 
 def construct_custom_key_probabilities(config, modes_to_analyse, custom_search) -> type:
     """Analyze win information from user defined search keys."""
-    check_file = []
-    for mode in modes_to_analyse:
-        force_file = os.path.join(config.library_path, "forces", f"force_record_{mode}.json")
-        check_file.append(os.path.isfile(force_file))
-    if not all(check_file):
-        raise RuntimeError("Force File Does Not Exist.")
+    check_force_files(config, modes_to_analyse)
 
     hr_summary, av_win_summary, sim_count_summary = analyse_search_keys(config, modes_to_analyse, custom_search)
 
@@ -42,15 +42,19 @@ class PrintJSON:
 
 
 class PrintXLSX:
-    """Print summary Excel file."""
+    """
+    Print summary Excel file.
+    The workbook is opened in constant_memory mode, so each mode sheet is written strictly in row order.
+    """
 
     def __init__(self, game_info):
         self.game_info = game_info
         self.global_ranges = list(self.game_info.win_ranges)
         self.setup_xlsx()
         for mode in self.game_info.all_modes:
+            self.hit_rate_sheet = self.workbook.add_worksheet(str(mode))
             self.write_mode_probs(str(mode), 0, 0)
-            self.write_range_hit_counts(str(mode), 0, self.top_row_col_end)
+            self.write_symbol_info(str(mode), len(self.global_ranges) + 5, 0)
             self.write_custom_key_info(str(mode), self.last_row_end + 2)
         self.workbook.close()
 
@@ -62,47 +66,43 @@ class PrintXLSX:
             "library",
             f"{self.game_info.game_id}_full_statistics.xlsx",
         )
-        self.workbook = xlsxwriter.Workbook(self.stat_file_name)
+        # rows are flushed to disk once a later row is written, so memory use does not grow with the sheet size
+        self.workbook = xlsxwriter.Workbook(self.stat_file_name, {"constant_memory": True})
 
     def write_mode_probs(self, mode, x0, y0):
-        """Write hit-rate information within its own Excel Worksheet."""
-        # Main info: rtp-allocation and hit-rates
-        self.hit_rate_sheet = self.workbook.add_worksheet(str(mode))
-        headers = ["Win Ranges", "Hit Rates", "RTP Allocation"]
-        self.hit_rate_sheet.write_row(0, 0, headers)
-        hr_dict = self.game_info.mode_hit_rate_info[mode]["all_gameType_hits"]["cumulative"]
-        rtp_dict = self.game_info.mode_hit_rate_info[mode]["all_gameType_rtp"]["cumulative"]
-        for idx, win_range in enumerate(self.global_ranges):
-            self.hit_rate_sheet.write(x0 + idx + 1, y0, str(win_range))
-            self.hit_rate_sheet.write(x0 + idx + 1, y0 + 1, hr_dict[win_range])
-            self.hit_rate_sheet.write(
-                x0 + idx + 1, y0 + 2, list(rtp_dict.values())[idx])
-
-        # Hit-rate table by game-mode
-        game_headers = list(
-            self.game_info.mode_hit_rate_info[mode]["all_gameType_rtp"].keys())
-        game_headers_reduced = game_headers[:-1]
-        game_col_start = y0 + 5
-        self.hit_rate_sheet.write_row(
-            x0, game_col_start + 1, game_headers_reduced)
-
+        """Write win-range hit-rates, rtp-allocation, game-type hit-rates and range sim counts, one row at a time."""
         hr_dict = self.game_info.mode_hit_rate_info[mode]["all_gameType_hits"]
         rtp_dict = self.game_info.mode_hit_rate_info[mode]["all_gameType_rtp"]
+        cumulative_rtps = list(rtp_dict["cumulative"].values())
+        game_headers_reduced = list(rtp_dict.keys())[:-1]
+        game_col_start = y0 + 5
+        self.top_row_col_end = game_col_start + 3 + len(game_headers_reduced)
 
+        self.hit_rate_sheet.write_row(x0, y0, ["Win Ranges", "Hit Rates", "RTP Allocation"])
+        self.hit_rate_sheet.write_row(x0, game_col_start + 1, game_headers_reduced)
+        self.write_range_hit_counts(mode, x0, self.top_row_col_end, header=True)
         for idx, win_range in enumerate(self.global_ranges):
-            self.hit_rate_sheet.write(
-                x0 + idx + 1, game_col_start, str(win_range))
+            row = x0 + idx + 1
+            self.hit_rate_sheet.write(row, y0, str(win_range))
+            self.hit_rate_sheet.write(row, y0 + 1, hr_dict["cumulative"][win_range])
+            self.hit_rate_sheet.write(row, y0 + 2, cumulative_rtps[idx])
+            # Hit-rate table by game-mode
+            self.hit_rate_sheet.write(row, game_col_start, str(win_range))
             for idy, game_type in enumerate(game_headers_reduced):
-                # print(hr_dict[game_type][list(self.global_ranges)[idx]])
-                self.hit_rate_sheet.write(
-                    x0 + idx + 1, game_col_start + 1 +
-                    idy, str(hr_dict[game_type][list(self.global_ranges)[idx]])
-                )
-
-        # Write symbol hit-rate table
-        symRow = len(self.global_ranges) + 5
-        symCol = 0
-        self.top_row_col_end = game_col_start + 4 + idy
+                self.hit_rate_sheet.write(row, game_col_start + 1 + idy, str(hr_dict[game_type][win_range]))
+            self.write_range_hit_counts(mode, x0, self.top_row_col_end, index=idx)
+
+    def write_range_hit_counts(self, mode, x0, y0, header=False, index=None):
+        """Write the header row, or the row of a single win-range, of the simulation count table."""
+        range_hit_counts = self.game_info.mode_hit_counts[mode]
+        if header:
+            self.hit_rate_sheet.write_row(x0, y0, ["Win Ranges", "SIM COUNTS"])
+        elif index < len(range_hit_counts):
+            key = list(range_hit_counts.keys())[index]
+            self.hit_rate_sheet.write_row(x0 + 1 + index, y0, [str(key), range_hit_counts[key]])
+
+    def write_symbol_info(self, mode, symRow, symCol):
+        """Write symbol hit-rate, sim count and average win tables side by side, one row at a time."""
         sym_mode_hit_rate = self.game_info.hr_summary[mode]
         sym_count_hit_rate = self.game_info.sim_count_summary[mode]
         sym_avg_win = self.game_info.av_win_summary[mode]
@@ -116,18 +116,9 @@ class PrintXLSX:
             if temp_kind not in kinds:
                 kinds.append(temp_kind)
 
-        freq_dict = {}
-        count_dict = {}
-        av_dict = {}
-        for sym in symbols:
-            freq_dict[sym] = {}
-            count_dict[sym] = {}
-            av_dict[sym] = {}
-            for kind in kinds:
-                freq_dict[sym][kind] = 0
-                count_dict[sym][kind] = 0
-                av_dict[sym][kind] = 0
-
+        freq_dict = {sym: {kind: 0 for kind in kinds} for sym in symbols}
+        count_dict = {sym: {kind: 0 for kind in kinds} for sym in symbols}
+        av_dict = {sym: {kind: 0 for kind in kinds} for sym in symbols}
         for key in list(sym_mode_hit_rate.keys()):
             temp_sym = eval(key)["symbol"]
             temp_kind = eval(key)["kind"]
@@ -135,61 +126,20 @@ class PrintXLSX:
             count_dict[temp_sym][temp_kind] = int(sym_count_hit_rate[key])
             av_dict[temp_sym][temp_kind] = round(sym_avg_win[key], 1)
 
-        # Symbol combination hit-rates
-        self.hit_rate_sheet.write(symRow - 1, symCol, str("HIT RATES"))
-        for idSym, sym in enumerate(symbols):
-            self.hit_rate_sheet.write(symRow + idSym + 1, symCol, str(sym))
-        for idKind, kind in enumerate(kinds):
-            self.hit_rate_sheet.write(symRow, symCol + 1 + idKind, kind)
-            for idSym, sym in enumerate(symbols):
-                self.hit_rate_sheet.write(
-                    symRow + idSym + 1, symCol + idKind + 1, freq_dict[sym][kind])
-
-        self.last_row_end = symRow + idSym + 1
-        self.last_col_end = symCol + idKind + 4
-
-        # Write number valid sim counts
-        self.hit_rate_sheet.write(
-            symRow - 1, symCol + self.last_col_end, str("SIM COUNTS"))
+        # Hit-rates, sim counts and average wins of each symbol combination
+        block_width = len(kinds) + 3
+        tables = [("HIT RATES", freq_dict), ("SIM COUNTS", count_dict), ("AVG WINS", av_dict)]
+        for block, (title, _) in enumerate(tables):
+            self.hit_rate_sheet.write(symRow - 1, symCol + block * block_width, str(title))
+        for block in range(len(tables)):
+            self.hit_rate_sheet.write_row(symRow, symCol + 1 + block * block_width, kinds)
         for idSym, sym in enumerate(symbols):
-            self.hit_rate_sheet.write(
-                symRow + idSym + 1, symCol + self.last_col_end, str(sym))
-        for idKind, kind in enumerate(kinds):
-            self.hit_rate_sheet.write(
-                symRow, symCol + 1 + idKind + self.last_col_end, kind)
-            for idSym, sym in enumerate(symbols):
-                self.hit_rate_sheet.write(
-                    symRow + idSym + 1, symCol + idKind + 1 +
-                    self.last_col_end, count_dict[sym][kind]
-                )
-
-        self.last_col_end += symCol + idKind + 4
-        # Write Avg Win for valid symbol combination
-        self.hit_rate_sheet.write(
-            symRow - 1, symCol + self.last_col_end, str("AVG WINS"))
-        for idSym, sym in enumerate(symbols):
-            self.hit_rate_sheet.write(
-                symRow + idSym + 1, symCol + self.last_col_end, str(sym))
-        for idKind, kind in enumerate(kinds):
-            self.hit_rate_sheet.write(
-                symRow, symCol + 1 + idKind + self.last_col_end, kind)
-            for idSym, sym in enumerate(symbols):
-                self.hit_rate_sheet.write(
-                    symRow + idSym + 1, symCol + idKind + 1 +
-                    self.last_col_end, av_dict[sym][kind]
-                )
-
-        self.last_row_end = symRow + idSym + 4
-
-    def write_range_hit_counts(self, mode, x0, y0):
-        """Write simulation counts to Excel sheet."""
-        range_hit_counts = self.game_info.mode_hit_counts
-        self.hit_rate_sheet.write(x0, y0, "Win Ranges")
-        self.hit_rate_sheet.write(x0, y0 + 1, "SIM COUNTS")
-        for idx, key in enumerate(list(range_hit_counts[mode].keys())):
-            self.hit_rate_sheet.write(x0 + idx + 1, y0, str(key))
-            self.hit_rate_sheet.write(
-                x0 + 1 + idx, y0 + 1, range_hit_counts[mode][key])
+            for block, (_, values) in enumerate(tables):
+                col = symCol + block * block_width
+                self.hit_rate_sheet.write(symRow + idSym + 1, col, str(sym))
+                self.hit_rate_sheet.write_row(symRow + idSym + 1, col + 1, [values[sym][kind] for kind in kinds])
+
+        self.last_row_end = symRow + len(symbols) + 3
 
     def write_custom_key_info(self, mode, row_start):
         """Write summary win information for user-defined search keys."""
@@ -201,10 +151,6 @@ class PrintXLSX:
         self.hit_rate_sheet.write(row_start, 0, str("CUSTOM"))
         self.hit_rate_sheet.write_row(row_start + 1, 1, ["HR", "COUNT", "AVG"])
         for idx, key in enumerate(custom_keys):
-            self.hit_rate_sheet.write(row_start + 2 + idx, 0, str(key))
-            self.hit_rate_sheet.write(
-                row_start + 2 + idx, 1, str(custom_hr[key]))
-            self.hit_rate_sheet.write(
-                row_start + 2 + idx, 2, str(custom_count[key]))
-            self.hit_rate_sheet.write(
-                row_start + 2 + idx, 3, str(custom_avg[key]))
+            self.hit_rate_sheet.write_row(
+                row_start + 2 + idx, 0, [str(key), str(custom_hr[key]), str(custom_count[key]), str(custom_avg[key])]
+            )
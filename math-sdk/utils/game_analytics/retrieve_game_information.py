@@ -2,14 +2,24 @@ import json
 import importlib
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 
+from src.write_data.lookup_binary import load_lookup_table
+from src.write_data.analytics_store import load_analytics_store
 from .get_pay_splits import (
-    return_all_filepaths,
-    make_split_win_distribution,
+    make_store_split_win_distribution,
     return_hit_rates,
     get_unoptimized_hits,
+    get_mode_range_hits,
+)
+from .get_symbol_hits import (
+    HitRateCalculations,
+    construct_symbol_probabilities,
+    construct_custom_key_probabilities,
+    construct_symbol_keys,
+    analyse_mode_search_keys,
+    check_force_files,
 )
-from .get_symbol_hits import construct_symbol_probabilities, construct_custom_key_probabilities
 
 
 def get_config_class(game_id):
@@ -22,15 +32,47 @@ def get_config_class(game_id):
     return config_class()
 
 
+def analyse_mode(task: dict) -> dict:
+    """
+    All PAR-sheet metrics of a single mode, run within its own worker process.
+    The analytics store of the mode (optimized lookup, segmented table and force index) is loaded once.
+    """
+    mode, win_ranges = task["mode"], task["win_ranges"]
+    store = load_analytics_store(task["output_files"], mode)
+    results = {}
+    if task["sub_modes"] is not None:
+        distributions, total_weight = make_store_split_win_distribution(store, task["sub_modes"], "basegame")
+        sub_mode_hits, sub_mode_probs, sub_mode_rtp_allocation = return_hit_rates(
+            distributions, total_weight, win_ranges, task["cost"]
+        )
+        results["split_hit_rates"] = {
+            "all_gameType_hits": sub_mode_hits,
+            "all_gameType_probs": sub_mode_probs,
+            "all_gameType_rtp": sub_mode_rtp_allocation,
+        }
+        base_lut = load_lookup_table(os.path.join(task["lut_path"], f"lookUpTable_{mode}.csv"))
+        results["range_hit_rates"], results["range_hit_counts"] = get_mode_range_hits(base_lut, win_ranges)
+
+    if task["symbol_keys"] is not None:
+        game_object = HitRateCalculations(task["game_id"], mode, task["cost"], store=store)
+        results["symbol_hits"] = analyse_mode_search_keys(game_object, task["symbol_keys"])
+        results["custom_hits"] = analyse_mode_search_keys(game_object, task["custom_keys"])
+    return results
+
+
 class GameInformation:
     """Import game configuration details."""
 
-    def __init__(self, gamestate: object, analysis_ranges=None, modes_to_analyse=None, custom_keys=None):
+    def __init__(
+        self, gamestate: object, analysis_ranges=None, modes_to_analyse=None, custom_keys=None, workers: int = None
+    ):
+        """workers: processes used to analyse modes in parallel, defaults to one per mode (up to the cpu count)."""
         self.game_id = gamestate.config.game_id
         self.modes_to_analyse = modes_to_analyse
         self.config_path = gamestate.output_files.configs["paths"]["be_config"]
         self.math_config_path = gamestate.output_files.configs["paths"]["math_config"]
         self.load_config()
+        self.output_files = gamestate.output_files
         self.libraryPath = gamestate.output_files.library_path
         self.lutPath = gamestate.output_files.lookup_path
         self.finalLUTPath = gamestate.output_files.final_lookup_path
@@ -85,10 +127,7 @@ class GameInformation:
 
         self.get_criteria_info()
 
-        self.get_mode_split_hit_rates()
-        self.get_symbol_hit_rates(self.modes_to_analyse)
-        self.get_custom_hit_rates(modes_to_analyse=self.modes_to_analyse, custom_search_keys=self.custom_keys)
-        self.get_range_hit_counts()
+        self.analyse_all_modes(workers)
         print("Successfully loaded PAR-sheet information.")
 
     def load_config(self):
@@ -137,6 +176,53 @@ class GameInformation:
         self.game_type_fences = game_type_mapping
         self.mode_fence_info = mode_fence_info
 
+    def analyse_all_modes(self, workers: int = None) -> None:
+        """
+        Compute mode split, symbol, custom key and range hit-rates of every mode in a single pass over its files.
+        Equivalent to the individual get_*() functions below, with each mode analysed in a separate process.
+        """
+        check_force_files(self.config, self.modes_to_analyse)
+        symbol_keys = construct_symbol_keys(self.config)
+        modes = self.all_modes + [mode for mode in self.modes_to_analyse if mode not in self.all_modes]
+        tasks = []
+        for mode in modes:
+            analysed = mode in self.modes_to_analyse
+            tasks.append(
+                {
+                    "game_id": self.game_id,
+                    "mode": mode,
+                    "cost": self.cost_mapping.get(mode),
+                    "win_ranges": self.win_ranges,
+                    "lut_path": self.lutPath,
+                    "output_files": self.output_files,
+                    "sub_modes": list(self.mode_fence_info[mode].keys()) if mode in self.all_modes else None,
+                    "symbol_keys": symbol_keys if analysed else None,
+                    "custom_keys": self.custom_keys if analysed else None,
+                }
+            )
+
+        workers = min(workers or os.cpu_count() or 1, len(tasks))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = dict(zip(modes, executor.map(analyse_mode, tasks)))
+        else:
+            results = {mode: analyse_mode(task) for mode, task in zip(modes, tasks)}
+
+        self.mode_hit_rate_info = {mode: results[mode]["split_hit_rates"] for mode in self.all_modes}
+        self.mode_hit_rates = {mode: results[mode]["range_hit_rates"] for mode in self.all_modes}
+        self.mode_hit_counts = {mode: results[mode]["range_hit_counts"] for mode in self.all_modes}
+        self.hr_summary, self.av_win_summary, self.sim_count_summary = {}, {}, {}
+        self.custom_hr_summary, self.custom_av_win_summary, self.custom_sim_count_summary = {}, {}, {}
+        for mode in self.modes_to_analyse:
+            self.hr_summary[mode], self.av_win_summary[mode], self.sim_count_summary[mode] = results[mode][
+                "symbol_hits"
+            ]
+            (
+                self.custom_hr_summary[mode],
+                self.custom_av_win_summary[mode],
+                self.custom_sim_count_summary[mode],
+            ) = results[mode]["custom_hits"]
+
     def get_mode_split_hit_rates(self, modes_to_analyse=None) -> None:
         """Separate win information depending on gametype."""
         if modes_to_analyse is None:
@@ -144,10 +230,9 @@ class GameInformation:
         mode_hit_rate_info = {}
         for mode in modes_to_analyse:
             mode_hit_rate_info[mode] = {}
-            lut_path, split_path = return_all_filepaths(self.game_id, mode)
             sub_modes = list(self.mode_fence_info[mode].keys())
-            mode_sorted_distributions, total_mode_weight = make_split_win_distribution(
-                lut_path, split_path, sub_modes, "basegame"
+            mode_sorted_distributions, total_mode_weight = make_store_split_win_distribution(
+                load_analytics_store(self.output_files, mode), sub_modes, "basegame"
             )
             sub_mode_hits, sub_mode_probs, sub_mode_rtp_allocation = return_hit_rates(
                 mode_sorted_distributions, total_mode_weight, self.win_ranges, self.cost_mapping[mode]
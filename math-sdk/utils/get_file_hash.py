@@ -2,31 +2,23 @@
 Obtain and compare file hash using SHA256
     Args:
     -f input arbitrary number of filepaths separated by whitespace
-    Example:
-    python3 get_file_hash.py -f '../games/0_0_ways/library/lookup_tables/lookUpTable_base.csv'
+    Example (from the repository root):
+    python3 -m utils.get_file_hash -f 'games/0_0_ways/library/lookup_tables/lookUpTable_base.csv'
 
     -d specify a file directory and hash all files that do not end in .py
     [optional] -l the layer depth of the directory search, default to 1
     Example:
-    python3 get_file_hash.py -d '../games/0_0_ways/library/lookup_tables/' -l 1
+    python3 -m utils.get_file_hash -d 'games/0_0_ways/library/lookup_tables/' -l 1
 """
 
 import os
-import hashlib
 import argparse
+from src.write_data.file_manifest import get_file_sha
 
 
 def get_hash(filepath: str) -> str:
-    """Get hexadecimal representation of data file."""
-    sha_file = hashlib.sha256()
-    with open(filepath, "rb") as f:
-        while True:
-            data = f.read(65536)
-            if not data:
-                break
-            sha_file.update(data)
-    hexrep = sha_file.hexdigest()
-    return hexrep
+    """Get hexadecimal representation of data file, read from the file manifest if it is up to date."""
+    return get_file_sha(filepath)
 
 
 def get_file_hash(*args: str) -> None:
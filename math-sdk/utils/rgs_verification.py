@@ -8,21 +8,12 @@ import os
 import importlib
 from io import TextIOWrapper
 import numpy as np
-import zstandard as zst
 import hashlib
 import pickle
-from utils.analysis.distribution_functions import (
-    make_win_distribution,
-    get_distribution_moments,
-    get_distribution_average,
-    non_zero_hitrate,
-    prob_less_than_bet,
-    get_prob_no_win,
-    get_maxwin_hitrate,
-    get_distribution_median,
-    min_dist_difference,
-    calculate_rtp,
-)
+from src.write_data.lookup_binary import read_lookup_csv
+from src.write_data.book_index import get_book_decompressor
+from src.config.compiled_config import compile_game_config
+from utils.analysis.distribution_functions import get_distribution_arrays, get_distribution_statistics
 
 
 class WinStatistics:
@@ -82,32 +73,20 @@ class WinStatistics:
 
 
 def verify_lookup_format(filename: str) -> list:
-    "Duplicate RGS verification before upload."
-    integer_payouts = []
-    running_weight_total = 0
-    min_win, max_win = None, None
-    win_distribution = make_win_distribution(filename)
-
-    with open(filename, "r", encoding="UTF-8") as f:
-        for line in f:
-            _, weight, payout = line.strip().split(",")
-            weight = float(weight)
-            payout = float(payout)
-
-            # Payout checks
-            assert payout.is_integer() and payout >= 0, "Payout mult be uint64 format:"
-            if payout > 0:
-                assert payout >= 10, "Minimum non-zero payout is 10 (RGS accepts 'cents' increments)."
-            assert payout % 10 == 0, "Payout values must be in increments of 10."
-            integer_payouts.append(int(payout))
-
-            if (min_win is None) or (payout < min_win):
-                min_win = payout
-            if (max_win is None) or (payout > max_win):
-                max_win = payout
-            # Weight checks
-            assert weight.is_integer() and weight >= 0, "Weight must be uint64 format."
-            running_weight_total += weight
+    "Duplicate RGS verification before upload, the uploaded csv is parsed rather than its binary table."
+    table = read_lookup_csv(filename)
+    payouts, weights = table["payout"], table["weight"]
+    win_distribution = dict(zip(*(values.tolist() for values in get_distribution_arrays(table))))
+
+    # Payout and weight columns are stored as uint64, so values are non-negative integers by construction
+    assert np.all((payouts == 0) | (payouts >= 10)), "Minimum non-zero payout is 10 (RGS accepts 'cents' increments)."
+    assert np.all(payouts % 10 == 0), "Payout values must be in increments of 10."
+    integer_payouts = payouts.tolist()
+
+    min_win = float(payouts.min()) if len(payouts) > 0 else None
+    max_win = float(payouts.max()) if len(payouts) > 0 else None
+    # accumulate sequentially in float64, matching the running total of the RGS check
+    running_weight_total = float(np.cumsum(weights, dtype=np.float64)[-1]) if len(weights) > 0 else 0
 
     assert running_weight_total <= np.iinfo(np.uint64).max, "Sum of weights must be <= MAX(uint64)"
 
@@ -115,8 +94,11 @@ def verify_lookup_format(filename: str) -> list:
 
 
 # payout mult value match to lut + length match
-def verify_books_and_payout_mults(books_filename: str) -> list:
-    """Ensure the values written to the books match those in the lookup table exactly."""
+def verify_books_and_payout_mults(books_filename: str, index_path: str = None) -> list:
+    """
+    Ensure the values written to the books match those in the lookup table exactly.
+    index_path is the folder holding the books dictionary (if one was trained), next to the books if not given.
+    """
     assert str(books_filename).endswith(".jsonl.zstd") or str(books_filename).endswith(
         "jsonl.zst"
     ), "Verification is only run for compressed book files of format .jsonl.zst."
@@ -124,8 +106,8 @@ def verify_books_and_payout_mults(books_filename: str) -> list:
     book_payout_ints = []
     total_num_events = 0
     with open(books_filename, "rb") as f:
-        decompressor = zst.ZstdDecompressor()
-        with decompressor.stream_reader(f) as reader:
+        decompressor = get_book_decompressor(str(books_filename), index_path)
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
             txt_stream = TextIOWrapper(reader, encoding="UTF-8")
             for line in txt_stream:
                 line = line.strip()
@@ -156,38 +138,38 @@ def compare_payout_values(book_int_payouts, lut_int_payouts) -> None:
 
 def get_num_non_zero_payouts(book_int_payouts) -> None:
     """Count non-zero payouts"""
-    return len([p for p in book_int_payouts if p > 0])
+    return int(np.count_nonzero(np.asarray(book_int_payouts)))
 
 
 def get_lut_statistics(
     win_distribution, bet_cost, unique_payouts, weight_range, min_win, max_win, num_events
 ) -> object:
-    """Run RGS statistic tests for upload verification."""
-
-    var, std, skew, kurtosis = get_distribution_moments(win_distribution, bet_cost)
+    """Run RGS statistic tests for upload verification, all distribution statistics are computed in one pass."""
+    wins = np.fromiter(win_distribution.keys(), dtype=np.float64, count=len(win_distribution))
+    weights = np.fromiter(win_distribution.values(), dtype=np.float64, count=len(win_distribution))
+    stats = get_distribution_statistics(wins, weights, bet_cost)
     MathStats = WinStatistics(
         win_distribution=win_distribution,
         num_events=num_events,
         weight_range=weight_range,
         min_win=min_win,
         max_win=max_win,
-        min_diff=min_dist_difference(win_distribution),
+        min_diff=stats["min_diff"],
         unique_wins=unique_payouts,
-        average_wins=float(get_distribution_average(win_distribution)),
-        rtp=calculate_rtp(win_distribution, bet_cost, weight_range),
-        std=std,
-        var=var,
-        hr_max=get_maxwin_hitrate(win_distribution, weight_range),
-        non_zero_hr=non_zero_hitrate(win_distribution, weight_range),
-        prob_nil=get_prob_no_win(win_distribution, weight_range),
-        prob_less_bet=prob_less_than_bet(win_distribution, bet_cost, weight_range),
+        average_wins=stats["average"],
+        rtp=stats["rtp"],
+        std=stats["std"],
+        var=stats["var"],
+        hr_max=stats["hr_max"],
+        non_zero_hr=stats["non_zero_hr"],
+        prob_nil=stats["prob_nil"],
+        prob_less_bet=stats["prob_less_bet"],
         num_non_zero_payouts=get_num_non_zero_payouts(unique_payouts),
-        skew=skew,
-        excess_kurtosis=kurtosis,
+        skew=stats["skew"],
+        excess_kurtosis=stats["excess_kurtosis"],
     )
-    median = get_distribution_median(win_distribution, weight_range)
-    if median > 0:
-        m2m = MathStats.average_win / median
+    if stats["median"] > 0:
+        m2m = MathStats.average_win / stats["median"]
         MathStats.m2m = m2m
     else:
         MathStats.m2m = 0
@@ -210,7 +192,7 @@ def execute_all_tests(config, excluded_modes=[]):
                 raise RuntimeError("Books/Lookup file does not exist.")
 
             win_dist, lut_payouts, weights_range, min_win, max_win = verify_lookup_format(lut_file)
-            book_payouts, num_events = verify_books_and_payout_mults(book_file)
+            book_payouts, num_events = verify_books_and_payout_mults(book_file, config.book_path)
 
             compare_payout_values(book_payouts, lut_payouts)
 
@@ -238,12 +220,13 @@ def write_all_stats(StatsList: object, filename: str) -> None:
 
 
 def load_game_config(game_id: str):
-    """Load game config class"""
+    """Load game config class, reelstrips are read from the compiled config once it has been written."""
     module_path = f"games.{game_id}.game_config"
     module = importlib.import_module(module_path)
-    config = getattr(module, "GameConfig")
+    config = getattr(module, "GameConfig")()
+    compile_game_config(config)
 
-    return config()
+    return config
 
 
 if __name__ == "__main__":
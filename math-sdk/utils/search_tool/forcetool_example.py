@@ -26,6 +26,11 @@ def run(game: str, mode: str):
     )
     ForceObject.print_search_results({"method": "payout_search"}, payout_ids, "test_range_search.json", mode)
 
+    # Combine force keys and payout ranges with a boolean search expression
+    query = "gametype=basegame,symbol=scatter AND NOT kind=3 AND payout>=10000"
+    query_ids = ForceObject.find_query_ids(query)
+    ForceObject.print_search_results(query, query_ids, "test_query_search.json", mode)
+
 
 if __name__ == "__main__":
 
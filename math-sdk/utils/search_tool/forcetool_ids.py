@@ -4,15 +4,22 @@ import os
 import importlib
 import json
 from typing import List, Dict
+import numpy as np
+from src.write_data.lookup_binary import load_lookup_table
+from src.write_data.analytics_store import load_analytics_store
+from src.write_data.book_index import BookReader
+from src.config.compiled_config import compile_game_config
+from src.config.output_filenames import OutputFiles
 
 
 def load_game_config(game_id: str):
-    """Load game config class"""
+    """Load game config class, reelstrips are read from the compiled config once it has been written."""
     module_path = f"games.{game_id}.game_config"
     module = importlib.import_module(module_path)
-    config = getattr(module, "GameConfig")
+    config = getattr(module, "GameConfig")()
+    compile_game_config(config)
 
-    return config()
+    return config
 
 
 def get_mode_names_from_config(game_config: object):
@@ -35,8 +42,11 @@ class ForceTool:
         self.config = load_game_config(game_id)
         self.target_mode = game_mode
         self.current_force_file = None
+        self.store = None
+        self.force_index = None
         self.search_keys = None
         self.method = None  # For payout range search only
+        self.book_reader = BookReader(self.config.publish_path, self.config.book_path)
 
     def get_force_file_name(self):
         "Get force-file path."
@@ -48,6 +58,19 @@ class ForceTool:
         with open(force_name, "r", encoding="UTF-8") as f:
             self.current_force_file = json.loads(f.read())
 
+    def get_force_index_name(self):
+        "Get force-index path."
+        return os.path.join(self.config.library_path, "forces", f"force_index_{self.target_mode}.npz")
+
+    def load_force_index(self):
+        "Load the force-index from the mode's analytics store, which is rebuilt if the force or lookup files changed."
+        self.store = load_analytics_store(OutputFiles(self.config), self.target_mode)
+        self.force_index = self.store.force_index
+
+    def get_book(self, book_id: int, game_mode: str = None) -> dict:
+        """Return a single book from the compressed books, decompressing only the frame containing it."""
+        return self.book_reader.get_book(self.target_mode if game_mode is None else game_mode, book_id)
+
     def print_search_results(self, search_criteria, simulation_ids: List, filename: str, game_mode: str):
         """Record"""
         base_path = os.path.join(self.config.library_path, "forces")
@@ -79,14 +102,9 @@ class ForceTool:
         """
         assert search_keys is not None, "must specify serach keys and game_mode"
 
-        if reload_force_json:
-            self.load_force_file()
-        matched_book_ids = set()
-        for entry in self.current_force_file:
-            tranform_serach = self.transform_serch_dict(entry)
-            if all(tranform_serach.get(k) == v for k, v in search_keys.items()):
-                for idx in entry["bookIds"]:
-                    matched_book_ids.add(int(idx))
+        if reload_force_json or self.force_index is None:
+            self.load_force_index()
+        matched_book_ids = set(self.force_index.get_ids(self.force_index.match(search_keys)).tolist())
 
         if len(matched_book_ids) == 0:
             raise Warning("No book-ids found.")
@@ -97,14 +115,21 @@ class ForceTool:
         Returns all id's appearing in multiplie search criteria
         """
         assert target_mode is not None, "Must specify game mode"
-        self.load_force_file()
+        self.load_force_index()
 
-        book_id_sets = []
-        for _, search_key in enumerate(search_array):
-            book_id_sets.append(self.find_partial_key_match(search_key, False))
+        intersection_mask = self.force_index.all_books()
+        for search_key in search_array:
+            intersection_mask &= self.force_index.match(search_key)
+        return set(self.force_index.get_ids(intersection_mask).tolist())
 
-        intersection_ids = set.intersection(*book_id_sets)
-        return intersection_ids
+    def find_query_ids(self, expression: str, reload_force_index: bool = True) -> list:
+        """
+        Returns all ids satisfying a search expression, i.e. "kind=5,symbol=H1 AND NOT gametype=freegame OR payout>=100000"
+        See ForceIndex.query() for the expression format.
+        """
+        if reload_force_index or self.force_index is None:
+            self.load_force_index()
+        return self.force_index.get_ids(self.force_index.query(expression)).tolist()
 
     def find_payout_range_ids(
         self,
@@ -114,7 +139,10 @@ class ForceTool:
         count_limit: int = None,
         lookup_name: str = None,
     ):
-        """Search lookup table for simulations where the payout amount fally within a specified range."""
+        """
+        Search lookup table for simulations where the payout amount fally within a specified range.
+        Payouts are taken from the mode's analytics store unless a lookup table is given.
+        """
         assert method.upper() in ["RANGE", "MIN", "MAX"], "method must be: RANGE, MIN, or MAX."
 
         self.method = method.upper()
@@ -129,24 +157,20 @@ class ForceTool:
                 assert min_payout is None, "Cannot specify minimum  payout amount for 'MIN' method"
 
         if lookup_name is None:
-            lookup_name = os.path.join(
-                self.config.library_path, "lookup_tables", f"lookUpTable_{self.target_mode}.csv"
-            )
-
-        recorded_ids = []
-        with open(lookup_name, "r", encoding="UTF-8") as f:
-            lines = f.readlines()
-            for line in lines:
-                line_val = int(line.strip().split(",")[-1])
-                sim_id = int(line.strip().split(",")[0])
-                if (
-                    (self.method == "RANGE" and line_val >= min_payout and line_val < max_payout)
-                    or (self.method == "MAX" and line_val < max_payout)
-                    or (self.method == "MIN" and line_val < min_payout)
-                ):
-                    recorded_ids.append(sim_id)
-
-                    if count_limit is not None and len(recorded_ids) >= count_limit:
-                        break
-
-        return recorded_ids
+            if self.store is None:
+                self.load_force_index()
+            ids, payouts = self.store.ids, self.store.payout
+        else:
+            table = load_lookup_table(lookup_name)
+            ids, payouts = table["id"], table["payout"]
+        order = np.argsort(ids, kind="stable")
+        ids, payouts = ids[order], payouts[order]
+
+        match self.method:
+            case "RANGE":
+                mask = (payouts >= min_payout) & (payouts < max_payout)
+            case "MAX":
+                mask = payouts < max_payout
+            case "MIN":
+                mask = payouts < min_payout
+        return ids[mask][:count_limit].tolist()
@@ -2,14 +2,21 @@
 
 from pathlib import Path
 import argparse
+import importlib
 import sys
 import os
 import json
+import numpy as np
 
 ABS_PATH = Path(__file__).parent.parent
-sys.path.append(ABS_PATH)
+sys.path.append(str(ABS_PATH))
 os.chdir(ABS_PATH)
 
+from src.write_data.lookup_binary import LOOKUP_DTYPE, copy_pay_splits, write_lookup_binary
+from src.write_data.file_manifest import open_hashed
+from src.write_data.analytics_store import write_analytics_store
+from src.config.output_filenames import OutputFiles
+
 
 def swap_tables(game_name: str, game_mode: str, target_file_number: int):
     """Replace default optimization table."""
@@ -18,10 +25,12 @@ def swap_tables(game_name: str, game_mode: str, target_file_number: int):
     lut_name = f"lookUpTable_{game_mode}_0.csv"
     new_lut_file = os.path.join("games", game_name, "library", "publish_files", lut_name)
     new_opt_file = os.path.join("games", game_name, "library", "optimization_files", target_file)
+    base_lut_file = os.path.join("games", game_name, "library", "lookup_tables", f"lookUpTable_{game_mode}.csv")
 
     start_recording = False
+    rows = []
 
-    with open(new_opt_file, "r", encoding="UTF-8") as infile, open(new_lut_file, "w", encoding="UTF-8") as outfile:
+    with open(new_opt_file, "r", encoding="UTF-8") as infile, open_hashed(new_lut_file) as outfile:
         for line in infile:
             line = line.strip()
             if not line:
@@ -35,11 +44,21 @@ def swap_tables(game_name: str, game_mode: str, target_file_number: int):
                     weight = int(parts[1])
                     payout = int(round(float(parts[2]) * 100, 0))
                     outfile.write(f"{idx},{weight},{payout}\n")
+                    rows.append((idx, weight, payout))
                 except:
                     raise ValueError("Could not write transformed line.")
             elif line == "Distribution":
                 start_recording = True
 
+    table = np.zeros(len(rows), dtype=LOOKUP_DTYPE)
+    if len(rows) > 0:
+        table["id"], table["weight"], table["payout"] = np.array(rows, dtype=np.uint64).T
+    # Carry base/free game splits over from the simulation lookup table
+    copy_pay_splits(table, base_lut_file)
+    write_lookup_binary(new_lut_file, table, os.path.dirname(base_lut_file))
+    game_config = getattr(importlib.import_module(f"games.{game_name}.game_config"), "GameConfig")()
+    write_analytics_store(OutputFiles(game_config), game_mode)
+
 
 def process_many_files(game_id, file_dict: dict) -> None:
     """Swap out multiple optimization files."""